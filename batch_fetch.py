@@ -0,0 +1,189 @@
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from ohio_counties import get_county
+from parcel_bloom import definitely_missing
+from parcel_formats import match_key, normalize_parcel_ids
+
+# --------------------------
+# Batch Fetch Configuration
+# --------------------------
+BATCH_CONFIG = {
+    "CHUNK_SIZE": 25,      # Parcel IDs per API request (';' separated, within the 50-record page)
+    "MAX_WORKERS": 4,      # Chunks in flight at once
+    "MAX_ROWS": 50000      # Largest upload accepted
+}
+
+BATCH_STATUSES = ["OK", "NOT_FOUND", "KNOWN_INVALID", "ERROR"]
+
+# --------------------------
+# Upload Parsing
+# --------------------------
+def read_parcel_table(data, filename):
+    """
+    DataFrame from uploaded CSV or XLSX bytes, every column read as text so
+    leading zeros in parcel IDs survive
+    """
+    if filename.lower().endswith((".xlsx", ".xls")):
+        try:
+            return pd.read_excel(io.BytesIO(data), dtype=str).fillna("")
+        except ImportError:
+            raise ValueError("Reading Excel files needs the openpyxl package; upload a CSV instead.")
+    return pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, encoding_errors="replace")
+
+def guess_column(columns, hints):
+    """First column whose name contains one of hints (case-insensitive), else None"""
+    for hint in hints:
+        for column in columns:
+            if hint in str(column).lower():
+                return column
+    return None
+
+def batch_items(frame, parcel_column, county_column=None, default_county=None):
+    """
+    Work items for a batch: one dict per distinct (county, parcel ID) with the
+    1-based spreadsheet row it came from. Blank IDs are skipped; county cells
+    may hold a name, state code or FIPS id, and unrecognized ones fall back to default_county.
+    """
+    raw_ids = frame[parcel_column].astype(str).tolist()
+    if county_column:
+        counties = [get_county(value) if str(value).strip() else None for value in frame[county_column].tolist()]
+        counties = [county['name'] if county else default_county for county in counties]
+    else:
+        counties = [default_county] * len(raw_ids)
+
+    items = []
+    seen = set()
+    for county in dict.fromkeys(counties):
+        positions = [position for position, value in enumerate(counties) if value == county]
+        for position, parcel_id in zip(positions, normalize_parcel_ids([raw_ids[position] for position in positions], county)):
+            if not parcel_id.canonical or (county, parcel_id.canonical) in seen:
+                continue
+            seen.add((county, parcel_id.canonical))
+            items.append({"row": position + 1, "parcel_id": parcel_id, "county": county})
+    items.sort(key=lambda item: item["row"])
+    return items
+
+# --------------------------
+# Chunked Concurrent Fetch
+# --------------------------
+def plan_chunks(items, chunk_size=None):
+    """Split items into per-county chunks (one API region per request), keeping row order within each"""
+    chunk_size = chunk_size or BATCH_CONFIG["CHUNK_SIZE"]
+    by_county = {}
+    for item in items:
+        by_county.setdefault(item["county"], []).append(item)
+    return [
+        county_items[start:start + chunk_size]
+        for county_items in by_county.values()
+        for start in range(0, len(county_items), chunk_size)
+    ]
+
+def result_row(item, status, record=None, message=""):
+    return {
+        "row": item["row"],
+        "parcel_id": item["parcel_id"].display,
+        "county": item["county"],
+        "status": status,
+        "message": message,
+        "record": record
+    }
+
+def fetch_chunk_rows(chunk, fetch_chunk):
+    """Run one chunk through fetch_chunk(parcel_ids, county) and pair records with their rows"""
+    try:
+        # IDs go upstream as written in the input; records are paired back by canonical key
+        response = fetch_chunk([item["parcel_id"].query for item in chunk], chunk[0]["county"])
+    except Exception as e:
+        response = {"status": "ERROR", "message": str(e)}
+    status = response.get("status")
+    if status not in ("OK", "NOT_FOUND"):
+        return [result_row(item, "ERROR", message=response.get("message", "")) for item in chunk]
+    records = {}
+    for record in response.get("results") or []:
+        records.setdefault(match_key(record.get('parcel_id')), record)
+    rows = []
+    for item in chunk:
+        record = records.get(match_key(item["parcel_id"].canonical))
+        rows.append(result_row(item, "OK", record) if record else result_row(item, "NOT_FOUND"))
+    return rows
+
+def fetch_batch(items, fetch_chunk, chunk_size=None, max_workers=None):
+    """
+    Fetch every item through fetch_chunk(parcel_ids, county_name) -> response
+    dict, MAX_WORKERS chunks at a time. A generator: yields the result rows of
+    each chunk as soon as it finishes, so callers can stream progress. IDs a
+    county Bloom filter rules out are yielded first without an API call.
+    """
+    rejected = set()
+    for county in dict.fromkeys(item["county"] for item in items):
+        county_items = [item for item in items if item["county"] == county]
+        missing = {parcel_id.canonical for parcel_id in definitely_missing([item["parcel_id"] for item in county_items], county)}
+        rejected.update(id(item) for item in county_items if item["parcel_id"].canonical in missing)
+    if rejected:
+        yield [result_row(item, "KNOWN_INVALID", message="Not in the county parcel list") for item in items if id(item) in rejected]
+
+    chunks = plan_chunks([item for item in items if id(item) not in rejected], chunk_size)
+    if not chunks:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers or BATCH_CONFIG["MAX_WORKERS"]) as pool:
+        futures = [pool.submit(fetch_chunk_rows, chunk, fetch_chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # An abandoned generator (stopped run) must not keep spending API calls
+            for future in futures:
+                future.cancel()
+
+class BatchProgress:
+    """Processed count, throughput and ETA for a running batch"""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.started = time.time()
+
+    def advance(self, count):
+        self.done += count
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def rate(self):
+        """Parcels per second so far"""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self):
+        return (self.total - self.done) / self.rate if self.rate else None
+
+BATCH_COLUMNS = ["Row", "Parcel ID", "County", "Status", "Address", "Owner", "Market Value", "Land Use", "Message"]
+
+def summary_row(row):
+    """One flat results-table row: request columns plus the main record fields"""
+    record = row["record"] or {}
+    return {
+        "Row": row["row"],
+        "Parcel ID": row["parcel_id"],
+        "County": row["county"] or record.get('county_name') or "",
+        "Status": row["status"],
+        "Address": record.get('address', ""),
+        "Owner": record.get('owner', ""),
+        "Market Value": record.get('mkt_val_tot', ""),
+        "Land Use": record.get('land_use_class', ""),
+        "Message": row["message"]
+    }
+
+def batch_frame(rows):
+    """Flat results table of batch rows"""
+    return pd.DataFrame([summary_row(row) for row in rows], columns=BATCH_COLUMNS)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from batch_fetch import fetch_batch
+from parcel_cache import CACHE_CONFIG
+
+# --------------------------
+# Batch Job Checkpoint Configuration
+# --------------------------
+# A named batch job records every finished chunk here, so a run that dies
+# part-way can be restarted with the same job ID: finished rows are skipped,
+# failed rows are retried and the results come back in input order.
+JOBS_CONFIG = {
+    "DIR": CACHE_CONFIG["DIR"],
+    "FILENAME": "batch_jobs.sqlite",
+    "BUSY_TIMEOUT_SECONDS": CACHE_CONFIG["L2_BUSY_TIMEOUT_SECONDS"]
+}
+
+# Rows in these states are retried when a job is resumed
+RETRY_STATUSES = ("ERROR",)
+
+def items_fingerprint(items):
+    """Hash of a job's work items, so a job ID cannot be resumed with a different input"""
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(f"{item['row']}|{item['county'] or ''}|{item['parcel_id'].canonical}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+class JobStore:
+    """
+    SQLite checkpoints for batch jobs: one row per job plus one row per
+    finished input row. Each chunk is committed in a single transaction with
+    synchronous=FULL, so a checkpoint that was written survives a crash.
+    """
+
+    def __init__(self, directory, filename=JOBS_CONFIG["FILENAME"]):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, filename)
+        self._local = threading.local()
+        conn = self._connect()
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS batch_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    runs INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS batch_job_rows (
+                    job_id TEXT NOT NULL,
+                    row INTEGER NOT NULL,
+                    parcel_id TEXT NOT NULL,
+                    county TEXT,
+                    status TEXT NOT NULL,
+                    message TEXT,
+                    record TEXT,
+                    PRIMARY KEY (job_id, row)
+                );
+            """)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=JOBS_CONFIG["BUSY_TIMEOUT_SECONDS"])
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def start(self, job_id, items):
+        """
+        Create job_id or resume it; returns the items still to fetch (never
+        finished, or finished with a retryable failure). Raises ValueError if
+        the job exists with different input.
+        """
+        fingerprint = items_fingerprint(items)
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            row = conn.execute("SELECT fingerprint FROM batch_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO batch_jobs VALUES (?, ?, ?, 1, ?, ?)", (job_id, fingerprint, len(items), now, now)
+                )
+                return list(items)
+            if row[0] != fingerprint:
+                raise ValueError(f"Job {job_id!r} was started with a different input; use a new job ID")
+            conn.execute("UPDATE batch_jobs SET runs = runs + 1, updated_at = ? WHERE job_id = ?", (now, job_id))
+            finished = {
+                finished_row for (finished_row,) in conn.execute(
+                    f"SELECT row FROM batch_job_rows WHERE job_id = ? AND status NOT IN ({', '.join('?' * len(RETRY_STATUSES))})",
+                    (job_id, *RETRY_STATUSES)
+                )
+            }
+        return [item for item in items if item["row"] not in finished]
+
+    def checkpoint(self, job_id, rows):
+        """Record one finished chunk"""
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO batch_job_rows VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                (job_id, row["row"], row["parcel_id"], row["county"], row["status"], row["message"],
+                 json.dumps(row["record"]) if row["record"] is not None else None)
+                for row in rows
+            ])
+            conn.execute("UPDATE batch_jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def results(self, job_id, limit=None):
+        """
+        Generator over the recorded rows of job_id (the first limit of them) in
+        input order, in the shape fetch_batch yields. Rows are read from the
+        cursor as they are consumed, so a large job is never held in memory.
+        """
+        sql = "SELECT row, parcel_id, county, status, message, record FROM batch_job_rows WHERE job_id = ? ORDER BY row"
+        params = [job_id]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row, parcel_id, county, status, message, record in self._connect().execute(sql, params):
+            yield {
+                "row": row,
+                "parcel_id": parcel_id,
+                "county": county,
+                "status": status,
+                "message": message,
+                "record": json.loads(record) if record is not None else None
+            }
+
+    def counts(self, job_id):
+        """{status: rows} recorded so far for job_id"""
+        return dict(self._connect().execute(
+            "SELECT status, COUNT(*) FROM batch_job_rows WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+
+    def delete(self, job_id):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM batch_job_rows WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM batch_jobs WHERE job_id = ?", (job_id,))
+
+_job_store = None
+_job_store_lock = threading.Lock()
+
+def get_job_store():
+    """
+    Return the process-wide batch job store, creating the database on first use
+    """
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = JobStore(JOBS_CONFIG["DIR"])
+    return _job_store
+
+def run_job(job_id, pending_items, fetch_chunk, chunk_size=None, max_workers=None):
+    """
+    fetch_batch() over the items JobStore.start() left pending, with a
+    checkpoint after every chunk; yields each chunk's rows once recorded
+    """
+    store = get_job_store()
+    for rows in fetch_batch(pending_items, fetch_chunk, chunk_size, max_workers):
+        store.checkpoint(job_id, rows)
+        yield rows
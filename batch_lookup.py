@@ -0,0 +1,176 @@
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from batch_jobs import get_job_store, run_job
+from batch_fetch import BATCH_CONFIG, BatchProgress, batch_items, fetch_batch, guess_column, read_parcel_table
+from exporters import export_format, open_writer
+from lookup_core import REPORTALLUSA_CONFIG, search_multiple_parcels
+from ohio_counties import get_county
+
+# --------------------------
+# Headless Batch Lookup
+# --------------------------
+# Runs a list of parcel IDs through the same search path as the Professional
+# Edition, without Streamlit or a browser session:
+#     python batch_lookup.py parcels.txt -o results.ndjson
+#     python batch_lookup.py parcels.csv --column "Parcel Number" --county-column County -o results.parquet
+#     python batch_lookup.py parcels.txt -o results.arrow      (Arrow IPC; Parquet/Arrow columns are typed)
+#     cat parcels.txt | python batch_lookup.py --county Cuyahoga --format csv > results.csv
+#     python batch_lookup.py parcels.txt --job nightly-0412 -o results.ndjson   (rerun to resume)
+# The client key comes from TAXLOOK_REPORTALLUSA_CLIENT or .streamlit/secrets.toml.
+# NDJSON rows carry census attributes when a census table is installed (census_table.py).
+
+EXIT_OK = 0          # Every parcel was looked up (found or not)
+EXIT_ERRORS = 1      # Some lookups failed with an API or network error
+EXIT_USAGE = 2       # Bad arguments or unreadable input
+EXIT_FAILED = 3      # Nothing could be looked up (no client key, or every lookup failed)
+
+PROGRESS_INTERVAL_SECONDS = 5
+
+def read_items(args):
+    """Work items from a CSV/XLSX table or a plain list with one ID per line"""
+    if args.input != "-" and args.input.lower().endswith((".csv", ".xlsx", ".xls")):
+        with open(args.input, "rb") as handle:
+            frame = read_parcel_table(handle.read(), args.input)
+        parcel_column = args.column or guess_column(frame.columns, ["parcel", "pin", "apn"]) or frame.columns[0]
+        county_column = args.county_column or guess_column(frame.columns, ["county"])
+    else:
+        handle = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        with handle:
+            frame = pd.DataFrame({"parcel_id": [line.strip() for line in handle]})
+        parcel_column, county_column = "parcel_id", None
+    if parcel_column not in frame.columns:
+        raise ValueError(f"No column named {parcel_column!r}; columns are {', '.join(map(str, frame.columns))}")
+    return batch_items(frame, parcel_column, county_column, args.county)
+
+class RowOrderBuffer:
+    """
+    Holds finished rows until every earlier input row is done, so output
+    without --job comes out in input order whichever chunk finishes first.
+    Only rows that finished ahead of an earlier one are held; chunks are
+    per county, so an input that interleaves counties may hold more.
+    """
+
+    def __init__(self, items):
+        self.order = iter([item["row"] for item in items])
+        self.next_row = next(self.order, None)
+        self.held = {}
+
+    def push(self, rows):
+        """Add a finished chunk; returns the rows now ready, in input order"""
+        for row in rows:
+            self.held[row["row"]] = row
+        ready = []
+        while self.next_row in self.held:
+            ready.append(self.held.pop(self.next_row))
+            self.next_row = next(self.order, None)
+        return ready
+
+    def drain(self):
+        """Rows still held (a stopped run's partial output), in input order"""
+        rows = [self.held[row] for row in sorted(self.held)]
+        self.held = {}
+        return rows
+
+def format_summary(counts, progress):
+    errors = counts["ERROR"]
+    return (
+        f"{progress.done:,} parcels in {progress.elapsed:.1f}s ({progress.rate:.1f}/s): "
+        f"{counts['OK']:,} found, {counts['NOT_FOUND']:,} not found, "
+        f"{counts['KNOWN_INVALID']:,} known invalid, {errors:,} errors "
+        f"({100.0 * errors / progress.done if progress.done else 0.0:.1f}% error rate)"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look up Ohio parcels in bulk without the web app.")
+    parser.add_argument("input", nargs="?", default="-", help="ID list (one per line), CSV or XLSX; '-' reads stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output file; '-' writes to stdout")
+    parser.add_argument("-f", "--format", choices=["ndjson", "csv", "parquet", "arrow"], help="Default: from the output extension, else ndjson")
+    parser.add_argument("--county", help="County for IDs without one (name, state code or FIPS id)")
+    parser.add_argument("--column", help="Parcel ID column of a CSV/XLSX input (default: guessed)")
+    parser.add_argument("--county-column", help="County column of a CSV/XLSX input (default: guessed)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONFIG["MAX_WORKERS"], help="Requests in flight at once")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CONFIG["CHUNK_SIZE"], help="Parcel IDs per request")
+    parser.add_argument("--job", help="Checkpoint under this job ID; rerunning with it resumes where the last run stopped")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    if args.county:
+        county = get_county(args.county)
+        if county is None:
+            print(f"Unknown Ohio county: {args.county}", file=sys.stderr)
+            return EXIT_USAGE
+        args.county = county['name']
+    if not REPORTALLUSA_CONFIG["CLIENT_KEY"]:
+        print("No ReportAllUSA client key: set TAXLOOK_REPORTALLUSA_CLIENT or add it to .streamlit/secrets.toml", file=sys.stderr)
+        return EXIT_FAILED
+
+    try:
+        items = read_items(args)
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_USAGE
+    if not items:
+        print("No parcel IDs in the input", file=sys.stderr)
+        return EXIT_USAGE
+    # Only now create the job and the output file, so an empty input leaves neither behind
+    try:
+        pending = get_job_store().start(args.job, items) if args.job else items
+        writer, handle = open_writer(args.output, export_format(args.output, args.format))
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_USAGE
+    if args.job and len(pending) < len(items) and not args.quiet:
+        print(f"Resuming job {args.job}: {len(items) - len(pending):,} of {len(items):,} parcels already done", file=sys.stderr)
+
+    if args.job:
+        batch = run_job(args.job, pending, search_multiple_parcels, args.chunk_size, args.concurrency)
+    else:
+        batch = fetch_batch(items, search_multiple_parcels, args.chunk_size, args.concurrency)
+    counts = {"OK": 0, "NOT_FOUND": 0, "KNOWN_INVALID": 0, "ERROR": 0}
+    progress = BatchProgress(len(pending))
+    last_report = time.time()
+    # Job output is streamed from the checkpoint at the end; otherwise rows
+    # are written as soon as every earlier row is done. Both are in input order.
+    ordered = None if args.job else RowOrderBuffer(items)
+    try:
+        for rows in batch:
+            if ordered is not None:
+                writer.write(ordered.push(rows))
+            for row in rows:
+                counts[row["status"]] += 1
+            progress.advance(len(rows))
+            if not args.quiet and time.time() - last_report >= PROGRESS_INTERVAL_SECONDS:
+                eta = progress.eta_seconds
+                print(f"{progress.done:,}/{progress.total:,} ({progress.rate:.1f}/s, ETA {eta:.0f}s)"
+                      if eta is not None else f"{progress.done:,}/{progress.total:,}", file=sys.stderr)
+                last_report = time.time()
+    except KeyboardInterrupt:
+        print("Interrupted; partial results written" + (f", rerun with --job {args.job} to resume" if args.job else ""), file=sys.stderr)
+    finally:
+        if args.job:
+            writer.write(get_job_store().results(args.job))
+        else:
+            writer.write(ordered.drain())
+        writer.close()
+        if handle is not None:
+            handle.close()
+
+    print(format_summary(counts, progress), file=sys.stderr)
+    if args.job:
+        # The exit status covers the whole job, not just this run
+        counts = {status: 0 for status in counts}
+        counts.update(get_job_store().counts(args.job))
+        if not args.quiet:
+            print(f"Job {args.job}: {sum(counts.values()):,}/{len(items):,} parcels done, "
+                  f"{counts['OK']:,} found, {counts['ERROR']:,} errors", file=sys.stderr)
+    done = sum(counts.values())
+    if counts["ERROR"] and counts["ERROR"] == done:
+        return EXIT_FAILED
+    return EXIT_ERRORS if counts["ERROR"] or done < len(items) else EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
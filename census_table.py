@@ -0,0 +1,213 @@
+import csv
+import json
+import math
+import os
+import sys
+import threading
+
+import numpy as np
+
+# --------------------------
+# Census Attribute Table Configuration
+# --------------------------
+# Optional: when the table file does not exist, enrichment is simply skipped.
+# Build it from a CSV with a GEOID column (block, block group or tract level)
+# and numeric attribute columns:
+#     python census_table.py census_attributes.csv data/census_attributes.bin
+CENSUS_CONFIG = {
+    "PATH": os.environ.get(
+        "TAXLOOK_CENSUS_TABLE",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "census_attributes.bin")
+    )
+}
+
+MAGIC = b"TXCNS001"
+ALIGNMENT = 8
+
+# --------------------------
+# File Format
+# --------------------------
+# MAGIC | uint64 header length | JSON header (padded to 8 bytes)
+# | uint64 keys[rows] (sorted GEOIDs) | float64 column[rows] for each column
+#
+# Everything after the header is read straight from the memory map: opening
+# the table costs nothing per process, pages are shared through the OS page
+# cache, and a lookup is a binary search over the key column.
+def build_census_table(csv_path, table_path):
+    """
+    Convert a census attribute CSV into the memory-mappable table format.
+    Non-numeric columns are dropped; unparsable cells become NaN. Returns the row count.
+    """
+    with open(csv_path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        geoid_field = next((field for field in reader.fieldnames if field.strip().lower() == "geoid"), None)
+        if geoid_field is None:
+            raise ValueError("Census CSV needs a GEOID column")
+        value_fields = [field for field in reader.fieldnames if field != geoid_field]
+        rows = {}
+        for row in reader:
+            geoid = "".join(ch for ch in row[geoid_field] if ch.isdigit())
+            if geoid:
+                rows[int(geoid)] = [parse_float(row.get(field)) for field in value_fields]
+
+    keys = np.array(sorted(rows), dtype=np.uint64)
+    values = np.array([rows[int(key)] for key in keys], dtype=np.float64).reshape(len(keys), len(value_fields))
+    numeric = [index for index in range(len(value_fields)) if not np.isnan(values[:, index]).all()]
+    columns = [value_fields[index].strip() for index in numeric]
+
+    header = json.dumps({"rows": len(keys), "columns": columns, "source": os.path.basename(csv_path)}).encode("utf-8")
+    header += b" " * (-len(header) % ALIGNMENT)
+
+    os.makedirs(os.path.dirname(os.path.abspath(table_path)), exist_ok=True)
+    temp_path = f"{table_path}.tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(MAGIC)
+        handle.write(np.uint64(len(header)).tobytes())
+        handle.write(header)
+        handle.write(keys.tobytes())
+        for index in numeric:
+            handle.write(np.ascontiguousarray(values[:, index]).tobytes())
+    # Readers that already mapped the old file keep a valid view of it
+    os.replace(temp_path, table_path)
+    return len(keys)
+
+def parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+class CensusTable:
+    """Read-only, memory-mapped census attribute table"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a census attribute table")
+            header_length = int(np.frombuffer(handle.read(8), dtype=np.uint64)[0])
+            header = json.loads(handle.read(header_length))
+        self.rows = header["rows"]
+        self.columns = header["columns"]
+        offset = len(MAGIC) + 8 + header_length
+        self.keys = np.memmap(path, dtype=np.uint64, mode="r", offset=offset, shape=(self.rows,))
+        offset += self.rows * 8
+        self.values = {}
+        for column in self.columns:
+            self.values[column] = np.memmap(path, dtype=np.float64, mode="r", offset=offset, shape=(self.rows,))
+            offset += self.rows * 8
+
+    def __len__(self):
+        return self.rows
+
+    def find(self, geoid):
+        """Row index of geoid, or None (binary search over the sorted key column)"""
+        if not self.rows:
+            return None
+        geoid = np.uint64(geoid)
+        index = int(np.searchsorted(self.keys, geoid))
+        if index < self.rows and self.keys[index] == geoid:
+            return index
+        return None
+
+    def row(self, index):
+        """Attribute dict for a row; missing values are None"""
+        attributes = {}
+        for column in self.columns:
+            value = float(self.values[column][index])
+            attributes[column] = None if math.isnan(value) else value
+        return attributes
+
+    def find_many(self, geoids):
+        """Row index per geoid (-1 when absent), vectorized for bulk enrichment"""
+        geoids = np.asarray(geoids, dtype=np.uint64)
+        if not self.rows:
+            return np.full(len(geoids), -1)
+        indexes = np.minimum(np.searchsorted(self.keys, geoids), self.rows - 1)
+        return np.where(self.keys[indexes] == geoids, indexes, -1)
+
+# --------------------------
+# Record Enrichment
+# --------------------------
+def record_geoids(record):
+    """
+    Candidate GEOIDs for a record, most specific first: block (15 digits),
+    block group (12) and tract (11), built from county_id, census_tract and census_block
+    """
+    try:
+        county_fips = int(record['county_id'])
+        tract = int(record['census_tract'])
+    except (KeyError, TypeError, ValueError):
+        return []
+    tract_geoid = f"{county_fips:05d}{tract:06d}"
+    geoids = []
+    try:
+        block = f"{int(record['census_block']):04d}"
+        geoids += [int(tract_geoid + block), int(tract_geoid + block[0])]
+    except (KeyError, TypeError, ValueError):
+        pass
+    geoids.append(int(tract_geoid))
+    return geoids
+
+CENSUS_LEVELS = {15: "block", 12: "block group", 11: "tract"}
+
+_census_table = None
+_census_table_lock = threading.Lock()
+
+def get_census_table():
+    """
+    Return the process-wide census table, or None when no table file is installed
+    """
+    global _census_table
+    if _census_table is None and os.path.exists(CENSUS_CONFIG["PATH"]):
+        with _census_table_lock:
+            if _census_table is None:
+                _census_table = CensusTable(CENSUS_CONFIG["PATH"])
+    return _census_table
+
+def census_attributes(record):
+    """
+    Census attributes for the most specific geography the table has for
+    record, with '_census_level' and '_census_geoid' set; None if unavailable
+    """
+    table = get_census_table()
+    if table is None:
+        return None
+    for geoid in record_geoids(record):
+        index = table.find(geoid)
+        if index is not None:
+            attributes = table.row(index)
+            attributes["_census_level"] = CENSUS_LEVELS.get(len(str(geoid)), "other")
+            attributes["_census_geoid"] = str(geoid)
+            return attributes
+    return None
+
+def enrich_records(records):
+    """
+    Bulk census_attributes(): one vectorized search per geography level
+    instead of one lookup per record. Returns a list aligned with records.
+    """
+    table = get_census_table()
+    results = [None] * len(records)
+    if table is None:
+        return results
+    candidates = [record_geoids(record) for record in records]
+    for level in range(3):
+        pending = [position for position, geoids in enumerate(candidates)
+                   if results[position] is None and len(geoids) > level]
+        if not pending:
+            continue
+        geoids = [candidates[position][level] for position in pending]
+        for position, geoid, index in zip(pending, geoids, table.find_many(geoids).tolist()):
+            if index >= 0:
+                attributes = table.row(index)
+                attributes["_census_level"] = CENSUS_LEVELS.get(len(str(geoid)), "other")
+                attributes["_census_geoid"] = str(geoid)
+                results[position] = attributes
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python census_table.py <census_attributes.csv> <output table path>")
+        sys.exit(2)
+    print(f"Wrote {build_census_table(sys.argv[1], sys.argv[2])} rows to {sys.argv[2]}")
@@ -0,0 +1,220 @@
+import datetime
+import io
+import json
+import math
+
+# --------------------------
+# Columnar Export Configuration
+# --------------------------
+# Typed Parquet / Arrow IPC tables of parcel records for the analytics stack:
+# values, areas and coordinates are float64, dates are date32, counts are
+# int64 and land_cover is a map<string, float64>. Record fields not listed
+# in RECORD_FIELDS are kept as JSON text in an "extra" column.
+COLUMNAR_CONFIG = {
+    "ROW_GROUP_ROWS": 10000    # Rows buffered before a row group / record batch is written
+}
+
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# (field, kind) in output column order
+RECORD_FIELDS = [
+    ("parcel_id", "string"), ("robust_id", "string"),
+    ("county_id", "int"), ("county_name", "string"), ("muni_name", "string"), ("state_abbr", "string"),
+    ("address", "string"), ("addr_number", "string"), ("addr_street_name", "string"),
+    ("addr_street_type", "string"), ("addr_city", "string"), ("addr_zip", "string"), ("addr_zipplusfour", "string"),
+    ("owner", "string"), ("mail_address1", "string"), ("mail_address2", "string"), ("mail_address3", "string"),
+    ("trans_date", "date"), ("sale_price", "float"),
+    ("mkt_val_land", "float"), ("mkt_val_bldg", "float"), ("mkt_val_tot", "float"),
+    ("ngh_code", "string"), ("land_use_code", "string"), ("land_use_class", "string"), ("zoning", "string"),
+    ("school_district", "string"),
+    ("acreage", "float"), ("acreage_calc", "float"), ("acreage_adjacent_with_sameowner", "float"),
+    ("latitude", "float"), ("longitude", "float"),
+    ("census_block", "int"), ("census_tract", "int"),
+    ("owner_occupied", "bool"), ("buildings", "int"),
+    ("land_cover", "land_cover"), ("last_updated", "string"), ("geom_as_wkt", "string")
+]
+
+# Request columns written ahead of the record for batch results
+REQUEST_FIELDS = [("row", "int"), ("request_parcel_id", "string"), ("request_county", "string"), ("status", "string"), ("message", "string")]
+
+RECORD_FIELD_NAMES = {field for field, _ in RECORD_FIELDS}
+
+def import_pyarrow():
+    """(pyarrow, pyarrow.parquet, pyarrow.ipc); raises ValueError when pyarrow is not installed"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet and Arrow output need the pyarrow package")
+    return pyarrow, pyarrow.parquet, pyarrow.ipc
+
+def columnar_available():
+    try:
+        import_pyarrow()
+    except ValueError:
+        return False
+    return True
+
+# --------------------------
+# Value Conversion
+# --------------------------
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+def parse_number(value, kind):
+    """
+    float / int from API text such as "2500.00"; None when blank, unparsable,
+    infinite or (for int) outside the int64 column range
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        if isinstance(value, int) and kind == "int":
+            number = value
+        else:
+            number = float(str(value).replace(",", "").replace("$", "")) if isinstance(value, str) else float(value)
+            if not math.isfinite(number):
+                return None
+            if kind == "int":
+                number = int(number)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if kind == "int":
+        return number if INT64_MIN <= number <= INT64_MAX else None
+    return number
+
+# trans_date layouts seen across counties; ISO (and ISO timestamps) first
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y%m%d"]
+
+def parse_date(value):
+    """
+    datetime.date from a county date string in any DATE_FORMATS layout;
+    None when blank or unparsable. The one date parser the exports, the
+    results frame and the neighborhood index share.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    text = str(value or "").strip()[:10]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+def parse_bool(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "t", "yes", "y", "1"):
+        return True
+    if text in ("false", "f", "no", "n", "0"):
+        return False
+    return None
+
+def parse_land_cover(value):
+    """{cover class: acres} as map entries; None when absent"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if not isinstance(value, dict):
+        return None
+    return [(str(key), parse_number(amount, "float")) for key, amount in value.items()]
+
+def convert_value(value, kind):
+    if kind in ("float", "int"):
+        return parse_number(value, kind)
+    if kind == "date":
+        return parse_date(value)
+    if kind == "bool":
+        return parse_bool(value)
+    if kind == "land_cover":
+        return parse_land_cover(value)
+    return None if value is None or value == "" else str(value)
+
+# --------------------------
+# Schema and Tables
+# --------------------------
+def arrow_type(pyarrow, kind):
+    return {
+        "string": pyarrow.string(),
+        "float": pyarrow.float64(),
+        "int": pyarrow.int64(),
+        "date": pyarrow.date32(),
+        "bool": pyarrow.bool_(),
+        "land_cover": pyarrow.map_(pyarrow.string(), pyarrow.float64())
+    }[kind]
+
+def columnar_fields(with_request):
+    return (REQUEST_FIELDS if with_request else []) + RECORD_FIELDS + [("extra", "string")]
+
+def columnar_schema(pyarrow, with_request):
+    return pyarrow.schema([(field, arrow_type(pyarrow, kind)) for field, kind in columnar_fields(with_request)])
+
+def flat_row(record, request=None):
+    """One typed output row: request fields (for batch rows) and the converted record fields"""
+    record = record or {}
+    values = {}
+    if request is not None:
+        values.update({
+            "row": request["row"],
+            "request_parcel_id": request["parcel_id"],
+            "request_county": request["county"],
+            "status": request["status"],
+            "message": request["message"] or None
+        })
+    for field, kind in RECORD_FIELDS:
+        values[field] = convert_value(record.get(field), kind)
+    extra = {key: value for key, value in record.items() if key not in RECORD_FIELD_NAMES}
+    values["extra"] = json.dumps(extra, default=str) if extra else None
+    return values
+
+class ColumnarWriter:
+    """
+    Typed Parquet or Arrow IPC file writer. Rows are buffered and written
+    ROW_GROUP_ROWS at a time, so memory stays flat however long the run.
+    sink is a path or a binary file object.
+    """
+
+    def __init__(self, sink, format_name="parquet", with_request=True, row_group_rows=None):
+        if format_name not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format: {format_name}")
+        self.pyarrow, parquet, ipc = import_pyarrow()
+        self.with_request = with_request
+        self.row_group_rows = row_group_rows or COLUMNAR_CONFIG["ROW_GROUP_ROWS"]
+        self.schema = columnar_schema(self.pyarrow, with_request)
+        if format_name == "parquet":
+            self.writer = parquet.ParquetWriter(sink, self.schema)
+        else:
+            self.writer = ipc.new_file(sink, self.schema)
+        self.buffer = []
+
+    def write(self, rows):
+        """Add batch rows ({row, parcel_id, county, status, message, record}), or bare records when with_request is False"""
+        for row in rows:
+            self.buffer.append(flat_row(row["record"], row) if self.with_request else flat_row(row))
+            if len(self.buffer) >= self.row_group_rows:
+                self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        columns = {field: [values[field] for values in self.buffer] for field in self.schema.names}
+        self.writer.write_table(self.pyarrow.table(columns, schema=self.schema))
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+def records_columnar_bytes(records, format_name="parquet"):
+    """Typed Parquet / Arrow IPC bytes of plain parcel records (search results download)"""
+    buffer = io.BytesIO()
+    writer = ColumnarWriter(buffer, format_name, with_request=False)
+    writer.write(records)
+    writer.close()
+    return buffer.getvalue()
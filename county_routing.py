@@ -0,0 +1,160 @@
+import json
+import threading
+
+from ohio_counties import get_county
+from parcel_formats import classify_parcel_id, match_key, normalize_parcel_id
+from parcel_store import get_parcel_store, record_key, register_ingest_hook
+
+# --------------------------
+# Learned County Routing Configuration
+# --------------------------
+ROUTING_CONFIG = {
+    "MAX_PREFIX": 6,        # Longest ID prefix consulted
+    "MIN_SAMPLES": 5,       # Resolved IDs under a prefix before its county counts are trusted
+    "CONFIDENT": 0.8        # Probability a county needs before a search is narrowed to it
+}
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string that starts with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+class CountyRouter:
+    """
+    Which county each resolved parcel ID belongs to, in the parcel store
+    database. routing_ids is indexed on (id_length, canonical), so the
+    parcels under an ID prefix are one index range: the B-tree serves as the
+    prefix trie, and a GROUP BY county over the range gives the county
+    probabilities at that node.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        conn = store._connect()
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS routing_ids (
+                    record_key TEXT PRIMARY KEY,
+                    canonical TEXT NOT NULL,
+                    id_length INTEGER NOT NULL,
+                    county_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS routing_ids_prefix ON routing_ids (id_length, canonical, county_id);
+            """)
+        # Parcels stored before the router existed
+        if conn.execute("SELECT COUNT(*) FROM routing_ids").fetchone()[0] == 0:
+            rows = conn.execute("SELECT record FROM parcels").fetchall()
+            self.ingest([json.loads(row[0]) for row in rows])
+
+    def ingest(self, records):
+        """Ingest hook: learn the county every fetched parcel resolved to"""
+        rows = []
+        for record in records:
+            county = get_county(record.get('county_id')) if record.get('county_id') is not None else None
+            # The county-less canonical form is what a statewide search starts from
+            canonical = normalize_parcel_id(str(record.get('parcel_id') or "")).canonical
+            if county and canonical:
+                rows.append((record_key(record), canonical, len(canonical), county['county_id']))
+        conn = self.store._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO routing_ids VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def county_probabilities(self, parcel_id):
+        """
+        {county name: probability} from the longest prefix of parcel_id with
+        at least MIN_SAMPLES resolved IDs of the same length; {} if none has
+        """
+        canonical = normalize_parcel_id(parcel_id).canonical
+        conn = self.store._connect()
+        for length in range(min(ROUTING_CONFIG["MAX_PREFIX"], len(canonical)), 0, -1):
+            prefix = canonical[:length]
+            rows = conn.execute("""
+                SELECT county_id, COUNT(*) FROM routing_ids
+                WHERE id_length = ? AND canonical >= ? AND canonical < ?
+                GROUP BY county_id
+            """, (len(canonical), prefix, prefix_upper_bound(prefix))).fetchall()
+            total = sum(count for _, count in rows)
+            if total >= ROUTING_CONFIG["MIN_SAMPLES"]:
+                return {get_county(county_id)['name']: count / total for county_id, count in rows}
+        return {}
+
+    def likely_county(self, parcel_ids):
+        """
+        The county to narrow a statewide search of parcel_ids (display
+        strings) to, or None. It must be likely for every ID, allowed by the
+        format rules when those narrow it down, and at least CONFIDENT: a
+        weaker guess would usually cost a county search plus the statewide
+        one instead of the statewide search alone.
+        """
+        combined = None
+        for parcel_id in parcel_ids:
+            probabilities = self.county_probabilities(parcel_id)
+            formats = classify_parcel_id(parcel_id)
+            if formats:
+                probabilities = {county: p for county, p in probabilities.items() if county in formats}
+            if combined is None:
+                combined = probabilities
+            else:
+                combined = {county: min(p, probabilities[county]) for county, p in combined.items() if county in probabilities}
+            if not combined:
+                return None
+        total = sum(combined.values())
+        county, probability = max(combined.items(), key=lambda item: item[1])
+        return county if probability / total >= ROUTING_CONFIG["CONFIDENT"] else None
+
+_county_router = None
+_county_router_lock = threading.Lock()
+
+def get_county_router():
+    """
+    Return the process-wide county router, registering its ingest hook on first use
+    """
+    global _county_router
+    if _county_router is None:
+        with _county_router_lock:
+            if _county_router is None:
+                _county_router = CountyRouter(get_parcel_store())
+                register_ingest_hook(_county_router.ingest)
+    return _county_router
+
+def unmatched_ids(parcel_ids, result):
+    """The parcel_ids (ParcelId tuples) that no record of an OK result answers"""
+    found = {match_key(record.get('parcel_id')) for record in result.get("results") or [] if isinstance(record, dict)}
+    return [parcel_id for parcel_id in parcel_ids if match_key(parcel_id.canonical) not in found]
+
+def merge_results(result, extra):
+    """Add the records of OK response extra to OK response result, skipping ones it already has"""
+    records = list(result.get("results") or [])
+    seen = {record_key(record) for record in records if isinstance(record, dict)}
+    added = [record for record in extra.get("results") or [] if isinstance(record, dict) and record_key(record) not in seen]
+    result["results"] = records + added
+    for field in ("count", "total_records"):
+        if field in result:
+            result[field] = (result[field] or 0) + len(added)
+    return result
+
+def search_routed(search, county, parcel_ids):
+    """
+    Run search(county, parcel_ids) for the routed county, then search
+    statewide for whichever IDs it did not find (all of them on NOT_FOUND),
+    so a lookup costs at most two upstream searches. Returns (county, result)
+    when the county found anything, with statewide finds merged in, else
+    (None, statewide result). A failure other than NOT_FOUND is returned
+    as-is. county None searches statewide straight away.
+    """
+    remaining = list(parcel_ids)
+    if county is not None:
+        result = search(county, remaining)
+        status = result.get("status")
+        if status not in ("OK", "NOT_FOUND"):
+            return county, result
+        if status == "OK":
+            # A partial answer only settles the IDs it found
+            remaining = unmatched_ids(remaining, result)
+            if not remaining:
+                return county, result
+            statewide = search(None, remaining)
+            if statewide.get("status") == "OK":
+                merge_results(result, statewide)
+            return county, result
+    return None, search(None, remaining)
@@ -0,0 +1,304 @@
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from itertools import islice
+
+from batch_fetch import BATCH_COLUMNS, summary_row
+from census_table import enrich_records
+from columnar_export import COLUMNAR_FORMATS, ColumnarWriter
+from parcel_cache import CACHE_CONFIG
+from result_frame import frame_rows, results_frame
+
+# --------------------------
+# Batch Result Writers
+# --------------------------
+# Each writer takes result rows chunk by chunk (as fetch_batch yields them)
+# and writes them out straight away, so a long run's output grows as it goes
+# and a crash loses at most the chunk in flight. Parquet and Arrow output is
+# typed (columnar_export) and lands a row group at a time instead.
+EXPORT_FORMATS = {
+    ".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv",
+    ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"
+}
+
+EXPORT_CONFIG = {
+    "ENRICH_CHUNK_ROWS": 1000    # Rows per vectorized census lookup in NDJSON output
+}
+
+def chunked(rows, size):
+    """Lists of up to size rows from any iterable, without materializing it"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def export_format(path, requested=None):
+    """Output format: the one requested, else inferred from the file extension, else NDJSON"""
+    if requested:
+        return requested
+    return EXPORT_FORMATS.get(os.path.splitext(path or "")[1].lower(), "ndjson")
+
+class NdjsonWriter:
+    """
+    One JSON object per parcel: request fields plus the full record, and a
+    "census" object when a census attribute table is installed
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+
+    def write(self, rows):
+        for chunk in chunked(rows, EXPORT_CONFIG["ENRICH_CHUNK_ROWS"]):
+            census = enrich_records([row["record"] or {} for row in chunk])
+            for row, attributes in zip(chunk, census):
+                if attributes is not None:
+                    row = dict(row, census=attributes)
+                self.handle.write(json.dumps(row, default=str) + "\n")
+        self.handle.flush()
+
+    def close(self):
+        pass
+
+class CsvWriter:
+    """The summary table columns shown in the app's bulk results"""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.writer = csv.DictWriter(handle, fieldnames=BATCH_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(summary_row(row) for row in rows)
+        self.handle.flush()
+
+    def close(self):
+        pass
+
+def open_writer(path, format_name):
+    """
+    (writer, handle) for path, or stdout when path is None or '-'. handle is
+    None when the writer manages its own file. Raises ValueError for
+    unsupported combinations.
+    """
+    to_stdout = path in (None, "-")
+    if format_name in COLUMNAR_FORMATS:
+        if to_stdout:
+            raise ValueError(f"{format_name.title()} output needs an --output file")
+        return ColumnarWriter(path, format_name), None
+    if format_name not in ("ndjson", "csv"):
+        raise ValueError(f"Unknown output format: {format_name}")
+    handle = sys.stdout if to_stdout else open(path, "w", newline="", encoding="utf-8")
+    writer = NdjsonWriter(handle) if format_name == "ndjson" else CsvWriter(handle)
+    return writer, (None if to_stdout else handle)
+
+# --------------------------
+# Spooled NDJSON Downloads
+# --------------------------
+# Result records go to a temp file one line at a time instead of into one
+# json.dumps(indent=2) string, so the page never builds the pretty-printed
+# text. The download still reads the whole (gzipped) file into memory when
+# it is clicked, since st.download_button serves bytes, not a stream.
+SPOOL_CONFIG = {
+    "DIR": os.path.join(CACHE_CONFIG["DIR"], "spool"),
+    "GZIP": True,
+    "MAX_AGE_SECONDS": 6 * 3600    # Spool files left behind by ended sessions are swept after this
+}
+
+def sweep_spools(directory=None, max_age_seconds=None):
+    """Delete spool files older than MAX_AGE_SECONDS"""
+    directory = directory or SPOOL_CONFIG["DIR"]
+    cutoff = time.time() - (max_age_seconds or SPOOL_CONFIG["MAX_AGE_SECONDS"])
+    for entry in os.scandir(directory):
+        try:
+            if entry.name.startswith("results-") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+class NdjsonSpool:
+    """
+    NDJSON records written to a temp file as they arrive, gzipped unless
+    compress=False. write() any number of times, close(), then hand reader
+    to st.download_button as its data callable.
+    """
+
+    def __init__(self, directory=None, compress=None):
+        directory = directory or SPOOL_CONFIG["DIR"]
+        os.makedirs(directory, exist_ok=True)
+        sweep_spools(directory)
+        self.compress = SPOOL_CONFIG["GZIP"] if compress is None else compress
+        self.file = tempfile.NamedTemporaryFile(
+            dir=directory, prefix="results-", suffix=".ndjson.gz" if self.compress else ".ndjson", delete=False
+        )
+        self.path = self.file.name
+        self.handle = gzip.GzipFile(fileobj=self.file, mode="wb", compresslevel=6) if self.compress else self.file
+        self.count = 0
+
+    @property
+    def extension(self):
+        return ".ndjson.gz" if self.compress else ".ndjson"
+
+    @property
+    def mime(self):
+        return "application/gzip" if self.compress else "application/x-ndjson"
+
+    def write(self, records):
+        for record in records:
+            self.handle.write(json.dumps(record, default=str).encode("utf-8") + b"\n")
+            self.count += 1
+
+    def close(self):
+        if self.handle is not self.file:
+            self.handle.close()
+        self.file.close()
+
+    def reader(self):
+        """The finished file's bytes, read whole; empty once the spool has been discarded"""
+        try:
+            with open(self.path, "rb") as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return b""
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+# --------------------------
+# Per-Parcel PDF Report Bundles
+# --------------------------
+# One PDF per parcel, each added to a ZIP on disk as soon as it is rendered,
+# plus a manifest.csv listing every row (with the reason when a parcel has no
+# report). Rows are pulled from the input a chunk at a time and only one PDF
+# is held in memory, so building a bundle of thousands of parcels stays small.
+# The finished archive lives on disk; handing it to st.download_button reads
+# it into memory once, at download time, since Streamlit serves bytes.
+REPORT_ZIP_CONFIG = {
+    "CHUNK_ROWS": 200,      # Records normalized per results_frame() pass
+    "MANIFEST": "manifest.csv"
+}
+
+REPORT_MANIFEST_COLUMNS = ["file", "row", "parcel_id", "county", "status", "address", "owner", "market_value", "message"]
+
+def report_filename(row, parcel_id):
+    """'00012_443-27-012.pdf': input row first so the archive lists in input order"""
+    safe_id = re.sub(r"[^0-9A-Za-z._-]+", "-", str(parcel_id or "")).strip("-.") or "parcel"
+    return f"{row:05d}_{safe_id}.pdf"
+
+class ReportZipWriter:
+    """
+    Batch-row writer (like NdjsonWriter) that renders each found record with
+    render_report(property_data) -> PDF bytes, property_data being the
+    normalized row from result_frame. path=None spools to a temp file that
+    reader can hand to st.download_button.
+    """
+
+    def __init__(self, render_report, path=None):
+        self.render_report = render_report
+        if path is None:
+            os.makedirs(SPOOL_CONFIG["DIR"], exist_ok=True)
+            sweep_spools()
+            handle = tempfile.NamedTemporaryFile(dir=SPOOL_CONFIG["DIR"], prefix="results-", suffix=".zip", delete=False)
+            path = handle.name
+            handle.close()
+        self.path = path
+        # ReportLab already compresses page streams; only the manifest is deflated
+        self.archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED)
+        self.manifest = io.TextIOWrapper(tempfile.TemporaryFile(), encoding="utf-8", newline="")
+        self.manifest_writer = csv.DictWriter(self.manifest, fieldnames=REPORT_MANIFEST_COLUMNS)
+        self.manifest_writer.writeheader()
+        self.count = 0
+
+    extension = ".zip"
+    mime = "application/zip"
+
+    def write(self, rows):
+        for chunk in chunked(rows, REPORT_ZIP_CONFIG["CHUNK_ROWS"]):
+            found = [row for row in chunk if row["status"] == "OK" and row["record"]]
+            properties = dict(zip(map(id, found), frame_rows(results_frame([row["record"] for row in found])))) if found else {}
+            for row in chunk:
+                self.add(row, properties.get(id(row)))
+
+    def add(self, row, property_data=None):
+        file_name, message = "", row["message"]
+        if property_data is not None:
+            try:
+                pdf_bytes = self.render_report(property_data)
+            except Exception as e:
+                message = f"Report failed: {e}"
+            else:
+                file_name = report_filename(row["row"], row["parcel_id"])
+                self.archive.writestr(file_name, pdf_bytes)
+                self.count += 1
+        property_data = property_data or {}
+        self.manifest_writer.writerow({
+            "file": file_name,
+            "row": row["row"],
+            "parcel_id": row["parcel_id"],
+            "county": row["county"] or property_data.get('county_name') or "",
+            "status": row["status"],
+            "address": property_data.get('address') or "",
+            "owner": property_data.get('owner') or "",
+            "market_value": property_data.get('mkt_val_tot') if property_data.get('mkt_val_tot') is not None else "",
+            "message": message
+        })
+
+    def close(self):
+        self.manifest.flush()
+        self.manifest.seek(0)
+        info = zipfile.ZipInfo(REPORT_ZIP_CONFIG["MANIFEST"], date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with self.archive.open(info, "w", force_zip64=True) as target:
+            shutil.copyfileobj(self.manifest.buffer, target)
+        self.manifest.close()
+        self.archive.close()
+
+    def reader(self):
+        """The finished archive's bytes, read whole for st.download_button; empty once it has been discarded"""
+        try:
+            with open(self.path, "rb") as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return b""
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+def records_report_zip(records, render_report):
+    """
+    ZIP bytes of a search's result records, one report each, built through a
+    temp file. Meant as a deferred st.download_button callable: nothing is
+    rendered until the download is clicked, and the bytes are held only
+    while Streamlit serves them.
+    """
+    writer = ReportZipWriter(render_report)
+    try:
+        writer.write({
+            "row": row,
+            "parcel_id": record.get('parcel_id') or "",
+            "county": record.get('county_name') or "",
+            "status": "OK",
+            "message": "",
+            "record": record
+        } for row, record in enumerate(records, start=1))
+    finally:
+        writer.close()
+    try:
+        return writer.reader()
+    finally:
+        writer.discard()
@@ -0,0 +1,295 @@
+import re
+import threading
+import time
+from array import array
+from functools import lru_cache
+
+import numpy as np
+
+from ohio_counties import get_county
+from parcel_store import get_parcel_store, record_key, register_ingest_hook
+
+# --------------------------
+# Fuzzy Matching Configuration
+# --------------------------
+FUZZY_CONFIG = {
+    "MIN_SCORE": 0.5,            # Similarity below this is not offered as a match
+    "MAX_SCAN_POSTINGS": 200000, # Posting entries read per query; the rarest trigrams go first
+    "RESCORE_FACTOR": 5,         # Candidates rescored exactly per requested result
+    "MERGE_THRESHOLD": 20000,    # Pending documents merged into the compact postings
+    "SYNC_INTERVAL_SECONDS": 30  # Searches within this long of the last sync skip the store query
+}
+
+# --------------------------
+# USPS Address Normalization
+# --------------------------
+# Publication 28 street suffix, directional and unit abbreviations (common
+# spellings seen in typed searches included), so "2469 Dobson Court" and
+# "2469 DOBSON Ct" normalize to the same text.
+USPS_ABBREVIATIONS = {
+    "ALLEY": "ALY", "ALLY": "ALY", "AVENUE": "AVE", "AV": "AVE", "AVEN": "AVE", "AVNUE": "AVE",
+    "BOULEVARD": "BLVD", "BOUL": "BLVD", "BOULV": "BLVD", "CIRCLE": "CIR", "CIRC": "CIR", "CRCL": "CIR",
+    "COURT": "CT", "CRT": "CT", "COVE": "CV", "CRESCENT": "CRES", "CROSSING": "XING",
+    "DRIVE": "DR", "DRIV": "DR", "DRV": "DR", "EXPRESSWAY": "EXPY", "EXTENSION": "EXT",
+    "FREEWAY": "FWY", "HEIGHTS": "HTS", "HIGHWAY": "HWY", "HIWAY": "HWY", "HOLLOW": "HOLW",
+    "JUNCTION": "JCT", "LANE": "LN", "LOOP": "LOOP", "MANOR": "MNR", "MEADOWS": "MDWS",
+    "PARKWAY": "PKWY", "PKY": "PKWY", "PIKE": "PIKE", "PLACE": "PL", "PLAZA": "PLZ", "POINT": "PT",
+    "RIDGE": "RDG", "ROAD": "RD", "ROUTE": "RTE", "RUN": "RUN", "SQUARE": "SQ", "SQR": "SQ",
+    "STREET": "ST", "STR": "ST", "STRT": "ST", "TERRACE": "TER", "TERR": "TER", "TRAIL": "TRL",
+    "TRAILS": "TRL", "TURNPIKE": "TPKE", "VIEW": "VW", "VILLAGE": "VLG", "WAY": "WAY",
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+    "APARTMENT": "APT", "SUITE": "STE", "UNIT": "UNIT", "BUILDING": "BLDG", "FLOOR": "FL",
+    "ROOM": "RM", "NUMBER": "#", "NO": "#"
+}
+
+WORD_PATTERN = re.compile(r"[0-9A-Z#]+")
+
+@lru_cache(maxsize=65536)
+def normalize_address(address):
+    """
+    Upper-case, drop punctuation and apply USPS abbreviations word by word
+    """
+    words = WORD_PATTERN.findall(str(address or "").upper())
+    return " ".join(USPS_ABBREVIATIONS.get(word, word) for word in words)
+
+@lru_cache(maxsize=65536)
+def normalize_owner(owner):
+    """
+    Upper-case owner name with punctuation removed and whitespace collapsed
+    """
+    return " ".join(WORD_PATTERN.findall(str(owner or "").upper()))
+
+FIELD_NORMALIZERS = {
+    "address": normalize_address,
+    "owner": normalize_owner
+}
+
+def trigrams(text):
+    """Set of character trigrams of text, padded so word starts and ends count"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def similarity(shared, query_count, doc_count):
+    """Mean of Dice similarity and query containment (works on numpy arrays too)"""
+    return (2.0 * shared / (query_count + doc_count) + shared / query_count) / 2
+
+# --------------------------
+# Trigram Index
+# --------------------------
+class TrigramIndex:
+    """
+    In-memory trigram index over one normalized text field.
+
+    Postings are compact numpy arrays, plus a small pending area for documents
+    added since the last merge. A query counts shared trigrams over the rarest
+    postings, then rescores the best candidates exactly. The score averages
+    Dice similarity with the share of the query's trigrams found, so a
+    partial owner name still ranks its full record highly.
+    """
+
+    def __init__(self, normalizer):
+        self.normalizer = normalizer
+        self.keys = []          # doc id -> record key
+        self.texts = []         # doc id -> normalized text
+        self.gram_counts = array("i")
+        self.doc_ids = {}       # record key -> current doc id
+        self.postings = {}      # trigram -> np.ndarray of doc ids
+        self.pending = {}       # trigram -> array of doc ids not merged yet
+        self.pending_docs = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def add(self, key, text):
+        """Index text for key, replacing whatever key had before"""
+        text = self.normalizer(text)
+        with self._lock:
+            old = self.doc_ids.get(key)
+            if old is not None:
+                if self.texts[old] == text:
+                    return
+                # Stale doc stays in the postings but can never score
+                self.gram_counts[old] = 0
+            if not text:
+                self.doc_ids.pop(key, None)
+                return
+            doc_id = len(self.keys)
+            grams = trigrams(text)
+            self.keys.append(key)
+            self.texts.append(text)
+            self.gram_counts.append(len(grams))
+            self.doc_ids[key] = doc_id
+            for gram in grams:
+                posting = self.pending.get(gram)
+                if posting is None:
+                    posting = self.pending[gram] = array("i")
+                posting.append(doc_id)
+            self.pending_docs += 1
+            if self.pending_docs >= FUZZY_CONFIG["MERGE_THRESHOLD"]:
+                self._merge()
+
+    def _merge(self):
+        for gram, posting in self.pending.items():
+            merged = np.frombuffer(posting, dtype=np.int32)
+            existing = self.postings.get(gram)
+            self.postings[gram] = merged.copy() if existing is None else np.concatenate((existing, merged))
+        self.pending = {}
+        self.pending_docs = 0
+
+    def search(self, text, limit=10, min_score=None):
+        """
+        Top matches as (record_key, score, normalized_text), best first
+        """
+        min_score = FUZZY_CONFIG["MIN_SCORE"] if min_score is None else min_score
+        query = self.normalizer(text)
+        if not query:
+            return []
+        query_grams = trigrams(query)
+        with self._lock:
+            if not self.keys:
+                return []
+            self._merge()
+            lists = sorted(
+                (self.postings[gram] for gram in query_grams if gram in self.postings),
+                key=len
+            )
+            if not lists:
+                return []
+            # Rarest trigrams first; very common ones ("ST ", " RD") only add
+            # noise and cost, so stop once the scan budget is spent
+            budget = FUZZY_CONFIG["MAX_SCAN_POSTINGS"]
+            selected = []
+            for posting in lists:
+                if selected and budget < len(posting):
+                    break
+                selected.append(posting)
+                budget -= len(posting)
+            # Only documents sharing a trigram are scored, never the whole corpus
+            doc_ids, shared = np.unique(np.concatenate(selected), return_counts=True)
+            gram_counts = np.frombuffer(self.gram_counts, dtype=np.int32)[doc_ids]
+            scores = np.where(
+                gram_counts > 0,
+                similarity(shared, len(query_grams), np.maximum(gram_counts, 1)),
+                0.0
+            )
+
+            shortlist = min(limit * FUZZY_CONFIG["RESCORE_FACTOR"], len(doc_ids))
+            candidates = doc_ids[np.argpartition(-scores, shortlist - 1)[:shortlist]]
+
+            matches = []
+            for doc_id in candidates.tolist():
+                if self.gram_counts[doc_id] == 0:
+                    continue
+                doc_grams = trigrams(self.texts[doc_id])
+                score = similarity(len(query_grams & doc_grams), len(query_grams), len(doc_grams))
+                if score >= min_score:
+                    matches.append((self.keys[doc_id], round(score, 3), self.texts[doc_id]))
+        matches.sort(key=lambda match: -match[1])
+        return matches[:limit]
+
+# --------------------------
+# Process-wide Fuzzy Index over the Local Parcel Store
+# --------------------------
+class ParcelFuzzyIndex:
+    """
+    Trigram indexes for addresses and owners of every record in the local
+    parcel store. Built in a background thread on first use, then kept
+    current by the ingest hook for records fetched here and by a throttled
+    sync for rows written by other worker processes.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.indexes = {field: TrigramIndex(normalizer) for field, normalizer in FIELD_NORMALIZERS.items()}
+        self.synced_until = 0.0
+        self.next_sync = 0.0
+        self.ready = threading.Event()
+        self._sync_lock = threading.Lock()
+        threading.Thread(target=self.sync, name="parcel-fuzzy-index", daemon=True).start()
+
+    def sync(self):
+        """Index rows fetched since the last sync; returns how many were read"""
+        with self._sync_lock:
+            rows = self.store.rows_fetched_since(self.synced_until, ["address", "owner"])
+            for key, address, owner, fetched_at in rows:
+                self.indexes["address"].add(key, address)
+                self.indexes["owner"].add(key, owner)
+                self.synced_until = max(self.synced_until, fetched_at)
+            self.next_sync = time.monotonic() + FUZZY_CONFIG["SYNC_INTERVAL_SECONDS"]
+            self.ready.set()
+            return len(rows)
+
+    def ingest(self, records):
+        """Ingest hook: index freshly fetched records without waiting for the next sync"""
+        for record in records:
+            key = record_key(record)
+            self.indexes["address"].add(key, record.get('address'))
+            self.indexes["owner"].add(key, record.get('owner'))
+
+    def search(self, text, field, limit=10, min_score=None):
+        """
+        Fuzzy matches for text in field ('address' or 'owner'). Returns [] while
+        the initial build is still running so callers fall back to the API.
+        """
+        if not self.ready.is_set():
+            return []
+        if time.monotonic() >= self.next_sync:
+            self.sync()
+        return self.indexes[field].search(text, limit, min_score)
+
+_fuzzy_index = None
+_fuzzy_index_lock = threading.Lock()
+
+def get_fuzzy_index():
+    """
+    Return the process-wide fuzzy index, starting its build and registering
+    its ingest hook on first use
+    """
+    global _fuzzy_index
+    if _fuzzy_index is None:
+        with _fuzzy_index_lock:
+            if _fuzzy_index is None:
+                _fuzzy_index = ParcelFuzzyIndex(get_parcel_store())
+                register_ingest_hook(_fuzzy_index.ingest)
+    return _fuzzy_index
+
+def fuzzy_search_records(text, field, county_name=None, limit=10, min_score=None):
+    """
+    Stored records best matching text as (record, score) pairs, best first,
+    optionally limited to one county
+    """
+    county = get_county(county_name) if county_name else None
+    matches = get_fuzzy_index().search(text, field, limit if county is None else limit * 5, min_score)
+    records = {key: None for key, _, _ in matches}
+    for record in get_parcel_store().get_records(records):
+        records[record_key(record)] = record
+    results = []
+    for key, score, _ in matches:
+        record = records.get(key)
+        if record is None or (county is not None and record.get('county_id') != county['county_id']):
+            continue
+        results.append((record, score))
+    return results[:limit]
+
+def fuzzy_suggestions(text, field, county_name=None, limit=5):
+    """
+    Did-you-mean entries for a missed owner/address search, shaped like
+    parcel_suggest.did_you_mean: the closest known record text is both the
+    button label and the query to run instead
+    """
+    suggestions = []
+    for record, score in fuzzy_search_records(text, field, county_name, limit * 2):
+        value = " ".join(str(record.get(field) or "").split())
+        if not value or any(suggestion["query"] == value for suggestion in suggestions):
+            continue
+        suggestions.append({
+            "parcel_id": record.get('parcel_id'),
+            "label": value,
+            "county": record.get('county_name') or "",
+            "original": text,
+            "query": value,
+            "score": score
+        })
+    return suggestions[:limit]
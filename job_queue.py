@@ -0,0 +1,239 @@
+import os
+import queue
+import threading
+import time
+import uuid
+
+from batch_fetch import BATCH_CONFIG, BatchProgress, batch_items
+from batch_jobs import get_job_store, run_job
+from columnar_export import columnar_available
+from exporters import ReportZipWriter, open_writer
+from parcel_cache import CACHE_CONFIG
+
+# --------------------------
+# Background Job Queue Configuration
+# --------------------------
+# Bulk lookups run on a small pool of worker threads owned by the process,
+# not on the Streamlit script thread: the page submits a job, gets its ID
+# back at once and polls its status while workers normalize, fetch and export.
+JOB_QUEUE_CONFIG = {
+    "WORKERS": 2,           # Jobs running at once (each also runs MAX_WORKERS chunk requests)
+    "MAX_QUEUED": 8,        # Jobs waiting beyond that; submit() refuses more (backpressure)
+    "EXPORT_DIR": os.path.join(CACHE_CONFIG["DIR"], "exports"),
+    "EXPORT_FORMATS": ["ndjson", "csv", "parquet"],   # parquet is skipped without pyarrow; pdf_zip is added with a renderer
+    "KEEP_FINISHED": 50,    # Finished jobs kept for polling; older ones lose their exports and checkpoints
+    "MAX_AGE_SECONDS": 7 * 86400,   # Exports left by an earlier process are swept after this
+    "POLL_SECONDS": 2       # How often the app's status view refreshes
+}
+
+EXPORT_EXTENSIONS = {"ndjson": ".ndjson", "csv": ".csv", "parquet": ".parquet", "arrow": ".arrow", "pdf_zip": ".zip"}
+
+def sweep_exports(directory=None, max_age_seconds=None):
+    """
+    Delete job exports older than MAX_AGE_SECONDS, with the checkpoint rows
+    of the jobs they came from. Catches what a restarted process never
+    got to forget.
+    """
+    directory = directory or JOB_QUEUE_CONFIG["EXPORT_DIR"]
+    if not os.path.isdir(directory):
+        return
+    cutoff = time.time() - (max_age_seconds or JOB_QUEUE_CONFIG["MAX_AGE_SECONDS"])
+    swept = set()
+    for entry in os.scandir(directory):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                swept.add(os.path.splitext(entry.name)[0])
+        except OSError:
+            pass
+    store = get_job_store()
+    for job_id in swept:
+        store.delete(job_id)
+
+def delete_job_files(job_id, outputs):
+    """Remove a forgotten job's export files and checkpoint rows"""
+    for path in outputs.values():
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    get_job_store().delete(job_id)
+
+class JobQueueFull(Exception):
+    """Raised by submit() when MAX_QUEUED jobs are already waiting"""
+
+class BatchJobQueue:
+    """
+    Bounded FIFO of bulk lookup jobs and the daemon threads that run them.
+    Rows are checkpointed through batch_jobs, so a job's results survive a
+    restart and resubmitting the same input under its job ID resumes it.
+    With render_report(property_data) -> PDF bytes, finished jobs also get
+    a ZIP of per-parcel reports.
+    """
+
+    def __init__(self, fetch_chunk, workers=None, max_queued=None, render_report=None):
+        self.fetch_chunk = fetch_chunk
+        self.render_report = render_report
+        self.pending = queue.Queue(maxsize=max_queued or JOB_QUEUE_CONFIG["MAX_QUEUED"])
+        self.statuses = {}
+        self._cancelled = set()
+        self._lock = threading.Lock()
+        sweep_exports()
+        for index in range(JOB_QUEUE_CONFIG["WORKERS"] if workers is None else workers):
+            threading.Thread(target=self._work, name=f"batch-worker-{index}", daemon=True).start()
+
+    def submit(self, frame, parcel_column, county_column=None, default_county=None, job_id=None):
+        """
+        Queue a bulk lookup of frame's parcel_column and return its job ID
+        right away. Raises JobQueueFull when the queue is at its limit.
+        """
+        job_id = job_id or f"bulk-{uuid.uuid4().hex[:12]}"
+        status = {
+            "job_id": job_id,
+            "state": "queued",
+            "total": None,
+            "done": 0,
+            "counts": {},
+            "rate": 0.0,
+            "eta_seconds": None,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "message": "",
+            "outputs": {}
+        }
+        with self._lock:
+            self.statuses[job_id] = status
+        try:
+            self.pending.put_nowait((job_id, frame, parcel_column, county_column, default_county))
+        except queue.Full:
+            with self._lock:
+                del self.statuses[job_id]
+            raise JobQueueFull(f"{self.pending.maxsize} bulk jobs are already waiting; try again shortly")
+        return job_id
+
+    def status(self, job_id):
+        """Snapshot of a job's status dict, or None for an unknown job"""
+        with self._lock:
+            status = self.statuses.get(job_id)
+            if status is None:
+                return None
+            snapshot = dict(status, counts=dict(status["counts"]), outputs=dict(status["outputs"]))
+        if snapshot["state"] == "queued":
+            snapshot["queue_position"] = self._queue_position(job_id)
+        return snapshot
+
+    def _queue_position(self, job_id):
+        with self.pending.mutex:
+            waiting = [entry[0] for entry in self.pending.queue]
+        return waiting.index(job_id) + 1 if job_id in waiting else None
+
+    def cancel(self, job_id):
+        """Stop a job after its current chunk (or before it starts); finished rows stay checkpointed"""
+        with self._lock:
+            self._cancelled.add(job_id)
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            self.statuses[job_id].update(changes)
+
+    def _work(self):
+        while True:
+            job_id, frame, parcel_column, county_column, default_county = self.pending.get()
+            try:
+                self._run(job_id, frame, parcel_column, county_column, default_county)
+            except Exception as e:
+                self._update(job_id, state="failed", message=str(e), finished_at=time.time())
+            finally:
+                self.pending.task_done()
+                self._forget_old()
+
+    def _run(self, job_id, frame, parcel_column, county_column, default_county):
+        if job_id in self._cancelled:
+            self._update(job_id, state="cancelled", finished_at=time.time())
+            return
+        self._update(job_id, state="running", started_at=time.time())
+
+        # Normalize
+        items = batch_items(frame, parcel_column, county_column, default_county)
+        if not items:
+            raise ValueError("No parcel IDs found in the selected column")
+        if len(items) > BATCH_CONFIG["MAX_ROWS"]:
+            raise ValueError(f"{len(items):,} parcels exceeds the bulk limit of {BATCH_CONFIG['MAX_ROWS']:,}")
+        store = get_job_store()
+        pending = store.start(job_id, items)
+        counts = {"OK": 0, "NOT_FOUND": 0, "KNOWN_INVALID": 0, "ERROR": 0}
+        counts.update(store.counts(job_id))
+        self._update(job_id, total=len(items), done=len(items) - len(pending), counts=dict(counts))
+
+        # Fetch, checkpointing every chunk
+        progress = BatchProgress(len(pending))
+        batch = run_job(job_id, pending, self.fetch_chunk)
+        for rows in batch:
+            for row in rows:
+                counts[row["status"]] += 1
+            progress.advance(len(rows))
+            self._update(
+                job_id, done=len(items) - len(pending) + progress.done, counts=dict(counts),
+                rate=progress.rate, eta_seconds=progress.eta_seconds
+            )
+            if job_id in self._cancelled:
+                batch.close()
+                self._update(job_id, state="cancelled", finished_at=time.time())
+                return
+
+        # Export
+        os.makedirs(JOB_QUEUE_CONFIG["EXPORT_DIR"], exist_ok=True)
+        # Each writer streams its own pass over the checkpoint rows
+        outputs = {}
+        for format_name in JOB_QUEUE_CONFIG["EXPORT_FORMATS"]:
+            if format_name == "parquet" and not columnar_available():
+                continue
+            path = os.path.join(JOB_QUEUE_CONFIG["EXPORT_DIR"], job_id + EXPORT_EXTENSIONS[format_name])
+            writer, handle = open_writer(path, format_name)
+            try:
+                writer.write(store.results(job_id))
+            finally:
+                writer.close()
+                if handle is not None:
+                    handle.close()
+            outputs[format_name] = path
+        if self.render_report is not None:
+            self._update(job_id, message="Rendering PDF reports")
+            path = os.path.join(JOB_QUEUE_CONFIG["EXPORT_DIR"], job_id + EXPORT_EXTENSIONS["pdf_zip"])
+            writer = ReportZipWriter(self.render_report, path)
+            try:
+                writer.write(store.results(job_id))
+            finally:
+                writer.close()
+            outputs["pdf_zip"] = path
+        self._update(job_id, state="done", message="", outputs=outputs, eta_seconds=0, finished_at=time.time())
+
+    def _forget_old(self):
+        with self._lock:
+            finished = sorted(
+                (status["finished_at"], job_id) for job_id, status in self.statuses.items() if status["finished_at"]
+            )
+            forgotten = []
+            for _, job_id in finished[:-JOB_QUEUE_CONFIG["KEEP_FINISHED"]]:
+                forgotten.append((job_id, self.statuses.pop(job_id)["outputs"]))
+                self._cancelled.discard(job_id)
+        # A forgotten job can no longer be polled, so nothing will ask for its files again
+        for job_id, outputs in forgotten:
+            delete_job_files(job_id, outputs)
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue(fetch_chunk, render_report=None):
+    """
+    Return the process-wide bulk job queue, starting its workers on first use.
+    fetch_chunk(parcel_ids, county_name) -> response dict is what workers call per chunk;
+    render_report, if given, renders the per-parcel PDFs of each finished job.
+    """
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = BatchJobQueue(fetch_chunk, render_report=render_report)
+    return _job_queue
@@ -1,15 +1,29 @@
 import streamlit as st
 import json
 import pandas as pd
-import requests
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+import functools
 import io
+import os
 import time
+from ohio_counties import county_short_name, COUNTIES_BY_REGION, COUNTY_NAMES, OHIO_TOTALS
+from lookup_core import REPORTALLUSA_CONFIG, comprehensive_property_search, search_multiple_parcels
+from batch_fetch import BATCH_CONFIG, batch_frame, guess_column, read_parcel_table
+from batch_jobs import get_job_store
+from columnar_export import columnar_available, records_columnar_bytes
+from result_frame import (
+    GROUP_FIELDS, format_date, format_money, format_number, format_value, frame_rows, portfolio_summary,
+    results_frame, summary_table
+)
+from job_queue import JOB_QUEUE_CONFIG, JobQueueFull, get_job_queue
+from exporters import records_report_zip
+from census_table import census_attributes
+from parcel_cache import cached_artifact, cached_json_bytes, cache_stats_snapshot, start_stats_server
 
 # --------------------------
 # Page configuration
@@ -191,276 +205,13 @@ enhanced_css = """
 """
 st.markdown(enhanced_css, unsafe_allow_html=True)
 
-# --------------------------
-# Complete Ohio Counties Database (All 88 Counties)
-# --------------------------
-OHIO_COUNTIES_DATABASE = {
-    '01': {'code': '01', 'name': 'Adams County', 'seat': 'West Union', 'population': 27671, 'area_sq_mi': 583.91, 'founded': 1797},
-    '02': {'code': '02', 'name': 'Allen County', 'seat': 'Lima', 'population': 100866, 'area_sq_mi': 404.43, 'founded': 1820},
-    '03': {'code': '03', 'name': 'Ashland County', 'seat': 'Ashland', 'population': 52420, 'area_sq_mi': 424.37, 'founded': 1846},
-    '04': {'code': '04', 'name': 'Ashtabula County', 'seat': 'Jefferson', 'population': 96906, 'area_sq_mi': 702.44, 'founded': 1807},
-    '05': {'code': '05', 'name': 'Athens County', 'seat': 'Athens', 'population': 63218, 'area_sq_mi': 506.76, 'founded': 1805},
-    '06': {'code': '06', 'name': 'Auglaize County', 'seat': 'Wapakoneta', 'population': 45922, 'area_sq_mi': 401.25, 'founded': 1848},
-    '07': {'code': '07', 'name': 'Belmont County', 'seat': 'St. Clairsville', 'population': 64692, 'area_sq_mi': 537.35, 'founded': 1801},
-    '08': {'code': '08', 'name': 'Brown County', 'seat': 'Georgetown', 'population': 44292, 'area_sq_mi': 491.76, 'founded': 1818},
-    '09': {'code': '09', 'name': 'Butler County', 'seat': 'Hamilton', 'population': 399542, 'area_sq_mi': 467.27, 'founded': 1803},
-    '10': {'code': '10', 'name': 'Carroll County', 'seat': 'Carrollton', 'population': 26460, 'area_sq_mi': 394.67, 'founded': 1833},
-    '11': {'code': '11', 'name': 'Champaign County', 'seat': 'Urbana', 'population': 38907, 'area_sq_mi': 428.56, 'founded': 1805},
-    '12': {'code': '12', 'name': 'Clark County', 'seat': 'Springfield', 'population': 134985, 'area_sq_mi': 399.86, 'founded': 1818},
-    '13': {'code': '13', 'name': 'Clermont County', 'seat': 'Batavia', 'population': 214123, 'area_sq_mi': 451.99, 'founded': 1800},
-    '14': {'code': '14', 'name': 'Clinton County', 'seat': 'Wilmington', 'population': 42019, 'area_sq_mi': 410.88, 'founded': 1810},
-    '15': {'code': '15', 'name': 'Columbiana County', 'seat': 'Lisbon', 'population': 99823, 'area_sq_mi': 532.46, 'founded': 1803},
-    '16': {'code': '16', 'name': 'Coshocton County', 'seat': 'Coshocton', 'population': 37003, 'area_sq_mi': 564.07, 'founded': 1810},
-    '17': {'code': '17', 'name': 'Crawford County', 'seat': 'Bucyrus', 'population': 41626, 'area_sq_mi': 402.11, 'founded': 1820},
-    '18': {'code': '18', 'name': 'Cuyahoga County', 'seat': 'Cleveland', 'population': 1240594, 'area_sq_mi': 458.49, 'founded': 1807},
-    '19': {'code': '19', 'name': 'Darke County', 'seat': 'Greenville', 'population': 51462, 'area_sq_mi': 599.80, 'founded': 1809},
-    '20': {'code': '20', 'name': 'Defiance County', 'seat': 'Defiance', 'population': 38644, 'area_sq_mi': 411.16, 'founded': 1845},
-    '21': {'code': '21', 'name': 'Delaware County', 'seat': 'Delaware', 'population': 237966, 'area_sq_mi': 442.41, 'founded': 1808},
-    '22': {'code': '22', 'name': 'Erie County', 'seat': 'Sandusky', 'population': 73841, 'area_sq_mi': 254.88, 'founded': 1838},
-    '23': {'code': '23', 'name': 'Fairfield County', 'seat': 'Lancaster', 'population': 167762, 'area_sq_mi': 505.11, 'founded': 1800},
-    '24': {'code': '24', 'name': 'Fayette County', 'seat': 'Washington Court House', 'population': 28782, 'area_sq_mi': 406.58, 'founded': 1810},
-    '25': {'code': '25', 'name': 'Franklin County', 'seat': 'Columbus', 'population': 1356303, 'area_sq_mi': 539.87, 'founded': 1803},
-    '26': {'code': '26', 'name': 'Fulton County', 'seat': 'Wauseon', 'population': 42028, 'area_sq_mi': 406.78, 'founded': 1850},
-    '27': {'code': '27', 'name': 'Gallia County', 'seat': 'Gallipolis', 'population': 28886, 'area_sq_mi': 468.78, 'founded': 1803},
-    '28': {'code': '28', 'name': 'Geauga County', 'seat': 'Chardon', 'population': 95362, 'area_sq_mi': 403.66, 'founded': 1806},
-    '29': {'code': '29', 'name': 'Greene County', 'seat': 'Xenia', 'population': 172347, 'area_sq_mi': 414.88, 'founded': 1803},
-    '30': {'code': '30', 'name': 'Guernsey County', 'seat': 'Cambridge', 'population': 38438, 'area_sq_mi': 522.49, 'founded': 1810},
-    '31': {'code': '31', 'name': 'Hamilton County', 'seat': 'Cincinnati', 'population': 830639, 'area_sq_mi': 407.36, 'founded': 1790},
-    '32': {'code': '32', 'name': 'Hancock County', 'seat': 'Findlay', 'population': 75783, 'area_sq_mi': 531.31, 'founded': 1820},
-    '33': {'code': '33', 'name': 'Hardin County', 'seat': 'Kenton', 'population': 30696, 'area_sq_mi': 470.55, 'founded': 1820},
-    '34': {'code': '34', 'name': 'Harrison County', 'seat': 'Cadiz', 'population': 14483, 'area_sq_mi': 403.88, 'founded': 1813},
-    '35': {'code': '35', 'name': 'Henry County', 'seat': 'Napoleon', 'population': 26883, 'area_sq_mi': 416.85, 'founded': 1820},
-    '36': {'code': '36', 'name': 'Highland County', 'seat': 'Hillsboro', 'population': 42713, 'area_sq_mi': 553.05, 'founded': 1805},
-    '37': {'code': '37', 'name': 'Hocking County', 'seat': 'Logan', 'population': 28050, 'area_sq_mi': 423.27, 'founded': 1818},
-    '38': {'code': '38', 'name': 'Holmes County', 'seat': 'Millersburg', 'population': 44223, 'area_sq_mi': 423.06, 'founded': 1824},
-    '39': {'code': '39', 'name': 'Huron County', 'seat': 'Norwalk', 'population': 58565, 'area_sq_mi': 493.07, 'founded': 1815},
-    '40': {'code': '40', 'name': 'Jackson County', 'seat': 'Jackson', 'population': 32653, 'area_sq_mi': 420.38, 'founded': 1816},
-    '41': {'code': '41', 'name': 'Jefferson County', 'seat': 'Steubenville', 'population': 65441, 'area_sq_mi': 409.78, 'founded': 1797},
-    '42': {'code': '42', 'name': 'Knox County', 'seat': 'Mount Vernon', 'population': 62721, 'area_sq_mi': 527.64, 'founded': 1808},
-    '43': {'code': '43', 'name': 'Lake County', 'seat': 'Painesville', 'population': 230149, 'area_sq_mi': 228.21, 'founded': 1840},
-    '44': {'code': '44', 'name': 'Lawrence County', 'seat': 'Ironton', 'population': 58240, 'area_sq_mi': 455.18, 'founded': 1815},
-    '45': {'code': '45', 'name': 'Licking County', 'seat': 'Newark', 'population': 178519, 'area_sq_mi': 686.24, 'founded': 1808},
-    '46': {'code': '46', 'name': 'Logan County', 'seat': 'Bellefontaine', 'population': 45657, 'area_sq_mi': 458.48, 'founded': 1817},
-    '47': {'code': '47', 'name': 'Lorain County', 'seat': 'Elyria', 'population': 312964, 'area_sq_mi': 492.89, 'founded': 1822},
-    '48': {'code': '48', 'name': 'Lucas County', 'seat': 'Toledo', 'population': 431279, 'area_sq_mi': 340.93, 'founded': 1835},
-    '49': {'code': '49', 'name': 'Madison County', 'seat': 'London', 'population': 48845, 'area_sq_mi': 465.82, 'founded': 1810},
-    '50': {'code': '50', 'name': 'Mahoning County', 'seat': 'Youngstown', 'population': 228614, 'area_sq_mi': 415.27, 'founded': 1846},
-    '51': {'code': '51', 'name': 'Marion County', 'seat': 'Marion', 'population': 65359, 'area_sq_mi': 403.78, 'founded': 1824},
-    '52': {'code': '52', 'name': 'Medina County', 'seat': 'Medina', 'population': 182470, 'area_sq_mi': 421.28, 'founded': 1812},
-    '53': {'code': '53', 'name': 'Meigs County', 'seat': 'Pomeroy', 'population': 22210, 'area_sq_mi': 429.75, 'founded': 1819},
-    '54': {'code': '54', 'name': 'Mercer County', 'seat': 'Celina', 'population': 41882, 'area_sq_mi': 463.20, 'founded': 1820},
-    '55': {'code': '55', 'name': 'Miami County', 'seat': 'Troy', 'population': 109561, 'area_sq_mi': 407.84, 'founded': 1807},
-    '56': {'code': '56', 'name': 'Monroe County', 'seat': 'Woodsfield', 'population': 13385, 'area_sq_mi': 456.28, 'founded': 1813},
-    '57': {'code': '57', 'name': 'Montgomery County', 'seat': 'Dayton', 'population': 537309, 'area_sq_mi': 461.68, 'founded': 1803},
-    '58': {'code': '58', 'name': 'Morgan County', 'seat': 'McConnelsville', 'population': 13832, 'area_sq_mi': 418.59, 'founded': 1817},
-    '59': {'code': '59', 'name': 'Morrow County', 'seat': 'Mount Gilead', 'population': 35318, 'area_sq_mi': 406.06, 'founded': 1848},
-    '60': {'code': '60', 'name': 'Muskingum County', 'seat': 'Zanesville', 'population': 86441, 'area_sq_mi': 664.29, 'founded': 1804},
-    '61': {'code': '61', 'name': 'Noble County', 'seat': 'Caldwell', 'population': 14115, 'area_sq_mi': 398.87, 'founded': 1851},
-    '62': {'code': '62', 'name': 'Ottawa County', 'seat': 'Port Clinton', 'population': 40364, 'area_sq_mi': 255.45, 'founded': 1840},
-    '63': {'code': '63', 'name': 'Paulding County', 'seat': 'Paulding', 'population': 18807, 'area_sq_mi': 418.83, 'founded': 1820},
-    '64': {'code': '64', 'name': 'Perry County', 'seat': 'New Lexington', 'population': 35408, 'area_sq_mi': 409.92, 'founded': 1817},
-    '65': {'code': '65', 'name': 'Pickaway County', 'seat': 'Circleville', 'population': 60539, 'area_sq_mi': 501.79, 'founded': 1810},
-    '66': {'code': '66', 'name': 'Pike County', 'seat': 'Waverly', 'population': 27088, 'area_sq_mi': 441.29, 'founded': 1815},
-    '67': {'code': '67', 'name': 'Portage County', 'seat': 'Ravenna', 'population': 161791, 'area_sq_mi': 492.33, 'founded': 1807},
-    '68': {'code': '68', 'name': 'Preble County', 'seat': 'Eaton', 'population': 40999, 'area_sq_mi': 425.33, 'founded': 1808},
-    '69': {'code': '69', 'name': 'Putnam County', 'seat': 'Ottawa', 'population': 34499, 'area_sq_mi': 484.11, 'founded': 1820},
-    '70': {'code': '70', 'name': 'Richland County', 'seat': 'Mansfield', 'population': 124936, 'area_sq_mi': 497.04, 'founded': 1813},
-    '71': {'code': '71', 'name': 'Ross County', 'seat': 'Chillicothe', 'population': 77093, 'area_sq_mi': 689.49, 'founded': 1798},
-    '72': {'code': '72', 'name': 'Sandusky County', 'seat': 'Fremont', 'population': 58896, 'area_sq_mi': 409.45, 'founded': 1820},
-    '73': {'code': '73', 'name': 'Scioto County', 'seat': 'Portsmouth', 'population': 74008, 'area_sq_mi': 612.99, 'founded': 1803},
-    '74': {'code': '74', 'name': 'Seneca County', 'seat': 'Tiffin', 'population': 55069, 'area_sq_mi': 551.52, 'founded': 1820},
-    '75': {'code': '75', 'name': 'Shelby County', 'seat': 'Sidney', 'population': 48230, 'area_sq_mi': 409.28, 'founded': 1819},
-    '76': {'code': '76', 'name': 'Stark County', 'seat': 'Canton', 'population': 374853, 'area_sq_mi': 575.99, 'founded': 1808},
-    '77': {'code': '77', 'name': 'Summit County', 'seat': 'Akron', 'population': 540428, 'area_sq_mi': 412.97, 'founded': 1840},
-    '78': {'code': '78', 'name': 'Trumbull County', 'seat': 'Warren', 'population': 201977, 'area_sq_mi': 618.78, 'founded': 1800},
-    '79': {'code': '79', 'name': 'Tuscarawas County', 'seat': 'New Philadelphia', 'population': 92865, 'area_sq_mi': 568.92, 'founded': 1808},
-    '80': {'code': '80', 'name': 'Union County', 'seat': 'Marysville', 'population': 62784, 'area_sq_mi': 437.28, 'founded': 1820},
-    '81': {'code': '81', 'name': 'Van Wert County', 'seat': 'Van Wert', 'population': 28931, 'area_sq_mi': 409.61, 'founded': 1820},
-    '82': {'code': '82', 'name': 'Vinton County', 'seat': 'McArthur', 'population': 12545, 'area_sq_mi': 414.32, 'founded': 1850},
-    '83': {'code': '83', 'name': 'Warren County', 'seat': 'Lebanon', 'population': 242337, 'area_sq_mi': 406.86, 'founded': 1803},
-    '84': {'code': '84', 'name': 'Washington County', 'seat': 'Marietta', 'population': 59711, 'area_sq_mi': 635.28, 'founded': 1788},
-    '85': {'code': '85', 'name': 'Wayne County', 'seat': 'Wooster', 'population': 116903, 'area_sq_mi': 555.29, 'founded': 1808},
-    '86': {'code': '86', 'name': 'Williams County', 'seat': 'Bryan', 'population': 36641, 'area_sq_mi': 421.68, 'founded': 1820},
-    '87': {'code': '87', 'name': 'Wood County', 'seat': 'Bowling Green', 'population': 132248, 'area_sq_mi': 617.49, 'founded': 1820},
-    '88': {'code': '88', 'name': 'Wyandot County', 'seat': 'Upper Sandusky', 'population': 21900, 'area_sq_mi': 406.92, 'founded': 1845}
-}
-
 # --------------------------
 # ReportAllUSA API Configuration
 # --------------------------
-REPORTALLUSA_CONFIG = {
-    "CLIENT_KEY": st.secrets.get("reportallusa", {}).get("client", ""),
-    "BASE_URL": "https://reportallusa.com/api/parcels",
-    "API_VERSION": "9",
-    "TIMEOUT": 20,
-    "MAX_RETRIES": 3
-}
-
-# --------------------------
-# Enhanced API Functions
-# --------------------------
-def make_api_request(parcel_id, county_name=None, retry_count=0):
-    """
-    Enhanced API request with retry logic and comprehensive error handling
-    """
-    try:
-        client_key = REPORTALLUSA_CONFIG["CLIENT_KEY"]
-        if not client_key:
-            return {
-                "status": "ERROR",
-                "message": "ReportAllUSA client key not configured. Please add [reportallusa] section with client key to secrets.",
-                "error_code": "NO_API_KEY"
-            }
-
-        # Build comprehensive request parameters
-        params = {
-            'client': client_key,
-            'v': REPORTALLUSA_CONFIG["API_VERSION"],
-            'region': f"{county_name}, Ohio" if county_name else "Ohio",
-            'parcel_id': parcel_id,
-            'return_buildings': 'true',
-            'rpp': 50
-        }
-        
-        # Add request timestamp for tracking
-        request_time = datetime.now()
-        
-        response = requests.get(
-            REPORTALLUSA_CONFIG["BASE_URL"], 
-            params=params, 
-            timeout=REPORTALLUSA_CONFIG["TIMEOUT"]
-        )
-        
-        response_time = datetime.now()
-        response_duration = (response_time - request_time).total_seconds()
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                
-                if data.get('status') == 'OK':
-                    return {
-                        "status": "OK",
-                        "results": data.get('results', []),
-                        "count": data.get('count', 0),
-                        "page": data.get('page', 1),
-                        "rpp": data.get('rpp', 10),
-                        "query": data.get('query', ''),
-                        "api_source": "ReportAllUSA Professional API",
-                        "request_params": params,
-                        "response_time_seconds": response_duration,
-                        "timestamp": request_time.isoformat(),
-                        "raw_response": data
-                    }
-                else:
-                    return {
-                        "status": "NOT_FOUND",
-                        "message": f"No property found with parcel ID '{parcel_id}' in Ohio.",
-                        "api_response": data,
-                        "request_params": params,
-                        "response_time_seconds": response_duration
-                    }
-                    
-            except json.JSONDecodeError:
-                return {
-                    "status": "ERROR",
-                    "message": "Invalid JSON response from API",
-                    "raw_response": response.text[:500],
-                    "status_code": response.status_code
-                }
-                
-        elif response.status_code == 401:
-            return {
-                "status": "ERROR",
-                "message": "API authentication failed. Please verify your ReportAllUSA client key.",
-                "error_code": "AUTH_FAILED",
-                "status_code": response.status_code
-            }
-            
-        elif response.status_code == 429:
-            if retry_count < REPORTALLUSA_CONFIG["MAX_RETRIES"]:
-                time.sleep(2 ** retry_count)  # Exponential backoff
-                return make_api_request(parcel_id, county_name, retry_count + 1)
-            else:
-                return {
-                    "status": "ERROR",
-                    "message": "API rate limit exceeded. Maximum retries reached.",
-                    "error_code": "RATE_LIMIT",
-                    "status_code": response.status_code
-                }
-                
-        else:
-            return {
-                "status": "ERROR",
-                "message": f"API returned unexpected status code: {response.status_code}",
-                "status_code": response.status_code,
-                "response_text": response.text[:500]
-            }
-            
-    except requests.exceptions.Timeout:
-        if retry_count < REPORTALLUSA_CONFIG["MAX_RETRIES"]:
-            return make_api_request(parcel_id, county_name, retry_count + 1)
-        else:
-            return {
-                "status": "ERROR",
-                "message": f"Request timed out after {REPORTALLUSA_CONFIG['TIMEOUT']} seconds. Maximum retries reached.",
-                "error_code": "TIMEOUT"
-            }
-            
-    except requests.exceptions.ConnectionError:
-        return {
-            "status": "ERROR",
-            "message": "Unable to connect to ReportAllUSA API. Please check your internet connection.",
-            "error_code": "CONNECTION_ERROR"
-        }
-        
-    except Exception as e:
-        return {
-            "status": "ERROR",
-            "message": f"Unexpected error: {str(e)}",
-            "error_code": "UNKNOWN_ERROR",
-            "exception_type": type(e).__name__
-        }
-
-def search_multiple_parcels(parcel_ids, county_name=None):
-    """
-    Enhanced multiple parcel search with detailed response tracking
-    """
-    if isinstance(parcel_ids, str):
-        parcel_ids = [pid.strip() for pid in parcel_ids.replace(",", ";").split(";")]
-    
-    parcel_ids_str = ";".join(parcel_ids)
-    
-    result = make_api_request(parcel_ids_str, county_name)
-    
-    if result.get("status") == "OK":
-        result["search_type"] = "multiple_parcels"
-        result["parcel_count"] = len(parcel_ids)
-        result["parcel_ids_searched"] = parcel_ids
-    
-    return result
-
-def comprehensive_property_search(search_term, county_name=None):
-    """
-    Main search function with enhanced capabilities
-    """
-    search_term = search_term.strip()
-    
-    if not search_term:
-        return {
-            "status": "ERROR",
-            "message": "Please enter a valid parcel ID",
-            "error_code": "EMPTY_SEARCH"
-        }
-    
-    # Detect multiple parcel search
-    if ";" in search_term or "," in search_term:
-        return search_multiple_parcels(search_term, county_name)
-    else:
-        result = make_api_request(search_term, county_name)
-        if result.get("status") == "OK":
-            result["search_type"] = "single_parcel"
-        return result
+# Search functions live in lookup_core so batch jobs can run them headless;
+# the key configured in Streamlit secrets takes precedence here
+REPORTALLUSA_CONFIG["CLIENT_KEY"] = st.secrets.get("reportallusa", {}).get("client", "") or REPORTALLUSA_CONFIG["CLIENT_KEY"]
+CACHE_STATS_PORT = start_stats_server()
 
 # --------------------------
 # Session State Management
@@ -478,6 +229,8 @@ if 'api_stats' not in st.session_state:
         'failed_requests': 0,
         'total_response_time': 0.0
     }
+if 'bulk_jobs' not in st.session_state:
+    st.session_state.bulk_jobs = {}
 
 # Configuration
 MAX_SEARCHES = 10
@@ -534,39 +287,83 @@ with st.sidebar:
         with col2:
             st.metric("Avg Response", f"{avg_response_time:.2f}s")
     
+    # Cache Statistics (process-wide: every session served by this worker)
+    st.divider()
+    st.subheader("🗄️ Cache Statistics")
+    cache_stats = cache_stats_snapshot()
+    parcel_cache_stats = cache_stats['caches'].get('parcels')
+    
+    if parcel_cache_stats:
+        l1_stats = parcel_cache_stats['tiers']['L1']
+        l2_stats = parcel_cache_stats['tiers']['L2']
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("L1 Hit Rate", f"{l1_stats['hit_ratio'] * 100:.1f}%")
+        with col2:
+            st.metric("L2 Hit Rate", f"{l2_stats['hit_ratio'] * 100:.1f}%")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("API Calls Avoided", parcel_cache_stats['upstream_calls_avoided'])
+        with col2:
+            st.metric("L1 Evictions", l1_stats['evictions'])
+    
+    with st.expander("📈 View Cache Details"):
+        for cache_name, stats in cache_stats['caches'].items():
+            st.markdown(f"**{cache_name.title()} Cache**")
+            tier_rows = []
+            for tier, counts in stats['tiers'].items():
+                tier_rows.append({
+                    'Tier': tier,
+                    'Hit %': f"{counts['hit_ratio'] * 100:.1f}",
+                    'Neg. Hit %': f"{counts['negative_hit_ratio'] * 100:.1f}",
+                    'Miss %': f"{counts['miss_ratio'] * 100:.1f}",
+                    'Entries': counts['entries'],
+                    'KB Used': round((counts['bytes_used'] or 0) / 1024, 1),
+                    'Evictions': counts['evictions'],
+                    'Expirations': counts['expirations']
+                })
+            st.dataframe(pd.DataFrame(tier_rows), hide_index=True)
+            
+            if stats['hottest_keys']:
+                st.caption("Hottest keys")
+                for entry in stats['hottest_keys'][:5]:
+                    st.text(f"{entry['hits']:>4}  {entry['key']}")
+        
+        st.download_button(
+            "📥 Download Cache Stats JSON",
+            json.dumps(cache_stats, indent=2),
+            file_name=f"cache_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
+        if CACHE_STATS_PORT:
+            st.caption(f"JSON endpoint: port {CACHE_STATS_PORT}, path /cache/stats")
+    
     # Ohio Counties Database
     st.divider()
     st.subheader("🗺️ Ohio Counties Database")
     
-    # County statistics
-    total_population = sum(county['population'] for county in OHIO_COUNTIES_DATABASE.values())
-    total_area = sum(county['area_sq_mi'] for county in OHIO_COUNTIES_DATABASE.values())
+    # County statistics (computed once when the registry loads)
+    largest_county = OHIO_TOTALS['largest']
+    most_populous_county = OHIO_TOTALS['most_populous']
     
     st.markdown(f"""
     <div class="stats-card">
         <h4>📈 Ohio Statistics</h4>
-        <p><strong>Total Counties:</strong> 88</p>
-        <p><strong>Total Population:</strong> {total_population:,}</p>
-        <p><strong>Total Area:</strong> {total_area:,.0f} sq mi</p>
-        <p><strong>Largest County:</strong> Ashtabula (702.44 sq mi)</p>
-        <p><strong>Most Populous:</strong> Franklin ({OHIO_COUNTIES_DATABASE['25']['population']:,})</p>
+        <p><strong>Total Counties:</strong> {OHIO_TOTALS['count']}</p>
+        <p><strong>Total Population:</strong> {OHIO_TOTALS['population']:,}</p>
+        <p><strong>Total Area:</strong> {OHIO_TOTALS['area_sq_mi']:,.0f} sq mi</p>
+        <p><strong>Largest County:</strong> {county_short_name(largest_county)} ({largest_county['area_sq_mi']} sq mi)</p>
+        <p><strong>Most Populous:</strong> {county_short_name(most_populous_county)} ({most_populous_county['population']:,})</p>
     </div>
     """, unsafe_allow_html=True)
     
     # Regional breakdown
     with st.expander("🏛️ View Counties by Region"):
-        regions = {
-            "Northeast Ohio (9 counties)": ['18', '28', '43', '47', '50', '67', '76', '77', '78'],
-            "Central Ohio (7 counties)": ['21', '23', '25', '45', '49', '65', '80'],
-            "Southwest Ohio (5 counties)": ['09', '13', '31', '68', '83'],
-            "Southeast Ohio (13 counties)": ['05', '07', '27', '30', '40', '44', '56', '58', '60', '61', '71', '73', '84'],
-            "Northwest Ohio (15 counties)": ['02', '20', '22', '26', '32', '35', '39', '48', '62', '69', '72', '74', '86', '87']
-        }
-        
-        for region, county_codes in regions.items():
-            st.markdown(f"**{region}:**")
-            for code in county_codes:
-                county = OHIO_COUNTIES_DATABASE[code]
+        for region, counties in COUNTIES_BY_REGION.items():
+            st.markdown(f"**{region} ({len(counties)} counties):**")
+            for county in counties:
                 st.write(f"• {county['name']} - {county['seat']} (Pop: {county['population']:,})")
             st.write("")
     
@@ -607,10 +404,12 @@ with st.sidebar:
 # --------------------------
 # Enhanced Property Display Functions
 # --------------------------
-def create_comprehensive_property_display(property_data, api_response):
+def create_comprehensive_property_display(property_data, api_response, record):
     """
-    Create comprehensive property display with enhanced visualizations
+    Create comprehensive property display with enhanced visualizations.
+    property_data is the normalized result row (see result_frame), record the raw API record.
     """
+    parcel_id = format_value(property_data['parcel_id'])
     
     # Main property header
     st.markdown("""
@@ -628,32 +427,19 @@ def create_comprehensive_property_display(property_data, api_response):
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        parcel_id = property_data.get('parcel_id', property_data.get('parcelid', 'N/A'))
         st.metric("Parcel ID", parcel_id)
     
     with col2:
-        county = property_data.get('county', property_data.get('county_name', 'N/A'))
-        st.metric("County", county)
+        st.metric("County", format_value(property_data['county_name']))
     
     with col3:
-        market_value = property_data.get('market_value', property_data.get('assessed_value', 0))
-        try:
-            market_value = float(market_value) if market_value else 0
-            st.metric("Market Value", f"${market_value:,.0f}")
-        except:
-            st.metric("Market Value", "N/A")
+        st.metric("Market Value", format_money(property_data['mkt_val_tot'], decimals=0))
     
     with col4:
-        annual_tax = property_data.get('annual_tax', property_data.get('tax_amount', 0))
-        try:
-            annual_tax = float(annual_tax) if annual_tax else 0
-            st.metric("Annual Tax", f"${annual_tax:,.0f}")
-        except:
-            st.metric("Annual Tax", "N/A")
+        st.metric("Annual Tax", format_money(property_data['annual_tax'], decimals=0))
     
     with col5:
-        property_type = property_data.get('property_type', property_data.get('land_use', 'N/A'))
-        st.metric("Property Type", property_type)
+        st.metric("Property Type", format_value(property_data['land_use_class']))
     
     st.divider()
     
@@ -678,11 +464,11 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             fields = [
-                ('Property Address', property_data.get('address', property_data.get('property_address', 'N/A'))),
-                ('City', property_data.get('city', property_data.get('municipality', 'N/A'))),
-                ('ZIP Code', property_data.get('zip', property_data.get('zip_code', 'N/A'))),
-                ('Year Built', property_data.get('year_built', property_data.get('built_year', 'N/A'))),
-                ('Lot Size', property_data.get('lot_size', property_data.get('acreage', 'N/A')))
+                ('Property Address', format_value(property_data['address'])),
+                ('City', format_value(property_data['addr_city'])),
+                ('ZIP Code', format_value(property_data['addr_zip'])),
+                ('Year Built', format_number(property_data['year_built'])),
+                ('Lot Size', format_number(property_data['acreage'], decimals=3, suffix=' acres'))
             ]
             
             for label, value in fields:
@@ -697,10 +483,10 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             building_fields = [
-                ('Square Feet', property_data.get('square_feet', property_data.get('sqft', 'N/A'))),
-                ('Bedrooms', property_data.get('bedrooms', property_data.get('beds', 'N/A'))),
-                ('Bathrooms', property_data.get('bathrooms', property_data.get('baths', 'N/A'))),
-                ('Stories', property_data.get('stories', property_data.get('floors', 'N/A'))),
+                ('Square Feet', format_number(property_data['bldg_sqft'])),
+                ('Bedrooms', format_number(property_data['bedrooms'])),
+                ('Bathrooms', format_number(property_data['bathrooms'], decimals=1)),
+                ('Stories', format_number(property_data['stories'])),
                 ('Building Type', property_data.get('building_type', property_data.get('structure_type', 'N/A')))
             ]
             
@@ -716,11 +502,11 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             owner_fields = [
-                ('Owner Name', property_data.get('owner', property_data.get('owner_name', 'N/A'))),
-                ('Mailing Address', property_data.get('mailing_address', property_data.get('owner_address', 'N/A'))),
+                ('Owner Name', format_value(property_data['owner'])),
+                ('Mailing Address', format_value(property_data['mailing_address'])),
                 ('Owner Occupied', property_data.get('owner_occupied', 'Unknown')),
-                ('Deed Date', property_data.get('deed_date', property_data.get('sale_date', 'N/A'))),
-                ('Sale Price', property_data.get('sale_price', property_data.get('last_sale_price', 'N/A')))
+                ('Deed Date', format_date(property_data['trans_date'])),
+                ('Sale Price', format_money(property_data['sale_price']))
             ]
             
             for label, value in owner_fields:
@@ -740,27 +526,20 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             # Create value breakdown
-            land_value = property_data.get('land_value', property_data.get('lot_value', 0))
-            building_value = property_data.get('building_value', property_data.get('improvement_value', 0))
-            total_value = property_data.get('total_value', property_data.get('assessed_value_total', 0))
+            land_value = property_data['mkt_val_land']
+            building_value = property_data['mkt_val_bldg']
+            total_value = property_data['mkt_val_tot']
             
-            try:
-                land_value = float(land_value) if land_value else 0
-                building_value = float(building_value) if building_value else 0
-                total_value = float(total_value) if total_value else 0
-                
-                st.write(f"**Land Value:** ${land_value:,.2f}")
-                st.write(f"**Building Value:** ${building_value:,.2f}")
-                st.write(f"**Total Assessed:** ${total_value:,.2f}")
-                
-                if total_value > 0:
-                    land_pct = (land_value / total_value) * 100
-                    building_pct = (building_value / total_value) * 100
-                    st.write(f"**Land %:** {land_pct:.1f}%")
-                    st.write(f"**Building %:** {building_pct:.1f}%")
-                    
-            except:
+            if land_value is None and building_value is None and total_value is None:
                 st.write("Value data not available")
+            else:
+                st.write(f"**Land Value:** {format_money(land_value)}")
+                st.write(f"**Building Value:** {format_money(building_value)}")
+                st.write(f"**Total Assessed:** {format_money(total_value)}")
+                
+                if total_value:
+                    st.write(f"**Land %:** {format_number((land_value or 0) / total_value * 100, decimals=1, suffix='%')}")
+                    st.write(f"**Building %:** {format_number((building_value or 0) / total_value * 100, decimals=1, suffix='%')}")
             
             st.markdown("</div>", unsafe_allow_html=True)
         
@@ -771,10 +550,10 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             tax_fields = [
-                ('Annual Tax', property_data.get('annual_tax', property_data.get('tax_amount', 'N/A'))),
+                ('Annual Tax', format_money(property_data['annual_tax'])),
                 ('Tax Year', property_data.get('tax_year', datetime.now().year)),
-                ('Tax Rate', property_data.get('tax_rate', property_data.get('millage_rate', 'N/A'))),
-                ('School District', property_data.get('school_district', property_data.get('district', 'N/A'))),
+                ('Tax Rate', format_value(property_data['tax_rate'])),
+                ('School District', format_value(property_data['school_district'])),
                 ('Tax Status', property_data.get('tax_status', property_data.get('delinquent_status', 'N/A')))
             ]
             
@@ -795,13 +574,13 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             location_fields = [
-                ('Full Address', property_data.get('full_address', property_data.get('address', 'N/A'))),
+                ('Full Address', format_value(property_data['address'])),
                 ('Street Number', property_data.get('street_number', property_data.get('house_number', 'N/A'))),
                 ('Street Name', property_data.get('street_name', 'N/A')),
-                ('City', property_data.get('city', property_data.get('municipality', 'N/A'))),
+                ('City', format_value(property_data['addr_city'])),
                 ('State', property_data.get('state', 'Ohio')),
-                ('ZIP Code', property_data.get('zip_code', property_data.get('postal_code', 'N/A'))),
-                ('County', property_data.get('county', property_data.get('county_name', 'N/A')))
+                ('ZIP Code', format_value(property_data['addr_zip'])),
+                ('County', format_value(property_data['county_name']))
             ]
             
             for label, value in location_fields:
@@ -816,10 +595,10 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             # Coordinates
-            lat = property_data.get('latitude', property_data.get('lat'))
-            lng = property_data.get('longitude', property_data.get('lng', property_data.get('lon')))
+            lat = property_data['latitude']
+            lng = property_data['longitude']
             
-            if lat and lng:
+            if lat is not None and lng is not None:
                 st.write(f"**Latitude:** {lat}")
                 st.write(f"**Longitude:** {lng}")
                 st.write(f"**Coordinates:** {lat}, {lng}")
@@ -830,7 +609,7 @@ def create_comprehensive_property_display(property_data, api_response):
             geo_fields = [
                 ('Census Tract', property_data.get('census_tract', 'N/A')),
                 ('Census Block', property_data.get('census_block', 'N/A')),
-                ('School District', property_data.get('school_district', 'N/A')),
+                ('School District', format_value(property_data['school_district'])),
                 ('Fire District', property_data.get('fire_district', 'N/A')),
                 ('Police District', property_data.get('police_district', 'N/A'))
             ]
@@ -838,6 +617,13 @@ def create_comprehensive_property_display(property_data, api_response):
             for label, value in geo_fields:
                 st.write(f"**{label}:** {value}")
             
+            census = census_attributes(property_data)
+            if census:
+                st.write(f"**Census {census['_census_level'].title()} ({census['_census_geoid']}):**")
+                for attribute, value in census.items():
+                    if not attribute.startswith('_'):
+                        st.write(f"• {attribute.replace('_', ' ').title()}: {value if value is not None else 'N/A'}")
+            
             st.markdown("</div>", unsafe_allow_html=True)
     
     with tab4:
@@ -854,7 +640,7 @@ def create_comprehensive_property_display(property_data, api_response):
             
             current_tax_fields = [
                 ('Tax Year', property_data.get('tax_year', datetime.now().year)),
-                ('Annual Tax', property_data.get('annual_tax', property_data.get('tax_amount', 'N/A'))),
+                ('Annual Tax', format_money(property_data['annual_tax'])),
                 ('Tax Status', property_data.get('tax_status', 'N/A')),
                 ('Payment Status', property_data.get('payment_status', 'N/A')),
                 ('Due Date', property_data.get('tax_due_date', 'N/A'))
@@ -872,7 +658,7 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             district_fields = [
-                ('School District', property_data.get('school_district', 'N/A')),
+                ('School District', format_value(property_data['school_district'])),
                 ('Library District', property_data.get('library_district', 'N/A')),
                 ('Fire District', property_data.get('fire_district', 'N/A')),
                 ('Park District', property_data.get('park_district', 'N/A')),
@@ -891,7 +677,7 @@ def create_comprehensive_property_display(property_data, api_response):
             """, unsafe_allow_html=True)
             
             calc_fields = [
-                ('Millage Rate', property_data.get('millage_rate', property_data.get('tax_rate', 'N/A'))),
+                ('Millage Rate', format_value(property_data['tax_rate'])),
                 ('Effective Rate', property_data.get('effective_tax_rate', 'N/A')),
                 ('Exemptions', property_data.get('exemptions', property_data.get('tax_exemptions', 'N/A'))),
                 ('Deductions', property_data.get('deductions', 'N/A')),
@@ -932,7 +718,7 @@ def create_comprehensive_property_display(property_data, api_response):
         
         # Full property data
         st.subheader("📥 Property Data Response")
-        st.json(property_data)
+        st.json(record)
         
         # Complete API response
         st.subheader("🔧 Complete API Response")
@@ -946,7 +732,7 @@ def create_comprehensive_property_display(property_data, api_response):
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            property_json = json.dumps(property_data, indent=2)
+            property_json = cached_json_bytes("json.property", record, REPORT_TEMPLATE_VERSION)
             st.download_button(
                 "📄 Download Property Data",
                 property_json,
@@ -955,7 +741,14 @@ def create_comprehensive_property_display(property_data, api_response):
             )
         
         with col2:
-            full_response_json = json.dumps(api_response.get('raw_response', api_response), indent=2)
+            raw_response = api_response.get('raw_response')
+            if raw_response:
+                full_response_json = cached_json_bytes(
+                    "json.raw_response", raw_response.get('results', []), REPORT_TEMPLATE_VERSION,
+                    payload=raw_response, extra=(raw_response.get('query', ''),)
+                )
+            else:
+                full_response_json = json.dumps(api_response, indent=2)
             st.download_button(
                 "📋 Download Full Response",
                 full_response_json,
@@ -973,7 +766,7 @@ def create_comprehensive_property_display(property_data, api_response):
                     "api_source": api_response.get('api_source')
                 },
                 "request_parameters": api_response.get('request_params', {}),
-                "property_data": property_data,
+                "property_data": record,
                 "full_api_response": api_response.get('raw_response', api_response)
             }
             
@@ -985,9 +778,66 @@ def create_comprehensive_property_display(property_data, api_response):
                 mime="application/json"
             )
 
+# Bump when the PDF layout or JSON export format changes so cached artifacts are rebuilt
+REPORT_TEMPLATE_VERSION = "1"
+
+# Multi-result searches get per-property detail for this many records; the portfolio summary covers all
+MAX_EXPANDED_RESULTS = 10
+
+def show_portfolio_summary(results_df):
+    """Totals, medians, group counts and acreage spread over every result, not just the ones expanded"""
+    summary = portfolio_summary(results_df)
+    stats = summary['stats']
+    st.markdown("""
+    <div class="info-card">
+        <h3>📊 Portfolio Summary</h3>
+        <p>Computed over all matching properties</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Properties", f"{stats['count']:,}")
+    col2.metric("Total Market Value", format_money(stats['total_value'], decimals=0))
+    col3.metric("Median Market Value", format_money(stats['median_value'], decimals=0))
+    col4.metric("Total Acreage", format_number(stats['total_acreage'], decimals=3))
+    
+    st.dataframe(
+        summary['values'],
+        use_container_width=True,
+        column_config={column: st.column_config.NumberColumn(format="$%,.0f") for column in ["Total", "Median", "Mean", "Min", "Max"]}
+    )
+    
+    group_tabs = st.tabs([f"{label} ({summary['group_totals'][field]:,})" for field, label in GROUP_FIELDS.items()] + ["Acreage"])
+    for tab, field in zip(group_tabs, GROUP_FIELDS):
+        with tab:
+            counts = summary['groups'][field]
+            st.bar_chart(counts, x=GROUP_FIELDS[field], y="Parcels", horizontal=True)
+            st.dataframe(counts, use_container_width=True, hide_index=True)
+    with group_tabs[-1]:
+        st.bar_chart(summary['acreage'])
+        st.caption(f"Median lot: {format_number(summary['acreage_median'], decimals=3, suffix=' acres')}")
+    
+    with st.expander(f"📋 All {stats['count']:,} properties"):
+        st.dataframe(summary_table(results_df), use_container_width=True, hide_index=True)
+
+def show_parquet_download(results, export_stem):
+    """Typed columnar download of every result record, for analytics tools (needs pyarrow)"""
+    if not columnar_available():
+        return
+    parquet_bytes = cached_artifact(
+        "l888ookup.parquet", results, REPORT_TEMPLATE_VERSION, lambda: records_columnar_bytes(results, "parquet")
+    )
+    st.download_button(
+        "🧮 Download Parquet",
+        parquet_bytes,
+        file_name=f"ohio_properties_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet",
+        mime="application/vnd.apache.parquet",
+        use_container_width=True
+    )
+
 def create_enhanced_pdf_report(property_data, api_response):
     """
-    Create enhanced PDF report with comprehensive property information
+    Create enhanced PDF report from a normalized result row (see result_frame)
     """
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch)
@@ -1010,19 +860,19 @@ def create_enhanced_pdf_report(property_data, api_response):
     story.append(Spacer(1, 20))
 
     # Property summary table
-    parcel_id = property_data.get('parcel_id', property_data.get('parcelid', 'N/A'))
+    parcel_id = format_value(property_data['parcel_id'])
     
     summary_data = [
         ['Property Information', 'Details', 'Additional Data'],
         ['Parcel ID', parcel_id, f"Search Date: {datetime.now().strftime('%Y-%m-%d')}"],
-        ['Property Address', property_data.get('address', 'N/A'), f"API Response Time: {api_response.get('response_time_seconds', 0):.2f}s"],
-        ['City, State ZIP', f"{property_data.get('city', 'N/A')}, OH {property_data.get('zip', 'N/A')}", f"Records Found: {api_response.get('count', 0)}"],
-        ['County', property_data.get('county', 'N/A'), f"Search Type: {api_response.get('search_type', 'N/A')}"],
-        ['Owner', property_data.get('owner', 'N/A'), f"API Source: {api_response.get('api_source', 'N/A')}"],
-        ['Market Value', f"${float(property_data.get('market_value', 0)):,.2f}", f"Year Built: {property_data.get('year_built', 'N/A')}"],
-        ['Annual Tax', f"${float(property_data.get('annual_tax', 0)):,.2f}", f"Property Type: {property_data.get('property_type', 'N/A')}"],
-        ['Lot Size', property_data.get('lot_size', 'N/A'), f"Square Feet: {property_data.get('square_feet', 'N/A')}"],
-        ['School District', property_data.get('school_district', 'N/A'), f"Tax Year: {property_data.get('tax_year', 'N/A')}"]
+        ['Property Address', format_value(property_data['address']), f"API Response Time: {api_response.get('response_time_seconds', 0):.2f}s"],
+        ['City, State ZIP', f"{format_value(property_data['addr_city'])}, OH {format_value(property_data['addr_zip'])}", f"Records Found: {api_response.get('count', 0)}"],
+        ['County', format_value(property_data['county_name']), f"Search Type: {api_response.get('search_type', 'N/A')}"],
+        ['Owner', format_value(property_data['owner']), f"API Source: {api_response.get('api_source', 'N/A')}"],
+        ['Market Value', format_money(property_data['mkt_val_tot']), f"Year Built: {format_number(property_data['year_built'])}"],
+        ['Annual Tax', format_money(property_data['annual_tax']), f"Property Type: {format_value(property_data['land_use_class'])}"],
+        ['Lot Size', format_number(property_data['acreage'], decimals=3, suffix=' acres'), f"Square Feet: {format_number(property_data['bldg_sqft'])}"],
+        ['School District', format_value(property_data['school_district']), f"Tax Year: {property_data.get('tax_year', 'N/A')}"]
     ]
     
     table = Table(summary_data, colWidths=[2*inch, 2*inch, 2*inch])
@@ -1048,11 +898,11 @@ def create_enhanced_pdf_report(property_data, api_response):
     # Financial information
     financial_data = [
         ['Financial Information', 'Value'],
-        ['Land Value', f"${float(property_data.get('land_value', 0)):,.2f}"],
-        ['Building Value', f"${float(property_data.get('building_value', 0)):,.2f}"],
-        ['Total Assessed Value', f"${float(property_data.get('total_value', 0)):,.2f}"],
-        ['Annual Property Tax', f"${float(property_data.get('annual_tax', 0)):,.2f}"],
-        ['Tax Rate/Millage', property_data.get('tax_rate', 'N/A')],
+        ['Land Value', format_money(property_data['mkt_val_land'])],
+        ['Building Value', format_money(property_data['mkt_val_bldg'])],
+        ['Total Assessed Value', format_money(property_data['mkt_val_tot'])],
+        ['Annual Property Tax', format_money(property_data['annual_tax'])],
+        ['Tax Rate/Millage', format_value(property_data['tax_rate'])],
         ['Effective Tax Rate', property_data.get('effective_tax_rate', 'N/A')]
     ]
     
@@ -1080,6 +930,26 @@ def create_enhanced_pdf_report(property_data, api_response):
     buffer.seek(0)
     return buffer
 
+# Bulk job rows have no search response of their own; these fill the PDF's search fields
+BULK_REPORT_RESPONSE = {"api_source": "ReportAllUSA", "search_type": "bulk_lookup", "count": 1}
+
+def render_bulk_report(property_data):
+    """PDF bytes of one bulk job parcel; runs on a job queue worker thread"""
+    return create_enhanced_pdf_report(property_data, BULK_REPORT_RESPONSE).getvalue()
+
+def bulk_job_queue():
+    return get_job_queue(search_multiple_parcels, render_bulk_report)
+
+def show_report_zip_download(results, api_response, export_stem):
+    """One PDF report per result in a ZIP with a manifest, rendered only when the download is clicked"""
+    st.download_button(
+        f"📦 Download {len(results):,} PDF Reports (ZIP)",
+        lambda: records_report_zip(results, lambda property_data: create_enhanced_pdf_report(property_data, api_response).getvalue()),
+        file_name=f"ohio_property_reports_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+        mime="application/zip",
+        use_container_width=True
+    )
+
 # --------------------------
 # Main Application Interface
 # --------------------------
@@ -1138,10 +1008,103 @@ with col4:
     </div>
     """, unsafe_allow_html=True)
 
-# Usage limit check
+# --------------------------
+# Bulk Job Status
+# --------------------------
+EXPORT_MIME_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+    "pdf_zip": "application/zip"
+}
+
+EXPORT_LABELS = {"pdf_zip": "PDF REPORTS (ZIP)"}
+
+# Rows of a bulk job shown in the page; the full results are in the downloads
+BULK_PREVIEW_ROWS = 500
+
+def read_export(path):
+    with open(path, "rb") as handle:
+        return handle.read()
+
+def show_bulk_job(job_id, job):
+    """Progress, or preview and downloads once finished, of one submitted bulk job"""
+    status = bulk_job_queue().status(job_id)
+    if status is None:
+        st.caption(f"{job_id} ({job['file']}): no longer tracked")
+        return
+    state = status["state"]
+    st.markdown(f"**{job_id}** · {job['file']} · {state}")
+
+    if state == "queued":
+        position = status.get("queue_position")
+        st.caption(f"Waiting for a worker (position {position} in queue)" if position else "Starting...")
+    elif state == "running":
+        total = status["total"]
+        if total:
+            st.progress(status["done"] / total, text=f"{status['done']:,} / {total:,} parcels")
+        if status["message"]:
+            st.caption(status["message"])
+        metric_cols = st.columns(4)
+        metric_cols[0].metric("Processed", f"{status['done']:,}")
+        metric_cols[1].metric("Found", f"{status['counts'].get('OK', 0):,}")
+        metric_cols[2].metric("Throughput", f"{status['rate']:.1f}/s")
+        eta = status["eta_seconds"]
+        metric_cols[3].metric("ETA", f"{eta:.0f}s" if eta is not None else "—")
+        if st.button("⏹️ Cancel", key=f"cancel_{job_id}"):
+            bulk_job_queue().cancel(job_id)
+        # Checkpointed rows so far, in input order; fills in as chunks finish
+        if status["done"]:
+            st.dataframe(batch_frame(get_job_store().results(job_id, limit=BULK_PREVIEW_ROWS)), use_container_width=True, hide_index=True)
+    elif state == "done":
+        found = status["counts"].get("OK", 0)
+        if not job["recorded"]:
+            st.session_state.api_stats['successful_requests' if found else 'failed_requests'] += 1
+            job["recorded"] = True
+        st.success(
+            f"✅ **Bulk lookup complete:** {found:,} of {status['total']:,} parcels found "
+            f"in {status['finished_at'] - status['started_at']:.1f}s"
+        )
+        with st.expander("Preview results"):
+            st.dataframe(batch_frame(get_job_store().results(job_id, limit=BULK_PREVIEW_ROWS)), use_container_width=True, hide_index=True)
+        download_cols = st.columns(len(status["outputs"]))
+        for col, (format_name, path) in zip(download_cols, status["outputs"].items()):
+            # Read on click: the status view reruns every few seconds and exports can be large
+            col.download_button(
+                label=f"📊 Download {EXPORT_LABELS.get(format_name, format_name.upper())}",
+                data=functools.partial(read_export, path),
+                file_name=f"{job_id}{os.path.splitext(path)[1]}",
+                mime=EXPORT_MIME_TYPES[format_name],
+                key=f"download_{job_id}_{format_name}",
+                use_container_width=True
+            )
+    elif state == "failed":
+        if not job["recorded"]:
+            st.session_state.api_stats['failed_requests'] += 1
+            job["recorded"] = True
+        st.error(f"❌ Bulk job failed: {status['message']}")
+    else:
+        st.info("⏹️ Cancelled; rows finished before the cancel are kept in the job checkpoint")
+
+# The status view reruns on its own every couple of seconds without rerunning the page
+@st.fragment(run_every=JOB_QUEUE_CONFIG["POLL_SECONDS"])
+def bulk_job_status():
+    for job_id, job in reversed(list(st.session_state.bulk_jobs.items())):
+        with st.container(border=True):
+            show_bulk_job(job_id, job)
+
+def show_bulk_jobs():
+    """The session's bulk jobs, if it has any"""
+    if st.session_state.bulk_jobs:
+        st.subheader("📋 Bulk Jobs")
+        bulk_job_status()
+
+# Usage limit check; bulk jobs already submitted keep their progress and downloads
 if st.session_state.usage_count >= MAX_SEARCHES:
     st.error("❌ Maximum usage reached (10 searches). Please refresh the page to reset your session.")
     st.info("💡 **Tip:** Use the reset button in the sidebar or refresh your browser to start a new session.")
+    show_bulk_jobs()
     st.stop()
 
 # Enhanced search interface
@@ -1152,6 +1115,11 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+def apply_suggestion(query):
+    """Did-you-mean button callback: put the corrected IDs in the search box and search again"""
+    st.session_state.parcel_search = query
+    st.session_state.rerun_search = True
+
 # Search form
 col1, col2, col3 = st.columns([5, 2, 1])
 
@@ -1166,7 +1134,7 @@ with col1:
 with col2:
     county_filter = st.selectbox(
         "County Filter (Optional)",
-        ["All of Ohio (Recommended)"] + [f"{county['name']}" for county in OHIO_COUNTIES_DATABASE.values()],
+        ["All of Ohio (Recommended)"] + COUNTY_NAMES,
         help="Leave as 'All of Ohio' for best results, or select specific county to narrow search"
     )
 
@@ -1179,7 +1147,7 @@ with col3:
     )
 
 # Search execution
-if search_button and parcel_input:
+if (search_button or st.session_state.pop('rerun_search', False)) and parcel_input:
     if st.session_state.usage_count >= MAX_SEARCHES:
         st.error("❌ Search limit reached!")
     elif not parcel_input.strip():
@@ -1209,17 +1177,22 @@ if search_button and parcel_input:
                     
                     timestamp = datetime.now().strftime('%H:%M:%S')
                     search_scope = f" - {county_filter}" if county_filter != "All of Ohio (Recommended)" else " - Statewide"
-                    search_entry = f"{parcel_input}{search_scope} - {timestamp}"
+                    if api_response.get('routed_county'):
+                        search_scope = f" - {api_response['routed_county']} (auto)"
+                    searched_ids = "; ".join(api_response.get('parcel_ids_searched', [parcel_input]))
+                    search_entry = f"{searched_ids}{search_scope} - {timestamp}"
                     st.session_state.search_history.append(search_entry)
                     
                     # Store detailed history
                     detailed_entry = {
                         'timestamp': datetime.now().isoformat(),
                         'parcel_input': parcel_input,
+                        'parcel_keys': api_response.get('parcel_keys', []),
                         'county_filter': county_filter,
                         'results_count': api_response.get('count', 0),
                         'response_time': api_response.get('response_time_seconds', 0),
-                        'search_type': api_response.get('search_type', 'unknown')
+                        'search_type': api_response.get('search_type', 'unknown'),
+                        'routed_county': api_response.get('routed_county')
                     }
                     st.session_state.detailed_history.append(detailed_entry)
                     
@@ -1233,13 +1206,20 @@ if search_button and parcel_input:
                     | Response time: {response_time:.2f}s 
                     | Source: {api_response.get('api_source', 'ReportAllUSA')}
                     """)
-                    
+
+                    if api_response.get('rejected_parcel_ids'):
+                        st.warning(f"🚫 Skipped {', '.join(api_response['rejected_parcel_ids'])}: not in the county's parcel list.")
+
                     # Display results
                     results = api_response['results']
+                    # One typed pass over the result list feeds the displays, table and PDF below
+                    results_df = results_frame(results)
+                    rows = frame_rows(results_df.iloc[:MAX_EXPANDED_RESULTS])
+                    export_stem = "_".join(api_response.get('parcel_keys', [])) or parcel_input.replace(';', '_')
                     
                     if len(results) == 1:
                         # Single property result
-                        create_comprehensive_property_display(results[0], api_response)
+                        create_comprehensive_property_display(rows[0], api_response, results[0])
                         
                         # Enhanced export options
                         st.divider()
@@ -1250,24 +1230,27 @@ if search_button and parcel_input:
                         </div>
                         """, unsafe_allow_html=True)
                         
-                        col1, col2, col3 = st.columns(3)
+                        col1, col2, col3, col4 = st.columns(4)
                         
                         with col1:
-                            pdf_buffer = create_enhanced_pdf_report(results[0], api_response)
+                            pdf_bytes = cached_artifact(
+                                "l888ookup.pdf", results[0], REPORT_TEMPLATE_VERSION,
+                                lambda: create_enhanced_pdf_report(rows[0], api_response).getvalue()
+                            )
                             st.download_button(
                                 "📄 Download PDF Report",
-                                pdf_buffer.getvalue(),
-                                file_name=f"ohio_property_report_{parcel_input.replace(';', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                                pdf_bytes,
+                                file_name=f"ohio_property_report_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
                                 mime="application/pdf",
                                 use_container_width=True
                             )
                         
                         with col2:
-                            property_json = json.dumps(results[0], indent=2)
+                            property_json = cached_json_bytes("json.property", results[0], REPORT_TEMPLATE_VERSION)
                             st.download_button(
                                 "📋 Download Property JSON",
                                 property_json,
-                                file_name=f"property_data_{parcel_input.replace(';', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                                file_name=f"property_data_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                                 mime="application/json",
                                 use_container_width=True
                             )
@@ -1277,26 +1260,35 @@ if search_button and parcel_input:
                             st.download_button(
                                 "🔧 Download Full API Response",
                                 full_response_json,
-                                file_name=f"full_api_response_{parcel_input.replace(';', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                                file_name=f"full_api_response_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                                 mime="application/json",
                                 use_container_width=True
                             )
+                        
+                        with col4:
+                            show_parquet_download(results, export_stem)
                     
                     else:
                         # Multiple property results
-                        st.info(f"🏠 Found {len(results)} matching properties. Displaying detailed information for each:")
+                        st.info(f"🏠 Found {len(results)} matching properties.")
+                        show_portfolio_summary(results_df)
+                        show_parquet_download(results, export_stem)
+                        show_report_zip_download(results, api_response, export_stem)
                         
-                        for i, property_data in enumerate(results[:10]):  # Limit to 10 results for performance
-                            county_name = property_data.get('county', property_data.get('county_name', 'N/A'))
-                            address = property_data.get('address', property_data.get('property_address', 'N/A'))
-                            parcel_id = property_data.get('parcel_id', property_data.get('parcelid', 'N/A'))
+                        if len(results) > MAX_EXPANDED_RESULTS:
+                            st.caption(f"Detailed information for the first {MAX_EXPANDED_RESULTS} of {len(results):,} properties:")
+                        for i, property_data in enumerate(rows):
+                            county_name = format_value(property_data['county_name'])
+                            address = format_value(property_data['address'])
+                            parcel_id = format_value(property_data['parcel_id'])
                             
                             with st.expander(f"🏠 Property {i+1}: {address} - {county_name} (Parcel: {parcel_id})", expanded=(i==0)):
-                                create_comprehensive_property_display(property_data, api_response)
+                                create_comprehensive_property_display(property_data, api_response, results[i])
                 
                 else:
                     # Handle errors and not found cases
-                    st.session_state.usage_count += 1
+                    if api_response.get('search_credit_used', True):
+                        st.session_state.usage_count += 1
                     st.session_state.api_stats['failed_requests'] += 1
                     
                     error_msg = api_response.get('message', 'Property not found in Ohio records')
@@ -1306,12 +1298,28 @@ if search_button and parcel_input:
                     
                     if error_code == "NO_API_KEY":
                         st.info("🔑 **Setup Required:** Please configure your ReportAllUSA client key in the secrets configuration.")
+                    elif error_code == "KNOWN_INVALID":
+                        st.info(f"🚫 **No Such Parcel:** {', '.join(api_response['rejected_parcel_ids'])} is not in the county's parcel list. No search credit was used.")
                     elif error_code == "NOT_FOUND":
                         st.info("💡 **Search Tips:** Verify the parcel ID format. Different Ohio counties use different formats. You can search multiple parcel IDs by separating them with semicolons (;).")
                     elif error_code == "RATE_LIMIT":
                         st.info("⏱️ **Rate Limit:** The API is temporarily limiting requests. Please wait a moment before trying again.")
                     else:
                         st.info("🔧 **Troubleshooting:** Please verify your input and try again. Check the API configuration help in the sidebar for more information.")
+
+                    # One-click corrections from parcel IDs already looked up
+                    suggestions = api_response.get('suggestions', [])[:5]
+                    if suggestions:
+                        st.markdown("**Did you mean:**")
+                        suggestion_cols = st.columns(len(suggestions))
+                        for i, suggestion in enumerate(suggestions):
+                            suggestion_cols[i].button(
+                                suggestion['parcel_id'],
+                                key=f"suggestion_{i}",
+                                help=f"{suggestion['county']} - instead of {suggestion['original']}",
+                                on_click=apply_suggestion,
+                                args=(suggestion['query'],)
+                            )
                     
                     # Show error details for debugging
                     with st.expander("🔍 Error Details (for debugging)"):
@@ -1329,6 +1337,65 @@ if search_button and parcel_input:
                     st.write(f"**Exception Type:** {type(e).__name__}")
                     st.write(f"**Error Message:** {str(e)}")
 
+# --------------------------
+# Bulk Spreadsheet Lookup
+# --------------------------
+st.divider()
+st.markdown("""
+<div class="info-card">
+    <h2>📂 Bulk Lookup from Spreadsheet</h2>
+    <p>Upload a CSV or Excel file of parcel numbers. Each file runs as a background job: you can keep searching while it is fetched in concurrent chunks, and its progress and downloads appear below. A bulk job counts as one search.</p>
+</div>
+""", unsafe_allow_html=True)
+
+bulk_file = st.file_uploader("Parcel spreadsheet", type=["csv", "xlsx"], key="bulk_file")
+
+if bulk_file is not None:
+    try:
+        bulk_table = read_parcel_table(bulk_file.getvalue(), bulk_file.name)
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        bulk_table = None
+
+    if bulk_table is not None:
+        columns = list(bulk_table.columns)
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            parcel_guess = guess_column(columns, ["parcel", "pin", "apn"]) or columns[0]
+            parcel_column = st.selectbox("Parcel ID column", columns, index=columns.index(parcel_guess))
+        with col2:
+            county_options = ["(none - use County Filter)"] + columns
+            county_guess = guess_column(columns, ["county"])
+            county_column = st.selectbox(
+                "County column (optional)", county_options,
+                index=county_options.index(county_guess) if county_guess else 0
+            )
+        with col3:
+            bulk_button = st.button("🚀 Run Bulk Lookup", type="primary", use_container_width=True)
+
+        st.caption(f"{len(bulk_table):,} rows in {bulk_file.name} (limit {BATCH_CONFIG['MAX_ROWS']:,})")
+
+        if bulk_button:
+            default_county = None if county_filter == "All of Ohio (Recommended)" else county_filter
+            if len(bulk_table) > BATCH_CONFIG["MAX_ROWS"]:
+                st.error(f"❌ {len(bulk_table):,} rows exceeds the bulk limit of {BATCH_CONFIG['MAX_ROWS']:,}")
+            else:
+                try:
+                    job_id = bulk_job_queue().submit(
+                        bulk_table, parcel_column,
+                        None if county_column == county_options[0] else county_column,
+                        default_county
+                    )
+                except JobQueueFull as e:
+                    st.warning(f"⏳ **Bulk queue is full:** {str(e)}")
+                else:
+                    st.session_state.usage_count += 1
+                    st.session_state.api_stats['total_requests'] += 1
+                    st.session_state.bulk_jobs[job_id] = {"file": bulk_file.name, "recorded": False}
+                    st.success(f"✅ Bulk job **{job_id}** queued; progress is shown below")
+
+show_bulk_jobs()
+
 # Enhanced parcel ID format examples
 st.divider()
 st.markdown("""
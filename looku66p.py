@@ -9,6 +9,7 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 import io
+from ohio_counties import COUNTIES_BY_NAME, get_county
 
 # --------------------------
 # Page configuration
@@ -95,24 +96,12 @@ API_BASE_URL = st.secrets.get("OHIO_PROPERTY_API_URL", "https://api.ohioproperty
 API_KEY = st.secrets.get("OHIO_PROPERTY_API_KEY", "")
 API_VERSION = "v1"
 
-# Ohio county configurations
-OHIO_COUNTIES = {
-    'CUYAHOGA': {'code': '18', 'name': 'Cuyahoga County'},
-    'FRANKLIN': {'code': '25', 'name': 'Franklin County'},
-    'HAMILTON': {'code': '31', 'name': 'Hamilton County'},
-    'SUMMIT': {'code': '77', 'name': 'Summit County'},
-    'LUCAS': {'code': '43', 'name': 'Lucas County'},
-    'BUTLER': {'code': '07', 'name': 'Butler County'},
-    'STARK': {'code': '75', 'name': 'Stark County'},
-    'LORAIN': {'code': '41', 'name': 'Lorain County'},
-    'MAHONING': {'code': '47', 'name': 'Mahoning County'},
-    'MONTGOMERY': {'code': '53', 'name': 'Montgomery County'},
-    'LAKE': {'code': '35', 'name': 'Lake County'},
-    'WARREN': {'code': '85', 'name': 'Warren County'},
-    'TRUMBULL': {'code': '79', 'name': 'Trumbull County'},
-    'CLERMONT': {'code': '13', 'name': 'Clermont County'},
-    'MEDINA': {'code': '51', 'name': 'Medina County'}
-}
+# Ohio counties supported by this API (details come from the shared registry)
+SUPPORTED_COUNTY_KEYS = [
+    'CUYAHOGA', 'FRANKLIN', 'HAMILTON', 'SUMMIT', 'LUCAS', 'BUTLER', 'STARK', 'LORAIN',
+    'MAHONING', 'MONTGOMERY', 'LAKE', 'WARREN', 'TRUMBULL', 'CLERMONT', 'MEDINA'
+]
+OHIO_COUNTIES = {key: COUNTIES_BY_NAME[key] for key in SUPPORTED_COUNTY_KEYS}
 
 # --------------------------
 # API Functions for Ohio Property Data
@@ -584,10 +573,7 @@ with tab1:
                     # Determine county code if selected
                     county_code = None
                     if selected_county != "Auto-detect":
-                        for key, info in OHIO_COUNTIES.items():
-                            if info['name'] == selected_county:
-                                county_code = info['code']
-                                break
+                        county_code = get_county(selected_county)['code']
                     
                     # Fetch real Ohio property data
                     api_response = fetch_ohio_property_data(parcel_id, county_code)
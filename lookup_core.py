@@ -0,0 +1,290 @@
+import json
+import os
+import time
+import tomllib
+from datetime import datetime
+
+import requests
+
+from county_routing import get_county_router, search_routed
+from neighborhood_index import get_neighborhood_index
+from owner_portfolio import get_portfolio_index
+from parcel_bloom import definitely_missing
+from parcel_cache import get_parcel_cache, parcel_query_keys
+from parcel_formats import route_parcel_ids, split_parcel_ids, normalize_parcel_id, canonical_parcel_query
+from parcel_store import ingest_records
+from parcel_suggest import did_you_mean, get_parcel_suggester
+from spatial_index import get_spatial_index
+
+# Parcel lookup core of the Professional Edition (l888ookup.py), kept free of
+# Streamlit so batch_lookup.py can run the same searches without a browser session.
+
+SECRETS_PATHS = [
+    os.path.join(os.getcwd(), ".streamlit", "secrets.toml"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml"),
+    os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml")
+]
+
+def load_client_key():
+    """
+    ReportAllUSA client key from TAXLOOK_REPORTALLUSA_CLIENT, else the
+    [reportallusa] client entry of the first Streamlit secrets.toml found
+    """
+    if os.environ.get("TAXLOOK_REPORTALLUSA_CLIENT"):
+        return os.environ["TAXLOOK_REPORTALLUSA_CLIENT"]
+    for path in SECRETS_PATHS:
+        try:
+            with open(path, "rb") as handle:
+                return tomllib.load(handle).get("reportallusa", {}).get("client", "")
+        except (OSError, tomllib.TOMLDecodeError):
+            continue
+    return ""
+
+# --------------------------
+# ReportAllUSA API Configuration
+# --------------------------
+REPORTALLUSA_CONFIG = {
+    "CLIENT_KEY": load_client_key(),
+    "BASE_URL": "https://reportallusa.com/api/parcels",
+    "API_VERSION": "9",
+    "TIMEOUT": 20,
+    "MAX_RETRIES": 3
+}
+
+# --------------------------
+# Enhanced API Functions
+# --------------------------
+PARCEL_CACHE = get_parcel_cache()
+SPATIAL_INDEX = get_spatial_index()
+PORTFOLIO_INDEX = get_portfolio_index()
+NEIGHBORHOOD_INDEX = get_neighborhood_index()
+PARCEL_SUGGESTER = get_parcel_suggester()
+COUNTY_ROUTER = get_county_router()
+
+def build_parcel_response(data, parcel_id, params, response_duration, request_time):
+    """
+    Shape a decoded ReportAllUSA payload into the app's response format
+    """
+    if data.get('status') == 'OK':
+        return {
+            "status": "OK",
+            "results": data.get('results', []),
+            "count": data.get('count', 0),
+            "page": data.get('page', 1),
+            "rpp": data.get('rpp', 10),
+            "query": data.get('query', ''),
+            "api_source": "ReportAllUSA Professional API",
+            "request_params": params,
+            "response_time_seconds": response_duration,
+            "timestamp": request_time.isoformat(),
+            "raw_response": data
+        }
+    else:
+        return {
+            "status": "NOT_FOUND",
+            "message": f"No property found with parcel ID '{parcel_id}' in Ohio.",
+            "api_response": data,
+            "request_params": params,
+            "response_time_seconds": response_duration
+        }
+
+def make_api_request(parcel_id, county_name=None, retry_count=0, use_cache=True):
+    """
+    Enhanced API request with retry logic and comprehensive error handling.
+    use_cache=False always asks upstream (the fresh response still refreshes the cache).
+    """
+    try:
+        client_key = REPORTALLUSA_CONFIG["CLIENT_KEY"]
+        if not client_key:
+            return {
+                "status": "ERROR",
+                "message": "ReportAllUSA client key not configured. Please add [reportallusa] section with client key to secrets.",
+                "error_code": "NO_API_KEY"
+            }
+
+        # Build comprehensive request parameters
+        params = {
+            'client': client_key,
+            'v': REPORTALLUSA_CONFIG["API_VERSION"],
+            'region': f"{county_name}, Ohio" if county_name else "Ohio",
+            'parcel_id': parcel_id,
+            'return_buildings': 'true',
+            'rpp': 50
+        }
+        
+        # Add request timestamp for tracking
+        request_time = datetime.now()
+        
+        # Serve from the shared L1/L2 cache before spending an upstream call
+        cache_keys = parcel_query_keys(
+            REPORTALLUSA_CONFIG["API_VERSION"], params['region'], params['rpp'],
+            parcel_id, canonical_parcel_query(parcel_id, county_name)
+        )
+        cached = PARCEL_CACHE.get_answer(*cache_keys) if use_cache else None
+        if cached is not None:
+            result = build_parcel_response(cached.value, parcel_id, params, 0.0, request_time)
+            result["cache_tier"] = cached.tier
+            return result
+        
+        response = requests.get(
+            REPORTALLUSA_CONFIG["BASE_URL"], 
+            params=params, 
+            timeout=REPORTALLUSA_CONFIG["TIMEOUT"]
+        )
+        
+        response_time = datetime.now()
+        response_duration = (response_time - request_time).total_seconds()
+        
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                PARCEL_CACHE.set_answer(*cache_keys, data, negative=(data.get('status') != 'OK'))
+                ingest_records(data.get('results'))
+                return build_parcel_response(data, parcel_id, params, response_duration, request_time)
+                    
+            except json.JSONDecodeError:
+                return {
+                    "status": "ERROR",
+                    "message": "Invalid JSON response from API",
+                    "raw_response": response.text[:500],
+                    "status_code": response.status_code
+                }
+                
+        elif response.status_code == 401:
+            return {
+                "status": "ERROR",
+                "message": "API authentication failed. Please verify your ReportAllUSA client key.",
+                "error_code": "AUTH_FAILED",
+                "status_code": response.status_code
+            }
+            
+        elif response.status_code == 429:
+            if retry_count < REPORTALLUSA_CONFIG["MAX_RETRIES"]:
+                time.sleep(2 ** retry_count)  # Exponential backoff
+                return make_api_request(parcel_id, county_name, retry_count + 1, use_cache)
+            else:
+                return {
+                    "status": "ERROR",
+                    "message": "API rate limit exceeded. Maximum retries reached.",
+                    "error_code": "RATE_LIMIT",
+                    "status_code": response.status_code
+                }
+                
+        else:
+            return {
+                "status": "ERROR",
+                "message": f"API returned unexpected status code: {response.status_code}",
+                "status_code": response.status_code,
+                "response_text": response.text[:500]
+            }
+            
+    except requests.exceptions.Timeout:
+        if retry_count < REPORTALLUSA_CONFIG["MAX_RETRIES"]:
+            return make_api_request(parcel_id, county_name, retry_count + 1, use_cache)
+        else:
+            return {
+                "status": "ERROR",
+                "message": f"Request timed out after {REPORTALLUSA_CONFIG['TIMEOUT']} seconds. Maximum retries reached.",
+                "error_code": "TIMEOUT"
+            }
+            
+    except requests.exceptions.ConnectionError:
+        return {
+            "status": "ERROR",
+            "message": "Unable to connect to ReportAllUSA API. Please check your internet connection.",
+            "error_code": "CONNECTION_ERROR"
+        }
+        
+    except Exception as e:
+        return {
+            "status": "ERROR",
+            "message": f"Unexpected error: {str(e)}",
+            "error_code": "UNKNOWN_ERROR",
+            "exception_type": type(e).__name__
+        }
+
+def routed_api_request(parcel_query, parcel_ids, county_name=None, use_cache=True):
+    """
+    Narrow a statewide request to the county the parcel ID format points at,
+    or else the county earlier searches for similar IDs confidently resolved
+    to, then search statewide for any IDs the narrowed request did not find
+    """
+    if county_name:
+        result = make_api_request(parcel_query, county_name, use_cache=use_cache)
+    else:
+        queries = [pid.query for pid in parcel_ids]
+        routed_county = route_parcel_ids(queries) or COUNTY_ROUTER.likely_county(queries)
+        routed_county, result = search_routed(
+            lambda county, ids: make_api_request(";".join(pid.query for pid in ids), county, use_cache=use_cache),
+            routed_county, parcel_ids
+        )
+        if routed_county:
+            result["routed_county"] = routed_county
+    
+    if result.get("status") == "OK":
+        result["parcel_ids_searched"] = [pid.display for pid in parcel_ids]
+        result["parcel_keys"] = [pid.canonical for pid in parcel_ids]
+    
+    return result
+
+def search_multiple_parcels(parcel_ids, county_name=None, use_cache=True):
+    """
+    Enhanced multiple parcel search with detailed response tracking
+    """
+    if isinstance(parcel_ids, str):
+        parcel_ids = split_parcel_ids(parcel_ids, county_name)
+    else:
+        parcel_ids = [normalize_parcel_id(pid, county_name) if isinstance(pid, str) else pid for pid in parcel_ids]
+    
+    # IDs go upstream as the user typed them; display/canonical forms are for the UI and cache keys
+    parcel_ids_str = ";".join(pid.query for pid in parcel_ids)
+    
+    result = routed_api_request(parcel_ids_str, parcel_ids, county_name, use_cache)
+    
+    if result.get("status") == "OK":
+        result["search_type"] = "multiple_parcels"
+        result["parcel_count"] = len(parcel_ids)
+    
+    return result
+
+def comprehensive_property_search(search_term, county_name=None):
+    """
+    Main search function with enhanced capabilities
+    """
+    # Normalized, de-duplicated IDs; empty entries from stray separators are dropped
+    parcel_ids = split_parcel_ids(search_term, county_name)
+    
+    if not parcel_ids:
+        return {
+            "status": "ERROR",
+            "message": "Please enter a valid parcel ID",
+            "error_code": "EMPTY_SEARCH"
+        }
+    
+    # IDs the county's parcel list proves do not exist never cost a search credit
+    rejected = definitely_missing(parcel_ids, county_name)
+    if rejected:
+        parcel_ids = [pid for pid in parcel_ids if pid not in rejected]
+        if not parcel_ids:
+            return {
+                "status": "NOT_FOUND",
+                "message": "Parcel ID not found in the county parcel list",
+                "error_code": "KNOWN_INVALID",
+                "rejected_parcel_ids": [pid.display for pid in rejected],
+                "suggestions": did_you_mean(rejected, county_name),
+                "search_credit_used": False
+            }
+    
+    # Detect multiple parcel search
+    if len(parcel_ids) > 1:
+        result = search_multiple_parcels(parcel_ids, county_name)
+    else:
+        result = routed_api_request(parcel_ids[0].query, parcel_ids, county_name)
+        if result.get("status") == "OK":
+            result["search_type"] = "single_parcel"
+    
+    if rejected:
+        result["rejected_parcel_ids"] = [pid.display for pid in rejected]
+    if result.get("status") == "NOT_FOUND":
+        result["suggestions"] = did_you_mean(parcel_ids, county_name)
+    return result
@@ -1,5 +1,4 @@
 import streamlit as st
-import json
 import pandas as pd
 import requests
 from datetime import datetime
@@ -9,6 +8,22 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 import io
+import sqlite3
+from ohio_counties import COUNTY_NAMES
+from parcel_formats import route_parcel_ids, split_parcel_ids, canonical_parcel_query
+from parcel_bloom import definitely_missing
+from parcel_suggest import did_you_mean, get_parcel_suggester
+from county_routing import get_county_router, search_routed
+from parcel_store import get_parcel_store, ingest_records
+from fuzzy_index import get_fuzzy_index, fuzzy_suggestions
+from spatial_index import get_spatial_index, nearby_parcels, record_centroid
+from owner_portfolio import get_portfolio_index
+from neighborhood_index import get_neighborhood_index
+from parcel_cache import get_parcel_cache, make_cache_key, parcel_query_keys, cached_artifact, cached_json_bytes
+from exporters import NdjsonSpool, records_report_zip
+from result_frame import (
+    format_money, format_number, format_value, frame_rows, results_frame, summary_stats, summary_table
+)
 
 # --------------------------
 # Page configuration
@@ -108,100 +123,6 @@ hide_streamlit_style = """
 """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
-# --------------------------
-# Complete Ohio Counties Configuration (All 88 Counties)
-# --------------------------
-OHIO_COUNTIES = {
-    '01': {'code': '01', 'name': 'Adams County', 'seat': 'West Union'},
-    '02': {'code': '02', 'name': 'Allen County', 'seat': 'Lima'},
-    '03': {'code': '03', 'name': 'Ashland County', 'seat': 'Ashland'},
-    '04': {'code': '04', 'name': 'Ashtabula County', 'seat': 'Jefferson'},
-    '05': {'code': '05', 'name': 'Athens County', 'seat': 'Athens'},
-    '06': {'code': '06', 'name': 'Auglaize County', 'seat': 'Wapakoneta'},
-    '07': {'code': '07', 'name': 'Belmont County', 'seat': 'St. Clairsville'},
-    '08': {'code': '08', 'name': 'Brown County', 'seat': 'Georgetown'},
-    '09': {'code': '09', 'name': 'Butler County', 'seat': 'Hamilton'},
-    '10': {'code': '10', 'name': 'Carroll County', 'seat': 'Carrollton'},
-    '11': {'code': '11', 'name': 'Champaign County', 'seat': 'Urbana'},
-    '12': {'code': '12', 'name': 'Clark County', 'seat': 'Springfield'},
-    '13': {'code': '13', 'name': 'Clermont County', 'seat': 'Batavia'},
-    '14': {'code': '14', 'name': 'Clinton County', 'seat': 'Wilmington'},
-    '15': {'code': '15', 'name': 'Columbiana County', 'seat': 'Lisbon'},
-    '16': {'code': '16', 'name': 'Coshocton County', 'seat': 'Coshocton'},
-    '17': {'code': '17', 'name': 'Crawford County', 'seat': 'Bucyrus'},
-    '18': {'code': '18', 'name': 'Cuyahoga County', 'seat': 'Cleveland'},
-    '19': {'code': '19', 'name': 'Darke County', 'seat': 'Greenville'},
-    '20': {'code': '20', 'name': 'Defiance County', 'seat': 'Defiance'},
-    '21': {'code': '21', 'name': 'Delaware County', 'seat': 'Delaware'},
-    '22': {'code': '22', 'name': 'Erie County', 'seat': 'Sandusky'},
-    '23': {'code': '23', 'name': 'Fairfield County', 'seat': 'Lancaster'},
-    '24': {'code': '24', 'name': 'Fayette County', 'seat': 'Washington Court House'},
-    '25': {'code': '25', 'name': 'Franklin County', 'seat': 'Columbus'},
-    '26': {'code': '26', 'name': 'Fulton County', 'seat': 'Wauseon'},
-    '27': {'code': '27', 'name': 'Gallia County', 'seat': 'Gallipolis'},
-    '28': {'code': '28', 'name': 'Geauga County', 'seat': 'Chardon'},
-    '29': {'code': '29', 'name': 'Greene County', 'seat': 'Xenia'},
-    '30': {'code': '30', 'name': 'Guernsey County', 'seat': 'Cambridge'},
-    '31': {'code': '31', 'name': 'Hamilton County', 'seat': 'Cincinnati'},
-    '32': {'code': '32', 'name': 'Hancock County', 'seat': 'Findlay'},
-    '33': {'code': '33', 'name': 'Hardin County', 'seat': 'Kenton'},
-    '34': {'code': '34', 'name': 'Harrison County', 'seat': 'Cadiz'},
-    '35': {'code': '35', 'name': 'Henry County', 'seat': 'Napoleon'},
-    '36': {'code': '36', 'name': 'Highland County', 'seat': 'Hillsboro'},
-    '37': {'code': '37', 'name': 'Hocking County', 'seat': 'Logan'},
-    '38': {'code': '38', 'name': 'Holmes County', 'seat': 'Millersburg'},
-    '39': {'code': '39', 'name': 'Huron County', 'seat': 'Norwalk'},
-    '40': {'code': '40', 'name': 'Jackson County', 'seat': 'Jackson'},
-    '41': {'code': '41', 'name': 'Jefferson County', 'seat': 'Steubenville'},
-    '42': {'code': '42', 'name': 'Knox County', 'seat': 'Mount Vernon'},
-    '43': {'code': '43', 'name': 'Lake County', 'seat': 'Painesville'},
-    '44': {'code': '44', 'name': 'Lawrence County', 'seat': 'Ironton'},
-    '45': {'code': '45', 'name': 'Licking County', 'seat': 'Newark'},
-    '46': {'code': '46', 'name': 'Logan County', 'seat': 'Bellefontaine'},
-    '47': {'code': '47', 'name': 'Lorain County', 'seat': 'Elyria'},
-    '48': {'code': '48', 'name': 'Lucas County', 'seat': 'Toledo'},
-    '49': {'code': '49', 'name': 'Madison County', 'seat': 'London'},
-    '50': {'code': '50', 'name': 'Mahoning County', 'seat': 'Youngstown'},
-    '51': {'code': '51', 'name': 'Marion County', 'seat': 'Marion'},
-    '52': {'code': '52', 'name': 'Medina County', 'seat': 'Medina'},
-    '53': {'code': '53', 'name': 'Meigs County', 'seat': 'Pomeroy'},
-    '54': {'code': '54', 'name': 'Mercer County', 'seat': 'Celina'},
-    '55': {'code': '55', 'name': 'Miami County', 'seat': 'Troy'},
-    '56': {'code': '56', 'name': 'Monroe County', 'seat': 'Woodsfield'},
-    '57': {'code': '57', 'name': 'Montgomery County', 'seat': 'Dayton'},
-    '58': {'code': '58', 'name': 'Morgan County', 'seat': 'McConnelsville'},
-    '59': {'code': '59', 'name': 'Morrow County', 'seat': 'Mount Gilead'},
-    '60': {'code': '60', 'name': 'Muskingum County', 'seat': 'Zanesville'},
-    '61': {'code': '61', 'name': 'Noble County', 'seat': 'Caldwell'},
-    '62': {'code': '62', 'name': 'Ottawa County', 'seat': 'Port Clinton'},
-    '63': {'code': '63', 'name': 'Paulding County', 'seat': 'Paulding'},
-    '64': {'code': '64', 'name': 'Perry County', 'seat': 'New Lexington'},
-    '65': {'code': '65', 'name': 'Pickaway County', 'seat': 'Circleville'},
-    '66': {'code': '66', 'name': 'Pike County', 'seat': 'Waverly'},
-    '67': {'code': '67', 'name': 'Portage County', 'seat': 'Ravenna'},
-    '68': {'code': '68', 'name': 'Preble County', 'seat': 'Eaton'},
-    '69': {'code': '69', 'name': 'Putnam County', 'seat': 'Ottawa'},
-    '70': {'code': '70', 'name': 'Richland County', 'seat': 'Mansfield'},
-    '71': {'code': '71', 'name': 'Ross County', 'seat': 'Chillicothe'},
-    '72': {'code': '72', 'name': 'Sandusky County', 'seat': 'Fremont'},
-    '73': {'code': '73', 'name': 'Scioto County', 'seat': 'Portsmouth'},
-    '74': {'code': '74', 'name': 'Seneca County', 'seat': 'Tiffin'},
-    '75': {'code': '75', 'name': 'Shelby County', 'seat': 'Sidney'},
-    '76': {'code': '76', 'name': 'Stark County', 'seat': 'Canton'},
-    '77': {'code': '77', 'name': 'Summit County', 'seat': 'Akron'},
-    '78': {'code': '78', 'name': 'Trumbull County', 'seat': 'Warren'},
-    '79': {'code': '79', 'name': 'Tuscarawas County', 'seat': 'New Philadelphia'},
-    '80': {'code': '80', 'name': 'Union County', 'seat': 'Marysville'},
-    '81': {'code': '81', 'name': 'Van Wert County', 'seat': 'Van Wert'},
-    '82': {'code': '82', 'name': 'Vinton County', 'seat': 'McArthur'},
-    '83': {'code': '83', 'name': 'Warren County', 'seat': 'Lebanon'},
-    '84': {'code': '84', 'name': 'Washington County', 'seat': 'Marietta'},
-    '85': {'code': '85', 'name': 'Wayne County', 'seat': 'Wooster'},
-    '86': {'code': '86', 'name': 'Williams County', 'seat': 'Bryan'},
-    '87': {'code': '87', 'name': 'Wood County', 'seat': 'Bowling Green'},
-    '88': {'code': '88', 'name': 'Wyandot County', 'seat': 'Upper Sandusky'}
-}
-
 # --------------------------
 # Real Property Data API Configuration - ReportAllUSA
 # --------------------------
@@ -215,6 +136,35 @@ PROPERTY_API_CONFIG = {
     "API_VERSION": "9"
 }
 
+PARCEL_CACHE = get_parcel_cache()
+PARCEL_STORE = get_parcel_store()
+FUZZY_INDEX = get_fuzzy_index()
+SPATIAL_INDEX = get_spatial_index()
+PORTFOLIO_INDEX = get_portfolio_index()
+NEIGHBORHOOD_INDEX = get_neighborhood_index()
+PARCEL_SUGGESTER = get_parcel_suggester()
+COUNTY_ROUTER = get_county_router()
+
+def build_reportallusa_response(data, not_found_message, require_results=True):
+    """
+    Shape a decoded ReportAllUSA payload into the app's response format
+    """
+    if data.get('status') == 'OK' and (data.get('results') or not require_results):
+        return {
+            "status": "OK",
+            "results": data.get('results', []),
+            "api_source": "ReportAllUSA - Ohio Statewide",
+            "total_records": data.get('count', 0),
+            "query_info": data.get('query', ''),
+            "raw_response": data  # Include raw JSON response
+        }
+    else:
+        return {
+            "status": "NOT_FOUND",
+            "message": not_found_message,
+            "raw_response": data
+        }
+
 # --------------------------
 # Enhanced API Functions for Real Ohio Property Data - ReportAllUSA
 # --------------------------
@@ -244,25 +194,22 @@ def fetch_ohio_property_data_reportallusa(parcel_id, county_name=None):
             'rpp': 10
         }
         
+        not_found_message = f"No property found with parcel ID '{parcel_id}' in Ohio."
+        
+        # Serve from the shared L1/L2 cache before spending an upstream call
+        cache_keys = parcel_query_keys(api_version, params['region'], params['rpp'], parcel_id, canonical_parcel_query(parcel_id, county_name))
+        cached = PARCEL_CACHE.get_answer(*cache_keys)
+        if cached is not None:
+            return build_reportallusa_response(cached.value, not_found_message)
+        
         response = requests.get(base_url, params=params, timeout=15)
         
         if response.status_code == 200:
             data = response.json()
-            if data.get('status') == 'OK' and data.get('results'):
-                return {
-                    "status": "OK",
-                    "results": data.get('results', []),
-                    "api_source": "ReportAllUSA - Ohio Statewide",
-                    "total_records": data.get('count', 0),
-                    "query_info": data.get('query', ''),
-                    "raw_response": data  # Include raw JSON response
-                }
-            else:
-                return {
-                    "status": "NOT_FOUND",
-                    "message": f"No property found with parcel ID '{parcel_id}' in Ohio.",
-                    "raw_response": data
-                }
+            result = build_reportallusa_response(data, not_found_message)
+            PARCEL_CACHE.set_answer(*cache_keys, data, negative=(result["status"] != "OK"))
+            ingest_records(data.get('results'))
+            return result
         elif response.status_code == 401:
             return {
                 "status": "ERROR", 
@@ -335,25 +282,21 @@ def search_multiple_parcels_ohio(parcel_ids, county_name=None):
             'rpp': 50  # Higher limit for multiple parcels
         }
         
+        not_found_message = "No properties found for the provided parcel IDs in Ohio."
+        
+        cache_keys = parcel_query_keys(api_version, params['region'], params['rpp'], parcel_ids_str, canonical_parcel_query(parcel_ids_str, county_name))
+        cached = PARCEL_CACHE.get_answer(*cache_keys)
+        if cached is not None:
+            return build_reportallusa_response(cached.value, not_found_message, require_results=False)
+        
         response = requests.get(base_url, params=params, timeout=20)
         
         if response.status_code == 200:
             data = response.json()
-            if data.get('status') == 'OK':
-                return {
-                    "status": "OK",
-                    "results": data.get('results', []),
-                    "api_source": "ReportAllUSA - Ohio Statewide",
-                    "total_records": data.get('count', 0),
-                    "query_info": data.get('query', ''),
-                    "raw_response": data  # Include raw JSON response
-                }
-            else:
-                return {
-                    "status": "NOT_FOUND",
-                    "message": "No properties found for the provided parcel IDs in Ohio.",
-                    "raw_response": data
-                }
+            result = build_reportallusa_response(data, not_found_message, require_results=False)
+            PARCEL_CACHE.set_answer(*cache_keys, data, negative=(result["status"] != "OK"))
+            ingest_records(data.get('results'))
+            return result
         else:
             return {
                 "status": "ERROR", 
@@ -368,24 +311,143 @@ def search_multiple_parcels_ohio(parcel_ids, county_name=None):
             "raw_response": None
         }
 
+def search_ohio_property_by_text(search_term, search_type, county_name=None):
+    """
+    Owner or address search using ReportAllUSA API (fallback when the local index has no match)
+    """
+    try:
+        client_key = PROPERTY_API_CONFIG["REPORTALLUSA_CLIENT_KEY"]
+        if not client_key:
+            return {
+                "status": "ERROR", 
+                "message": "API client key not configured.",
+                "raw_response": None
+            }
+
+        base_url = PROPERTY_API_CONFIG["REPORTALLUSA_BASE_URL"]
+        api_version = PROPERTY_API_CONFIG["API_VERSION"]
+        
+        params = {
+            'client': client_key,
+            'v': api_version,
+            'region': f"{county_name}, Ohio" if county_name else "Ohio",
+            search_type: search_term.strip(),
+            'return_buildings': 'true',
+            'rpp': 10
+        }
+        
+        not_found_message = f"No property found with {search_type} '{search_term.strip()}' in Ohio."
+        
+        cache_key = make_cache_key(api_version, params['region'], params['rpp'], search_type, " ".join(search_term.split()))
+        cached = PARCEL_CACHE.get(cache_key)
+        if cached is not None:
+            return build_reportallusa_response(cached.value, not_found_message)
+        
+        response = requests.get(base_url, params=params, timeout=15)
+        
+        if response.status_code == 200:
+            data = response.json()
+            result = build_reportallusa_response(data, not_found_message)
+            PARCEL_CACHE.set(cache_key, data, negative=(result["status"] != "OK"))
+            ingest_records(data.get('results'))
+            return result
+        else:
+            return {
+                "status": "ERROR", 
+                "message": f"API error: {response.status_code}",
+                "raw_response": None
+            }
+            
+    except Exception as e:
+        return {
+            "status": "ERROR", 
+            "message": f"{search_type.title()} search error: {str(e)}",
+            "raw_response": None
+        }
+
 def search_ohio_property_comprehensive(search_term, search_type="parcel", county_name=None):
     """
     Comprehensive Ohio property search using ReportAllUSA API with state-wide coverage
     """
     if search_type == "parcel":
-        # Handle single or multiple parcel IDs
-        if ";" in search_term or "," in search_term:
+        # Normalized, de-duplicated IDs; empty entries from stray separators are dropped
+        parcel_ids = split_parcel_ids(search_term, county_name)
+        if not parcel_ids:
+            return {
+                "status": "ERROR",
+                "message": "Please enter a valid parcel ID.",
+                "raw_response": None
+            }
+        # IDs the county's parcel list proves do not exist never cost a search credit
+        rejected = definitely_missing(parcel_ids, county_name)
+        if rejected:
+            parcel_ids = [pid for pid in parcel_ids if pid not in rejected]
+            if not parcel_ids:
+                return {
+                    "status": "NOT_FOUND",
+                    "message": f"Parcel ID not found in the county parcel list: {', '.join(pid.display for pid in rejected)}",
+                    "error_code": "KNOWN_INVALID",
+                    "rejected_parcel_ids": [pid.display for pid in rejected],
+                    "suggestions": did_you_mean(rejected, county_name),
+                    "search_credit_used": False,
+                    "raw_response": None
+                }
+        # IDs go upstream as the user typed them; display/canonical forms are for the UI and cache keys
+        queries = [pid.query for pid in parcel_ids]
+        display_ids = [pid.display for pid in parcel_ids]
+        
+        if len(parcel_ids) > 1:
             # Multiple parcel IDs
-            parcel_ids = [pid.strip() for pid in search_term.replace(",", ";").split(";")]
-            return search_multiple_parcels_ohio(parcel_ids, county_name)
+            search = lambda county, ids: search_multiple_parcels_ohio([pid.query for pid in ids], county)
         else:
             # Single parcel ID
-            return fetch_ohio_property_data_reportallusa(search_term, county_name)
+            search = lambda county, ids: fetch_ohio_property_data_reportallusa(ids[0].query, county)
+        
+        # Narrow statewide searches to the county the ID format points at, or
+        # else the county similar IDs confidently resolved to before, then search
+        # statewide for any IDs the narrowed search did not find
+        if county_name:
+            result = search(county_name, parcel_ids)
+        else:
+            routed_county = route_parcel_ids(queries) or COUNTY_ROUTER.likely_county(queries)
+            routed_county, result = search_routed(search, routed_county, parcel_ids)
+            if routed_county:
+                result["routed_county"] = routed_county
+        if result.get("status") == "OK":
+            result["parcel_ids_searched"] = display_ids
+            result["parcel_keys"] = [pid.canonical for pid in parcel_ids]
+        if rejected:
+            result["rejected_parcel_ids"] = [pid.display for pid in rejected]
+        if result.get("status") == "NOT_FOUND":
+            result["suggestions"] = did_you_mean(parcel_ids, county_name)
+        return result
+    elif search_type in ("owner", "address"):
+        # Records fetched earlier are indexed locally; only a miss costs an API call
+        try:
+            local_results = PARCEL_STORE.search(search_term, search_type, county_name)
+        except sqlite3.Error:
+            # A locked or damaged local index must not fail the search; ask the API instead
+            local_results = []
+        if local_results:
+            return {
+                "status": "OK",
+                "results": local_results,
+                "api_source": "Local parcel index",
+                "total_records": len(local_results),
+                "query_info": search_term,
+                "search_credit_used": False,
+                "raw_response": None
+            }
+        result = search_ohio_property_by_text(search_term, search_type, county_name)
+        if result.get("status") == "NOT_FOUND":
+            # Misspellings and "Court" vs "Ct": offer the closest known records
+            # by trigram similarity, never return them as if they matched
+            result["suggestions"] = fuzzy_suggestions(search_term, search_type, county_name)
+        return result
     else:
-        # For address searches, we'll still use parcel search but inform user
         return {
             "status": "ERROR",
-            "message": "Address search not directly supported. Please use parcel ID search for Ohio properties.",
+            "message": f"Unsupported search type '{search_type}'.",
             "raw_response": None
         }
 
@@ -393,33 +455,29 @@ def search_ohio_property_comprehensive(search_term, search_type="parcel", county
 # Enhanced Property Display Functions
 # --------------------------
 def create_enhanced_ohio_property_cards(data):
-    """Create enhanced property display cards for Ohio property data"""
+    """Create enhanced property display cards from a normalized result row (see result_frame)"""
     
     # Main property overview with gradient cards
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         # Market Value - Blue gradient
-        market_value = data.get('market_value', data.get('assessed_value', data.get('appraised_value', 0)))
-        try:
-            market_value = float(market_value) if market_value else 0
-        except:
-            market_value = 0
+        market_value = format_money(data['mkt_val_tot'], decimals=0)
         
         st.markdown(f"""
         <div style='background: linear-gradient(135deg, #2196F3 0%, #1976D2 100%); 
                     padding: 20px; border-radius: 15px; margin: 10px 5px; color: white; 
                     box-shadow: 0 6px 20px rgba(33,150,243,0.3); text-align: center;'>
             <h4 style='color: white; margin-bottom: 15px;'>💰 Market Value</h4>
-            <div style='font-size: 24px; font-weight: bold; margin-bottom: 10px;'>${market_value:,.0f}</div>
+            <div style='font-size: 24px; font-weight: bold; margin-bottom: 10px;'>{market_value}</div>
             <div style='font-size: 12px; opacity: 0.9;'>Assessed Value</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
         # Parcel Information - Green gradient
-        parcel_id = data.get('parcel_id', data.get('parcelid', data.get('parcel_number', 'N/A')))
-        county_name = data.get('county', data.get('county_name', 'N/A'))
+        parcel_id = format_value(data['parcel_id'])
+        county_name = format_value(data['county_name'])
         
         st.markdown(f"""
         <div style='background: linear-gradient(135deg, #4CAF50 0%, #388E3C 100%); 
@@ -433,9 +491,9 @@ def create_enhanced_ohio_property_cards(data):
     
     with col3:
         # Property Details - Orange gradient
-        property_type = data.get('property_type', data.get('land_use', data.get('property_class', 'N/A')))
-        year_built = data.get('year_built', data.get('built_year', 'N/A'))
-        lot_size = data.get('lot_size', data.get('acreage', data.get('lot_area', 'N/A')))
+        property_type = format_value(data['land_use_class'])
+        year_built = format_number(data['year_built'])
+        lot_size = format_number(data['acreage'], decimals=3, suffix=' acres')
         
         st.markdown(f"""
         <div style='background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%); 
@@ -450,21 +508,16 @@ def create_enhanced_ohio_property_cards(data):
     
     with col4:
         # Tax Information - Purple gradient
-        annual_tax = data.get('annual_tax', data.get('tax_amount', data.get('taxes', 0)))
+        annual_tax = format_money(data['annual_tax'], decimals=0)
         tax_year = data.get('tax_year', datetime.now().year)
-        school_district = data.get('school_district', data.get('district', 'N/A'))
-        
-        try:
-            annual_tax = float(annual_tax) if annual_tax else 0
-        except:
-            annual_tax = 0
+        school_district = format_value(data['school_district'])
         
         st.markdown(f"""
         <div style='background: linear-gradient(135deg, #9C27B0 0%, #7B1FA2 100%); 
                     padding: 20px; border-radius: 15px; margin: 10px 5px; color: white; 
                     box-shadow: 0 6px 20px rgba(156,39,176,0.3); text-align: center;'>
             <h4 style='color: white; margin-bottom: 15px;'>🏛️ Tax Info</h4>
-            <div style='margin-bottom: 12px;'><strong>Annual Tax:</strong><br><span style='font-size: 16px; font-weight: bold;'>${annual_tax:,.0f}</span></div>
+            <div style='margin-bottom: 12px;'><strong>Annual Tax:</strong><br><span style='font-size: 16px; font-weight: bold;'>{annual_tax}</span></div>
             <div style='margin-bottom: 12px;'><strong>Tax Year:</strong><br><span style='font-size: 14px;'>{tax_year}</span></div>
             <div><strong>School District:</strong><br><span style='font-size: 12px;'>{school_district}</span></div>
         </div>
@@ -481,9 +534,9 @@ def create_enhanced_ohio_property_cards(data):
     
     col1, col2 = st.columns(2)
     with col1:
-        property_address = data.get('address', data.get('property_address', data.get('street_address', 'N/A')))
-        city = data.get('city', data.get('municipality', 'N/A'))
-        zip_code = data.get('zip', data.get('zip_code', data.get('postal_code', 'N/A')))
+        property_address = format_value(data['address'])
+        city = format_value(data['addr_city'])
+        zip_code = format_value(data['addr_zip'])
         
         st.markdown(f"""
         <div style='color: #2d3748; font-weight: 600; margin-bottom: 8px;'>Property Address:</div>
@@ -492,15 +545,15 @@ def create_enhanced_ohio_property_cards(data):
         """, unsafe_allow_html=True)
         
         # Coordinates if available
-        lat = data.get('latitude', data.get('lat'))
-        lng = data.get('longitude', data.get('lng', data.get('lon')))
-        if lat and lng:
+        lat = data['latitude']
+        lng = data['longitude']
+        if lat is not None and lng is not None:
             st.markdown(f"<div style='color: #2d3748;'><strong>Coordinates:</strong> {lat}, {lng}</div>", unsafe_allow_html=True)
     
     with col2:
         # Owner information
-        owner_name = data.get('owner', data.get('owner_name', data.get('property_owner', 'N/A')))
-        mailing_address = data.get('mailing_address', data.get('owner_address', property_address))
+        owner_name = format_value(data['owner'])
+        mailing_address = format_value(data['mailing_address'], missing=property_address)
         
         st.markdown(f"""
         <div style='color: #2d3748; font-weight: 600; margin-bottom: 8px;'>Owner Information:</div>
@@ -511,7 +564,7 @@ def create_enhanced_ohio_property_cards(data):
     st.markdown("</div>", unsafe_allow_html=True)
 
     # Additional Property Details
-    if any(key in data for key in ['bedrooms', 'bathrooms', 'square_feet', 'stories']):
+    if any(data[field] is not None for field in ['bedrooms', 'bathrooms', 'bldg_sqft', 'stories']):
         st.markdown("""
         <div style='background: linear-gradient(135deg, #FFF3E0 0%, #FFE0B2 100%); 
                     padding: 20px; border-radius: 15px; margin: 10px 0; color: #2d3748; box-shadow: 0 4px 15px rgba(0,0,0,0.1);'>
@@ -520,23 +573,104 @@ def create_enhanced_ohio_property_cards(data):
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            bedrooms = data.get('bedrooms', data.get('beds', 'N/A'))
+            bedrooms = format_number(data['bedrooms'])
             st.markdown(f"<div style='color: #2d3748;'><strong>Bedrooms:</strong> {bedrooms}</div>", unsafe_allow_html=True)
         with col2:
-            bathrooms = data.get('bathrooms', data.get('baths', 'N/A'))
+            bathrooms = format_number(data['bathrooms'], decimals=1)
             st.markdown(f"<div style='color: #2d3748;'><strong>Bathrooms:</strong> {bathrooms}</div>", unsafe_allow_html=True)
         with col3:
-            sqft = data.get('square_feet', data.get('sqft', data.get('living_area', 'N/A')))
+            sqft = format_number(data['bldg_sqft'])
             st.markdown(f"<div style='color: #2d3748;'><strong>Square Feet:</strong> {sqft}</div>", unsafe_allow_html=True)
         with col4:
-            stories = data.get('stories', data.get('floors', 'N/A'))
+            stories = format_number(data['stories'])
             st.markdown(f"<div style='color: #2d3748;'><strong>Stories:</strong> {stories}</div>", unsafe_allow_html=True)
         
         st.markdown("</div>", unsafe_allow_html=True)
 
+    # Nearby parcels already in the local index (no API call)
+    nearby = nearby_parcels(data, k=10, meters=500)
+    if nearby:
+        st.markdown(f"**🗺️ Known Parcels Within 500 m:** {len(nearby)}")
+        nearby_df = pd.DataFrame([{
+            'Parcel ID': record.get('parcel_id', 'N/A'),
+            'Address': record.get('address', 'N/A'),
+            'Owner': record.get('owner', 'N/A'),
+            'Market Value': record.get('mkt_val_tot', 'N/A'),
+            'Distance (m)': distance
+        } for record, distance in nearby])
+        st.dataframe(nearby_df, use_container_width=True, hide_index=True)
+        map_points = [record_centroid(data)] + [record_centroid(record) for record, _ in nearby]
+        st.map(pd.DataFrame(
+            [point for point in map_points if point is not None], columns=['lat', 'lon']
+        ))
+
+    # Other parcels held by this owner at the same mailing address (local index, no API call)
+    portfolio = PORTFOLIO_INDEX.portfolio_for_record(data)
+    if portfolio and portfolio['parcel_count'] > 1:
+        st.write(f"**Owner Portfolio:** {portfolio['owner_key']} - {portfolio['mail_key'] or 'no mailing address'}")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Known Parcels", portfolio['parcel_count'])
+        col2.metric("Total Market Value", f"${portfolio['total_market_value']:,.0f}")
+        col3.metric("Total Acreage", f"{portfolio['total_acreage']:,.3f}")
+        portfolio_df = pd.DataFrame([{
+            'Parcel ID': record.get('parcel_id', 'N/A'),
+            'Address': record.get('address', 'N/A'),
+            'County': record.get('county_name', 'N/A'),
+            'Market Value': record.get('mkt_val_tot', 'N/A'),
+            'Acreage': record.get('acreage', 'N/A'),
+            'Adjacent Same-Owner Acreage': record.get('acreage_adjacent_with_sameowner', 'N/A')
+        } for record in portfolio['records']])
+        st.dataframe(portfolio_df, use_container_width=True, hide_index=True)
+        if portfolio['other_clusters']:
+            st.caption(f"{portfolio['other_clusters']} more group(s) under the same owner name with a different mailing address.")
+
+    # How this parcel compares with its neighborhood (precomputed summary, no scan)
+    neighborhood = NEIGHBORHOOD_INDEX.compare(data)
+    if neighborhood and neighborhood['summary']['parcel_count'] > 1:
+        summary = neighborhood['summary']
+        median = neighborhood['median_market_value']
+        st.write(f"**vs. Neighborhood {neighborhood['ngh_code']}** ({summary['parcel_count']} known parcels)")
+        col1, col2, col3 = st.columns(3)
+        col1.metric(
+            "Neighborhood Median Value",
+            f"${median:,.0f}" if median else "N/A",
+            delta=f"{neighborhood['vs_median']:+.0%} this parcel" if neighborhood['vs_median'] is not None else None
+        )
+        if neighborhood['percentile_rank'] is not None:
+            col2.metric("Value Percentile", f"{neighborhood['percentile_rank']:.0f}")
+        else:
+            # Unknown value: no percentile or delta rather than a misleading "-100%"
+            col2.caption("No market value on record for this parcel, so it is not compared with the neighborhood.")
+        col3.metric("Market Sales Recorded", summary['sale_price']['count'])
+        if summary['recent_sales']:
+            st.write("**Recent Neighborhood Sales**")
+            sales_df = pd.DataFrame(summary['recent_sales']).rename(columns={
+                'parcel_id': 'Parcel ID', 'address': 'Address', 'trans_date': 'Date', 'sale_price': 'Sale Price'
+            })
+            st.dataframe(sales_df, use_container_width=True, hide_index=True)
+
 # --------------------------
 # Enhanced PDF Generation
 # --------------------------
+# Bump when the PDF layout or JSON export format changes so cached artifacts are rebuilt
+REPORT_TEMPLATE_VERSION = "1"
+
+def spool_results(results):
+    """
+    Spool a search's records to a temp NDJSON file for download, replacing
+    the previous search's spool in this session
+    """
+    previous = st.session_state.get('results_spool')
+    if previous is not None:
+        previous.discard()
+    spool = NdjsonSpool()
+    try:
+        spool.write(results)
+    finally:
+        spool.close()
+    st.session_state.results_spool = spool
+    return spool
+
 def create_enhanced_ohio_pdf(data):
     """Create enhanced PDF report for Ohio property data"""
     buffer = io.BytesIO()
@@ -559,17 +693,17 @@ def create_enhanced_ohio_pdf(data):
     # Property overview table with enhanced data
     overview_data = [
         ['Property Information', 'Details'],
-        ['Parcel ID', data.get('parcel_id', data.get('parcelid', 'N/A'))],
-        ['Property Address', data.get('address', data.get('property_address', 'N/A'))],
-        ['City, State ZIP', f"{data.get('city', 'N/A')}, OH {data.get('zip', data.get('zip_code', 'N/A'))}"],
-        ['County', data.get('county', data.get('county_name', 'N/A'))],
-        ['Owner', data.get('owner', data.get('owner_name', 'N/A'))],
-        ['Market Value', f"${float(data.get('market_value', data.get('assessed_value', 0))):,.2f}"],
-        ['Annual Tax', f"${float(data.get('annual_tax', data.get('tax_amount', 0))):,.2f}"],
-        ['Property Type', data.get('property_type', data.get('land_use', 'N/A'))],
-        ['Year Built', data.get('year_built', data.get('built_year', 'N/A'))],
-        ['Lot Size', data.get('lot_size', data.get('acreage', 'N/A'))],
-        ['School District', data.get('school_district', data.get('district', 'N/A'))]
+        ['Parcel ID', format_value(data['parcel_id'])],
+        ['Property Address', format_value(data['address'])],
+        ['City, State ZIP', f"{format_value(data['addr_city'])}, OH {format_value(data['addr_zip'])}"],
+        ['County', format_value(data['county_name'])],
+        ['Owner', format_value(data['owner'])],
+        ['Market Value', format_money(data['mkt_val_tot'])],
+        ['Annual Tax', format_money(data['annual_tax'])],
+        ['Property Type', format_value(data['land_use_class'])],
+        ['Year Built', format_number(data['year_built'])],
+        ['Lot Size', format_number(data['acreage'], decimals=3, suffix=' acres')],
+        ['School District', format_value(data['school_district'])]
     ]
     
     table = Table(overview_data, colWidths=[2.5*inch, 3.5*inch])
@@ -689,21 +823,38 @@ if st.session_state.usage_count >= MAX_SEARCHES:
     """, unsafe_allow_html=True)
     st.stop()
 
-# Main search interface (removed tabs, keeping only parcel search)
-st.subheader("🔍 Ohio State-wide Property Search by Parcel ID")
-st.markdown("*Search any property across all of Ohio using parcel ID - no county selection needed!*")
+# Main search interface
+st.subheader("🔍 Ohio State-wide Property Search")
+st.markdown("*Search any property across all of Ohio by parcel ID, owner or address - no county selection needed!*")
+
+SEARCH_TYPES = {
+    "Parcel ID": ("parcel", "Enter Ohio Parcel ID", "e.g., 44327012 or multiple: 44327012;44327010;44327013",
+                  "Enter single parcel ID or multiple IDs separated by semicolons. Searches entire state of Ohio automatically."),
+    "Owner Name": ("owner", "Enter Owner Name", "e.g., Smith John",
+                   "Matches owners of properties already looked up instantly; otherwise searches the API."),
+    "Property Address": ("address", "Enter Property Address", "e.g., 2469 Dobson Ct",
+                         "Matches addresses of properties already looked up instantly; otherwise searches the API.")
+}
+search_by = st.radio("Search by", list(SEARCH_TYPES), horizontal=True)
+search_type, search_label, search_placeholder, search_help = SEARCH_TYPES[search_by]
+
+def apply_suggestion(query):
+    """Did-you-mean button callback: put the corrected IDs in the search box and search again"""
+    st.session_state.parcel_search = query
+    st.session_state.rerun_search = True
 
 col1, col2, col3 = st.columns([4, 2, 1])
 with col1:
     parcel_id = st.text_input(
-        "Enter Ohio Parcel ID", 
-        placeholder="e.g., 44327012 or multiple: 44327012;44327010;44327013", 
-        help="Enter single parcel ID or multiple IDs separated by semicolons. Searches entire state of Ohio automatically."
+        search_label, 
+        placeholder=search_placeholder, 
+        help=search_help,
+        key="parcel_search"
     )
 with col2:
     county_filter = st.selectbox(
         "County Filter (Optional)",
-        ["All of Ohio (Recommended)"] + [f"{info['name']}" for info in OHIO_COUNTIES.values()],
+        ["All of Ohio (Recommended)"] + COUNTY_NAMES,
         help="Leave as 'All of Ohio' for best results, or select specific county to narrow search"
     )
 with col3:
@@ -714,11 +865,11 @@ with col3:
     )
 
 # Enhanced parcel ID search functionality
-if search_button and parcel_id:
+if (search_button or st.session_state.pop('rerun_search', False)) and parcel_id:
     if st.session_state.usage_count >= MAX_SEARCHES:
         st.error("Usage limit reached!")
     elif not parcel_id.strip():
-        st.error("Please enter a valid Parcel ID")
+        st.error(f"Please enter a valid {search_by}")
     else:
         with st.spinner("Searching Ohio state-wide property database..."):
             try:
@@ -728,28 +879,43 @@ if search_button and parcel_id:
                     county_name = county_filter
                 
                 # Use comprehensive search function
-                api_response = search_ohio_property_comprehensive(parcel_id, "parcel", county_name)
+                api_response = search_ohio_property_comprehensive(parcel_id, search_type, county_name)
 
                 if api_response.get('status') == "OK" and api_response.get('results'):
-                    # Update usage count and history
-                    st.session_state.usage_count += 1
+                    # Update usage count (answers from the local index are free) and history
+                    if api_response.get('search_credit_used', True):
+                        st.session_state.usage_count += 1
                     timestamp = datetime.now().strftime('%H:%M:%S')
                     search_scope = f" - {county_filter}" if county_filter != "All of Ohio (Recommended)" else " - Statewide"
-                    st.session_state.search_history.append(f"{parcel_id}{search_scope} - {timestamp}")
+                    searched_ids = "; ".join(api_response.get('parcel_ids_searched', [parcel_id]))
+                    st.session_state.search_history.append(f"{searched_ids}{search_scope} - {timestamp}")
                     
                     # Success message
                     total_found = api_response.get('total_records', len(api_response.get('results', [])))
                     st.success(f"✅ Found {total_found} Ohio property record(s)! (Search {st.session_state.usage_count}/{MAX_SEARCHES}) - Source: {api_response.get('api_source', 'ReportAllUSA')}")
                     
+                    if api_response.get('rejected_parcel_ids'):
+                        st.warning(f"🚫 Skipped {', '.join(api_response['rejected_parcel_ids'])}: not in the county's parcel list.")
+                    
                     # Display results
                     results = api_response['results']
+                    # One typed pass over the result list feeds the cards, table and PDF below
+                    results_df = results_frame(results)
+                    rows = frame_rows(results_df)
+                    export_stem = "_".join(api_response.get('parcel_keys', [])) or parcel_id.replace(';', '_')
                     if len(results) == 1:
-                        create_enhanced_ohio_property_cards(results[0])
+                        create_enhanced_ohio_property_cards(rows[0])
                     else:
                         st.info(f"Found {len(results)} matching properties:")
-                        for i, property_data in enumerate(results[:5]):  # Show top 5 results
-                            county_name = property_data.get('county', property_data.get('county_name', 'N/A'))
-                            address = property_data.get('address', property_data.get('property_address', 'N/A'))
+                        stats = summary_stats(results_df)
+                        col1, col2, col3 = st.columns(3)
+                        col1.metric("Properties", stats['count'])
+                        col2.metric("Total Market Value", format_money(stats['total_value'], decimals=0))
+                        col3.metric("Median Market Value", format_money(stats['median_value'], decimals=0))
+                        st.dataframe(summary_table(results_df), use_container_width=True, hide_index=True)
+                        for i, property_data in enumerate(rows[:5]):  # Show top 5 results
+                            county_name = format_value(property_data['county_name'])
+                            address = format_value(property_data['address'])
                             with st.expander(f"Property {i+1}: {address} - {county_name}"):
                                 create_enhanced_ohio_property_cards(property_data)
 
@@ -758,29 +924,55 @@ if search_button and parcel_id:
                     st.subheader("📥 Export Options")
                     col1, col2, col3 = st.columns(3)
                     with col1:
-                        pdf_buffer = create_enhanced_ohio_pdf(results[0])
-                        st.download_button(
-                            "📄 Download PDF Report", 
-                            pdf_buffer.getvalue(),
-                            file_name=f"ohio_property_report_{parcel_id.replace(';', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf", 
-                            mime="application/pdf"
-                        )
+                        if len(results) == 1:
+                            pdf_bytes = cached_artifact(
+                                "lookupreadyyyy.pdf", results[0], REPORT_TEMPLATE_VERSION,
+                                lambda: create_enhanced_ohio_pdf(rows[0]).getvalue()
+                            )
+                            st.download_button(
+                                "📄 Download PDF Report", 
+                                pdf_bytes,
+                                file_name=f"ohio_property_report_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf", 
+                                mime="application/pdf"
+                            )
+                        else:
+                            # One PDF per property plus a manifest, rendered only when clicked
+                            st.download_button(
+                                f"📦 Download {len(results)} PDF Reports (ZIP)", 
+                                lambda: records_report_zip(results, lambda property_data: create_enhanced_ohio_pdf(property_data).getvalue()),
+                                file_name=f"ohio_property_reports_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip", 
+                                mime="application/zip"
+                            )
                     with col2:
-                        json_str = json.dumps(results[0] if len(results) == 1 else results, indent=2)
-                        st.download_button(
-                            "📋 Download Property JSON", 
-                            json_str,
-                            file_name=f"ohio_property_data_{parcel_id.replace(';', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", 
-                            mime="application/json"
-                        )
+                        if len(results) == 1:
+                            json_str = cached_json_bytes("json.property", results[0], REPORT_TEMPLATE_VERSION)
+                            st.download_button(
+                                "📋 Download Property JSON", 
+                                json_str,
+                                file_name=f"ohio_property_data_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", 
+                                mime="application/json"
+                            )
+                        else:
+                            # One record per line from a temp file, read only when clicked
+                            spool = spool_results(results)
+                            st.download_button(
+                                f"📋 Download {spool.count} Records (NDJSON)", 
+                                spool.reader,
+                                file_name=f"ohio_property_data_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{spool.extension}", 
+                                mime=spool.mime
+                            )
                     with col3:
                         # Raw API Response JSON
                         if api_response.get('raw_response'):
-                            raw_json_str = json.dumps(api_response['raw_response'], indent=2)
+                            raw_json_str = cached_json_bytes(
+                                "json.raw_response", results, REPORT_TEMPLATE_VERSION,
+                                payload=api_response['raw_response'],
+                                extra=(api_response.get('query_info', ''),)
+                            )
                             st.download_button(
                                 "🔧 Download Raw API Response", 
                                 raw_json_str,
-                                file_name=f"raw_api_response_{parcel_id.replace(';', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", 
+                                file_name=f"raw_api_response_{export_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", 
                                 mime="application/json"
                             )
                     
@@ -794,15 +986,33 @@ if search_button and parcel_id:
                 else:
                     error_msg = api_response.get('message', 'Property not found in Ohio records')
                     st.error(f"❌ {error_msg}")
-                    st.info("💡 Please verify the Parcel ID format and try again. You can search multiple parcel IDs by separating them with semicolons (;).")
+                    if api_response.get('error_code') == "KNOWN_INVALID":
+                        st.info("🚫 The county's parcel list has no such parcel, so no search credit was used. Please check the ID for typos.")
+                    else:
+                        st.info("💡 Please verify the Parcel ID format and try again. You can search multiple parcel IDs by separating them with semicolons (;).")
+
+                    # One-click corrections from parcel IDs already looked up
+                    suggestions = api_response.get('suggestions', [])[:5]
+                    if suggestions:
+                        st.markdown("**Did you mean:**")
+                        suggestion_cols = st.columns(len(suggestions))
+                        for i, suggestion in enumerate(suggestions):
+                            suggestion_cols[i].button(
+                                suggestion.get('label', suggestion['parcel_id']),
+                                key=f"suggestion_{i}",
+                                help=f"{suggestion['county']} - instead of {suggestion['original']}",
+                                on_click=apply_suggestion,
+                                args=(suggestion['query'],)
+                            )
                     
                     # Show raw response even for errors if available
                     if api_response.get('raw_response'):
                         with st.expander("View Raw API Response", expanded=False):
                             st.json(api_response['raw_response'])
                     
-                    # Still increment usage count for failed searches
-                    st.session_state.usage_count += 1
+                    # Still increment usage count for failed searches, unless no API call was made
+                    if api_response.get('search_credit_used', True):
+                        st.session_state.usage_count += 1
                     
             except Exception as e:
                 st.error(f"❌ Unexpected error occurred: {str(e)}")
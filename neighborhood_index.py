@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from columnar_export import parse_date
+from owner_portfolio import to_float
+from parcel_store import get_parcel_store, record_key, register_ingest_hook
+
+# --------------------------
+# Neighborhood Aggregate Configuration
+# --------------------------
+NEIGHBORHOOD_CONFIG = {
+    "PERCENTILES": [10, 25, 50, 75, 90],
+    "RECENT_SALES": 5,
+    "MIN_SALE_PRICE": 1000   # $0 / nominal transfers are not market sales
+}
+
+# Per-parcel values each neighborhood summary is computed from
+VALUE_COLUMNS = ["mkt_val_tot", "mkt_val_land", "mkt_val_bldg", "sale_price"]
+
+class NeighborhoodIndex:
+    """
+    Aggregates per (county_id, ngh_code), stored in the parcel store database.
+    ngh_code is only unique within a county, hence the pair.
+
+    neighborhood_parcels holds the values of every stored parcel and
+    neighborhood_summary one precomputed row per neighborhood. Ingest
+    recomputes only the neighborhoods the new records touch, so a parcel view
+    reads one summary row instead of scanning the neighborhood.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        conn = store._connect()
+        with conn:
+            conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS neighborhood_parcels (
+                    record_key TEXT PRIMARY KEY,
+                    county_id INTEGER NOT NULL,
+                    ngh_code TEXT NOT NULL,
+                    land_use_class TEXT,
+                    {", ".join(f"{column} REAL" for column in VALUE_COLUMNS)},
+                    trans_date TEXT,
+                    parcel_id TEXT,
+                    address TEXT
+                );
+                CREATE INDEX IF NOT EXISTS neighborhood_parcels_value
+                    ON neighborhood_parcels (county_id, ngh_code, mkt_val_tot);
+                CREATE TABLE IF NOT EXISTS neighborhood_summary (
+                    county_id INTEGER NOT NULL,
+                    ngh_code TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (county_id, ngh_code)
+                );
+            """)
+        # Parcels stored before the index existed
+        if conn.execute("SELECT COUNT(*) FROM neighborhood_parcels").fetchone()[0] == 0:
+            rows = conn.execute("SELECT record FROM parcels").fetchall()
+            self.ingest([json.loads(row[0]) for row in rows])
+
+    def ingest(self, records):
+        """Ingest hook: file records under their neighborhood and refresh those summaries"""
+        rows = []
+        touched = set()
+        for record in records:
+            ngh_code = str(record.get('ngh_code') or "").strip()
+            county_id = record.get('county_id')
+            if not ngh_code or county_id is None:
+                continue
+            neighborhood = (int(county_id), ngh_code)
+            touched.add(neighborhood)
+            rows.append((
+                record_key(record),
+                *neighborhood,
+                record.get('land_use_class'),
+                *(to_float(record.get(column)) for column in VALUE_COLUMNS),
+                record.get('trans_date'),
+                record.get('parcel_id'),
+                record.get('address')
+            ))
+        if not rows:
+            return 0
+        conn = self.store._connect()
+        with conn:
+            # A parcel whose neighborhood changed must also refresh its old one
+            placeholders = ", ".join("?" * len(rows))
+            touched.update(conn.execute(
+                f"SELECT county_id, ngh_code FROM neighborhood_parcels WHERE record_key IN ({placeholders})",
+                [row[0] for row in rows]
+            ).fetchall())
+            conn.executemany(
+                f"INSERT OR REPLACE INTO neighborhood_parcels VALUES ({', '.join('?' * len(rows[0]))})", rows
+            )
+            for county_id, ngh_code in touched:
+                self._refresh(conn, county_id, ngh_code)
+        return len(rows)
+
+    def _refresh(self, conn, county_id, ngh_code):
+        rows = conn.execute(f"""
+            SELECT {", ".join(VALUE_COLUMNS)}, land_use_class, trans_date, parcel_id, address
+            FROM neighborhood_parcels WHERE county_id = ? AND ngh_code = ?
+        """, (county_id, ngh_code)).fetchall()
+        if not rows:
+            conn.execute("DELETE FROM neighborhood_summary WHERE county_id = ? AND ngh_code = ?", (county_id, ngh_code))
+            return
+        values = np.array([row[:len(VALUE_COLUMNS)] for row in rows], dtype=float)
+        percentiles = NEIGHBORHOOD_CONFIG["PERCENTILES"]
+        summary = {"parcel_count": len(rows), "percentiles": percentiles}
+        for index, column in enumerate(VALUE_COLUMNS):
+            column_values = values[:, index]
+            if column == "sale_price":
+                column_values = column_values[column_values >= NEIGHBORHOOD_CONFIG["MIN_SALE_PRICE"]]
+            else:
+                column_values = column_values[column_values > 0]
+            summary[column] = {
+                "count": int(column_values.size),
+                "mean": round(float(column_values.mean()), 2) if column_values.size else None,
+                "values": [round(float(value), 2) for value in np.percentile(column_values, percentiles)]
+                          if column_values.size else []
+            }
+        # Newest first by the parsed date: county date strings do not sort as text
+        sales = []
+        for row in rows:
+            sale_date = parse_date(row[-3])
+            if row[3] >= NEIGHBORHOOD_CONFIG["MIN_SALE_PRICE"] and sale_date:
+                sales.append((sale_date, {"parcel_id": row[-2], "address": row[-1], "trans_date": sale_date.isoformat(), "sale_price": row[3]}))
+        sales.sort(key=lambda sale: sale[0], reverse=True)
+        summary["recent_sales"] = [sale for _, sale in sales[:NEIGHBORHOOD_CONFIG["RECENT_SALES"]]]
+        summary["land_use_classes"] = dict(Counter(row[len(VALUE_COLUMNS)] or "Unknown" for row in rows).most_common())
+        conn.execute(
+            "INSERT OR REPLACE INTO neighborhood_summary VALUES (?, ?, ?, ?)",
+            (county_id, ngh_code, json.dumps(summary), time.time())
+        )
+
+    def summary(self, county_id, ngh_code):
+        """Precomputed summary for one neighborhood, or None"""
+        row = self.store._connect().execute(
+            "SELECT summary FROM neighborhood_summary WHERE county_id = ? AND ngh_code = ?",
+            (int(county_id), str(ngh_code).strip())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def compare(self, record):
+        """
+        How record's market value sits in its neighborhood: summary, median,
+        difference from the median and percentile rank. None when the
+        neighborhood is unknown; market_value, vs_median and percentile_rank
+        are None when the record has no market value.
+        """
+        if record.get('county_id') is None or not record.get('ngh_code'):
+            return None
+        county_id = int(record['county_id'])
+        ngh_code = str(record['ngh_code']).strip()
+        summary = self.summary(county_id, ngh_code)
+        if summary is None:
+            return None
+        median = None
+        if summary["mkt_val_tot"]["values"]:
+            median = summary["mkt_val_tot"]["values"][summary["percentiles"].index(50)]
+        # A missing (or NaN / zero) value is unknown, not $0: it is not compared
+        market_value = to_float(record.get('mkt_val_tot'))
+        below = total = None
+        if market_value > 0:
+            below, total = self.store._connect().execute("""
+                SELECT SUM(mkt_val_tot < ?), COUNT(*) FROM neighborhood_parcels
+                WHERE county_id = ? AND ngh_code = ? AND mkt_val_tot > 0
+            """, (market_value, county_id, ngh_code)).fetchone()
+        else:
+            market_value = None
+        return {
+            "county_id": county_id,
+            "ngh_code": ngh_code,
+            "summary": summary,
+            "market_value": market_value,
+            "median_market_value": median,
+            "vs_median": (market_value - median) / median if median and market_value is not None else None,
+            "percentile_rank": round(100.0 * (below or 0) / total, 1) if total else None
+        }
+
+_neighborhood_index = None
+_neighborhood_index_lock = threading.Lock()
+
+def get_neighborhood_index():
+    """
+    Return the process-wide neighborhood index, registering its ingest hook on first use
+    """
+    global _neighborhood_index
+    if _neighborhood_index is None:
+        with _neighborhood_index_lock:
+            if _neighborhood_index is None:
+                _neighborhood_index = NeighborhoodIndex(get_parcel_store())
+                register_ingest_hook(_neighborhood_index.ingest)
+    return _neighborhood_index
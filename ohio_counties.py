@@ -0,0 +1,189 @@
+from collections import OrderedDict
+
+# --------------------------
+# Ohio County Registry (All 88 Counties)
+# --------------------------
+# Loaded once per process; every app reads counties from the indexes below
+# instead of keeping its own table. 'code' is the alphabetical state code used
+# throughout the apps, 'county_id' the FIPS code ReportAllUSA returns (39035).
+OHIO_COUNTY_RECORDS = [
+    {'code': '01', 'name': 'Adams County', 'seat': 'West Union', 'population': 27671, 'area_sq_mi': 583.91, 'founded': 1797},
+    {'code': '02', 'name': 'Allen County', 'seat': 'Lima', 'population': 100866, 'area_sq_mi': 404.43, 'founded': 1820},
+    {'code': '03', 'name': 'Ashland County', 'seat': 'Ashland', 'population': 52420, 'area_sq_mi': 424.37, 'founded': 1846},
+    {'code': '04', 'name': 'Ashtabula County', 'seat': 'Jefferson', 'population': 96906, 'area_sq_mi': 702.44, 'founded': 1807},
+    {'code': '05', 'name': 'Athens County', 'seat': 'Athens', 'population': 63218, 'area_sq_mi': 506.76, 'founded': 1805},
+    {'code': '06', 'name': 'Auglaize County', 'seat': 'Wapakoneta', 'population': 45922, 'area_sq_mi': 401.25, 'founded': 1848},
+    {'code': '07', 'name': 'Belmont County', 'seat': 'St. Clairsville', 'population': 64692, 'area_sq_mi': 537.35, 'founded': 1801},
+    {'code': '08', 'name': 'Brown County', 'seat': 'Georgetown', 'population': 44292, 'area_sq_mi': 491.76, 'founded': 1818},
+    {'code': '09', 'name': 'Butler County', 'seat': 'Hamilton', 'population': 399542, 'area_sq_mi': 467.27, 'founded': 1803},
+    {'code': '10', 'name': 'Carroll County', 'seat': 'Carrollton', 'population': 26460, 'area_sq_mi': 394.67, 'founded': 1833},
+    {'code': '11', 'name': 'Champaign County', 'seat': 'Urbana', 'population': 38907, 'area_sq_mi': 428.56, 'founded': 1805},
+    {'code': '12', 'name': 'Clark County', 'seat': 'Springfield', 'population': 134985, 'area_sq_mi': 399.86, 'founded': 1818},
+    {'code': '13', 'name': 'Clermont County', 'seat': 'Batavia', 'population': 214123, 'area_sq_mi': 451.99, 'founded': 1800},
+    {'code': '14', 'name': 'Clinton County', 'seat': 'Wilmington', 'population': 42019, 'area_sq_mi': 410.88, 'founded': 1810},
+    {'code': '15', 'name': 'Columbiana County', 'seat': 'Lisbon', 'population': 99823, 'area_sq_mi': 532.46, 'founded': 1803},
+    {'code': '16', 'name': 'Coshocton County', 'seat': 'Coshocton', 'population': 37003, 'area_sq_mi': 564.07, 'founded': 1810},
+    {'code': '17', 'name': 'Crawford County', 'seat': 'Bucyrus', 'population': 41626, 'area_sq_mi': 402.11, 'founded': 1820},
+    {'code': '18', 'name': 'Cuyahoga County', 'seat': 'Cleveland', 'population': 1240594, 'area_sq_mi': 458.49, 'founded': 1807},
+    {'code': '19', 'name': 'Darke County', 'seat': 'Greenville', 'population': 51462, 'area_sq_mi': 599.80, 'founded': 1809},
+    {'code': '20', 'name': 'Defiance County', 'seat': 'Defiance', 'population': 38644, 'area_sq_mi': 411.16, 'founded': 1845},
+    {'code': '21', 'name': 'Delaware County', 'seat': 'Delaware', 'population': 237966, 'area_sq_mi': 442.41, 'founded': 1808},
+    {'code': '22', 'name': 'Erie County', 'seat': 'Sandusky', 'population': 73841, 'area_sq_mi': 254.88, 'founded': 1838},
+    {'code': '23', 'name': 'Fairfield County', 'seat': 'Lancaster', 'population': 167762, 'area_sq_mi': 505.11, 'founded': 1800},
+    {'code': '24', 'name': 'Fayette County', 'seat': 'Washington Court House', 'population': 28782, 'area_sq_mi': 406.58, 'founded': 1810},
+    {'code': '25', 'name': 'Franklin County', 'seat': 'Columbus', 'population': 1356303, 'area_sq_mi': 539.87, 'founded': 1803},
+    {'code': '26', 'name': 'Fulton County', 'seat': 'Wauseon', 'population': 42028, 'area_sq_mi': 406.78, 'founded': 1850},
+    {'code': '27', 'name': 'Gallia County', 'seat': 'Gallipolis', 'population': 28886, 'area_sq_mi': 468.78, 'founded': 1803},
+    {'code': '28', 'name': 'Geauga County', 'seat': 'Chardon', 'population': 95362, 'area_sq_mi': 403.66, 'founded': 1806},
+    {'code': '29', 'name': 'Greene County', 'seat': 'Xenia', 'population': 172347, 'area_sq_mi': 414.88, 'founded': 1803},
+    {'code': '30', 'name': 'Guernsey County', 'seat': 'Cambridge', 'population': 38438, 'area_sq_mi': 522.49, 'founded': 1810},
+    {'code': '31', 'name': 'Hamilton County', 'seat': 'Cincinnati', 'population': 830639, 'area_sq_mi': 407.36, 'founded': 1790},
+    {'code': '32', 'name': 'Hancock County', 'seat': 'Findlay', 'population': 75783, 'area_sq_mi': 531.31, 'founded': 1820},
+    {'code': '33', 'name': 'Hardin County', 'seat': 'Kenton', 'population': 30696, 'area_sq_mi': 470.55, 'founded': 1820},
+    {'code': '34', 'name': 'Harrison County', 'seat': 'Cadiz', 'population': 14483, 'area_sq_mi': 403.88, 'founded': 1813},
+    {'code': '35', 'name': 'Henry County', 'seat': 'Napoleon', 'population': 26883, 'area_sq_mi': 416.85, 'founded': 1820},
+    {'code': '36', 'name': 'Highland County', 'seat': 'Hillsboro', 'population': 42713, 'area_sq_mi': 553.05, 'founded': 1805},
+    {'code': '37', 'name': 'Hocking County', 'seat': 'Logan', 'population': 28050, 'area_sq_mi': 423.27, 'founded': 1818},
+    {'code': '38', 'name': 'Holmes County', 'seat': 'Millersburg', 'population': 44223, 'area_sq_mi': 423.06, 'founded': 1824},
+    {'code': '39', 'name': 'Huron County', 'seat': 'Norwalk', 'population': 58565, 'area_sq_mi': 493.07, 'founded': 1815},
+    {'code': '40', 'name': 'Jackson County', 'seat': 'Jackson', 'population': 32653, 'area_sq_mi': 420.38, 'founded': 1816},
+    {'code': '41', 'name': 'Jefferson County', 'seat': 'Steubenville', 'population': 65441, 'area_sq_mi': 409.78, 'founded': 1797},
+    {'code': '42', 'name': 'Knox County', 'seat': 'Mount Vernon', 'population': 62721, 'area_sq_mi': 527.64, 'founded': 1808},
+    {'code': '43', 'name': 'Lake County', 'seat': 'Painesville', 'population': 230149, 'area_sq_mi': 228.21, 'founded': 1840},
+    {'code': '44', 'name': 'Lawrence County', 'seat': 'Ironton', 'population': 58240, 'area_sq_mi': 455.18, 'founded': 1815},
+    {'code': '45', 'name': 'Licking County', 'seat': 'Newark', 'population': 178519, 'area_sq_mi': 686.24, 'founded': 1808},
+    {'code': '46', 'name': 'Logan County', 'seat': 'Bellefontaine', 'population': 45657, 'area_sq_mi': 458.48, 'founded': 1817},
+    {'code': '47', 'name': 'Lorain County', 'seat': 'Elyria', 'population': 312964, 'area_sq_mi': 492.89, 'founded': 1822},
+    {'code': '48', 'name': 'Lucas County', 'seat': 'Toledo', 'population': 431279, 'area_sq_mi': 340.93, 'founded': 1835},
+    {'code': '49', 'name': 'Madison County', 'seat': 'London', 'population': 48845, 'area_sq_mi': 465.82, 'founded': 1810},
+    {'code': '50', 'name': 'Mahoning County', 'seat': 'Youngstown', 'population': 228614, 'area_sq_mi': 415.27, 'founded': 1846},
+    {'code': '51', 'name': 'Marion County', 'seat': 'Marion', 'population': 65359, 'area_sq_mi': 403.78, 'founded': 1824},
+    {'code': '52', 'name': 'Medina County', 'seat': 'Medina', 'population': 182470, 'area_sq_mi': 421.28, 'founded': 1812},
+    {'code': '53', 'name': 'Meigs County', 'seat': 'Pomeroy', 'population': 22210, 'area_sq_mi': 429.75, 'founded': 1819},
+    {'code': '54', 'name': 'Mercer County', 'seat': 'Celina', 'population': 41882, 'area_sq_mi': 463.20, 'founded': 1820},
+    {'code': '55', 'name': 'Miami County', 'seat': 'Troy', 'population': 109561, 'area_sq_mi': 407.84, 'founded': 1807},
+    {'code': '56', 'name': 'Monroe County', 'seat': 'Woodsfield', 'population': 13385, 'area_sq_mi': 456.28, 'founded': 1813},
+    {'code': '57', 'name': 'Montgomery County', 'seat': 'Dayton', 'population': 537309, 'area_sq_mi': 461.68, 'founded': 1803},
+    {'code': '58', 'name': 'Morgan County', 'seat': 'McConnelsville', 'population': 13832, 'area_sq_mi': 418.59, 'founded': 1817},
+    {'code': '59', 'name': 'Morrow County', 'seat': 'Mount Gilead', 'population': 35318, 'area_sq_mi': 406.06, 'founded': 1848},
+    {'code': '60', 'name': 'Muskingum County', 'seat': 'Zanesville', 'population': 86441, 'area_sq_mi': 664.29, 'founded': 1804},
+    {'code': '61', 'name': 'Noble County', 'seat': 'Caldwell', 'population': 14115, 'area_sq_mi': 398.87, 'founded': 1851},
+    {'code': '62', 'name': 'Ottawa County', 'seat': 'Port Clinton', 'population': 40364, 'area_sq_mi': 255.45, 'founded': 1840},
+    {'code': '63', 'name': 'Paulding County', 'seat': 'Paulding', 'population': 18807, 'area_sq_mi': 418.83, 'founded': 1820},
+    {'code': '64', 'name': 'Perry County', 'seat': 'New Lexington', 'population': 35408, 'area_sq_mi': 409.92, 'founded': 1817},
+    {'code': '65', 'name': 'Pickaway County', 'seat': 'Circleville', 'population': 60539, 'area_sq_mi': 501.79, 'founded': 1810},
+    {'code': '66', 'name': 'Pike County', 'seat': 'Waverly', 'population': 27088, 'area_sq_mi': 441.29, 'founded': 1815},
+    {'code': '67', 'name': 'Portage County', 'seat': 'Ravenna', 'population': 161791, 'area_sq_mi': 492.33, 'founded': 1807},
+    {'code': '68', 'name': 'Preble County', 'seat': 'Eaton', 'population': 40999, 'area_sq_mi': 425.33, 'founded': 1808},
+    {'code': '69', 'name': 'Putnam County', 'seat': 'Ottawa', 'population': 34499, 'area_sq_mi': 484.11, 'founded': 1820},
+    {'code': '70', 'name': 'Richland County', 'seat': 'Mansfield', 'population': 124936, 'area_sq_mi': 497.04, 'founded': 1813},
+    {'code': '71', 'name': 'Ross County', 'seat': 'Chillicothe', 'population': 77093, 'area_sq_mi': 689.49, 'founded': 1798},
+    {'code': '72', 'name': 'Sandusky County', 'seat': 'Fremont', 'population': 58896, 'area_sq_mi': 409.45, 'founded': 1820},
+    {'code': '73', 'name': 'Scioto County', 'seat': 'Portsmouth', 'population': 74008, 'area_sq_mi': 612.99, 'founded': 1803},
+    {'code': '74', 'name': 'Seneca County', 'seat': 'Tiffin', 'population': 55069, 'area_sq_mi': 551.52, 'founded': 1820},
+    {'code': '75', 'name': 'Shelby County', 'seat': 'Sidney', 'population': 48230, 'area_sq_mi': 409.28, 'founded': 1819},
+    {'code': '76', 'name': 'Stark County', 'seat': 'Canton', 'population': 374853, 'area_sq_mi': 575.99, 'founded': 1808},
+    {'code': '77', 'name': 'Summit County', 'seat': 'Akron', 'population': 540428, 'area_sq_mi': 412.97, 'founded': 1840},
+    {'code': '78', 'name': 'Trumbull County', 'seat': 'Warren', 'population': 201977, 'area_sq_mi': 618.78, 'founded': 1800},
+    {'code': '79', 'name': 'Tuscarawas County', 'seat': 'New Philadelphia', 'population': 92865, 'area_sq_mi': 568.92, 'founded': 1808},
+    {'code': '80', 'name': 'Union County', 'seat': 'Marysville', 'population': 62784, 'area_sq_mi': 437.28, 'founded': 1820},
+    {'code': '81', 'name': 'Van Wert County', 'seat': 'Van Wert', 'population': 28931, 'area_sq_mi': 409.61, 'founded': 1820},
+    {'code': '82', 'name': 'Vinton County', 'seat': 'McArthur', 'population': 12545, 'area_sq_mi': 414.32, 'founded': 1850},
+    {'code': '83', 'name': 'Warren County', 'seat': 'Lebanon', 'population': 242337, 'area_sq_mi': 406.86, 'founded': 1803},
+    {'code': '84', 'name': 'Washington County', 'seat': 'Marietta', 'population': 59711, 'area_sq_mi': 635.28, 'founded': 1788},
+    {'code': '85', 'name': 'Wayne County', 'seat': 'Wooster', 'population': 116903, 'area_sq_mi': 555.29, 'founded': 1808},
+    {'code': '86', 'name': 'Williams County', 'seat': 'Bryan', 'population': 36641, 'area_sq_mi': 421.68, 'founded': 1820},
+    {'code': '87', 'name': 'Wood County', 'seat': 'Bowling Green', 'population': 132248, 'area_sq_mi': 617.49, 'founded': 1820},
+    {'code': '88', 'name': 'Wyandot County', 'seat': 'Upper Sandusky', 'population': 21900, 'area_sq_mi': 406.92, 'founded': 1845}
+]
+
+# Counties listed under each region in the sidebar breakdown
+OHIO_REGION_CODES = OrderedDict([
+    ("Northeast Ohio", ['18', '28', '43', '47', '50', '67', '76', '77', '78']),
+    ("Central Ohio", ['21', '23', '25', '45', '49', '65', '80']),
+    ("Southwest Ohio", ['09', '13', '31', '68', '83']),
+    ("Southeast Ohio", ['05', '07', '27', '30', '40', '44', '56', '58', '60', '61', '71', '73', '84']),
+    ("Northwest Ohio", ['02', '20', '22', '26', '32', '35', '39', '48', '62', '69', '72', '74', '86', '87'])
+])
+
+def county_key(value):
+    """
+    Lookup key for a county or seat name: 'Cuyahoga County', 'cuyahoga' and
+    ' CUYAHOGA ' all map to 'CUYAHOGA'
+    """
+    key = " ".join(str(value).split()).upper()
+    if key.endswith(" COUNTY"):
+        key = key[:-len(" COUNTY")]
+    return key
+
+def county_short_name(county):
+    """'Franklin County' -> 'Franklin'"""
+    return county['name'][:-len(" County")] if county['name'].endswith(" County") else county['name']
+
+def build_county_indexes(records, region_codes):
+    """
+    Build the lookup indexes and the aggregates the sidebar shows
+    """
+    region_of = {}
+    for region, codes in region_codes.items():
+        for code in codes:
+            region_of[code] = region
+
+    by_code = OrderedDict()
+    by_name = {}
+    by_seat = {}
+    by_fips = {}
+    for record in records:
+        county = dict(record)
+        county['county_id'] = 39000 + 2 * int(county['code']) - 1
+        county['region'] = region_of.get(county['code'])
+        by_code[county['code']] = county
+        by_name[county_key(county['name'])] = county
+        by_seat.setdefault(county_key(county['seat']), county)
+        by_fips[county['county_id']] = county
+
+    by_region = OrderedDict(
+        (region, tuple(by_code[code] for code in codes))
+        for region, codes in region_codes.items()
+    )
+
+    counties = list(by_code.values())
+    totals = {
+        'count': len(counties),
+        'population': sum(county['population'] for county in counties),
+        'area_sq_mi': sum(county['area_sq_mi'] for county in counties),
+        'largest': max(counties, key=lambda county: county['area_sq_mi']),
+        'most_populous': max(counties, key=lambda county: county['population'])
+    }
+    return by_code, by_name, by_seat, by_fips, by_region, totals
+
+(
+    COUNTIES_BY_CODE,
+    COUNTIES_BY_NAME,
+    COUNTIES_BY_SEAT,
+    COUNTIES_BY_FIPS,
+    COUNTIES_BY_REGION,
+    OHIO_TOTALS
+) = build_county_indexes(OHIO_COUNTY_RECORDS, OHIO_REGION_CODES)
+
+COUNTY_NAMES = [county['name'] for county in COUNTIES_BY_CODE.values()]
+
+def get_county(value):
+    """
+    Find a county by state code ('18'), FIPS county_id (39035 or '39035') or
+    name ('Cuyahoga County' / 'cuyahoga'); None if nothing matches
+    """
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return COUNTIES_BY_FIPS.get(value)
+    text = str(value).strip()
+    if text.isdigit():
+        if len(text) == 5:
+            return COUNTIES_BY_FIPS.get(int(text))
+        return COUNTIES_BY_CODE.get(text.zfill(2))
+    return COUNTIES_BY_NAME.get(county_key(text))
+
+def get_county_by_seat(seat):
+    """County whose seat is the given city, or None"""
+    return COUNTIES_BY_SEAT.get(county_key(seat))
@@ -0,0 +1,172 @@
+import json
+import re
+import threading
+from functools import lru_cache
+
+from fuzzy_index import normalize_address
+from parcel_store import get_parcel_store, record_key, register_ingest_hook
+
+# --------------------------
+# Owner Name Normalization
+# --------------------------
+# Entity and trust designators that differ between filings of the same owner
+# ("ACME HOLDINGS LLC" / "ACME HOLDINGS L.L.C." / "ACME HOLDINGS")
+OWNER_SUFFIXES = {
+    "LLC", "LC", "INC", "INCORPORATED", "CORP", "CORPORATION", "CO", "COMPANY",
+    "LTD", "LIMITED", "LP", "LLP", "PLLC", "PC", "PA",
+    "TR", "TRS", "TRUST", "TRUSTEE", "TRUSTEES", "TRSTE", "REV", "REVOCABLE", "LIV", "LIVING",
+    "ETAL", "ETUX", "ETVIR", "THE"
+}
+
+# Split spellings ("L L C", "ET AL") collapsed before suffix stripping
+SPACED_SUFFIXES = re.compile(r"\b(L)\s+(L)\s+(C)\b|\b(L)\s+(P)\b|\b(ET)\s+(AL|UX|VIR)\b")
+OWNER_WORD_PATTERN = re.compile(r"[0-9A-Z]+")
+ZIP_PATTERN = re.compile(r"\b(\d{5})(?:-?\d{4})?\b")
+
+@lru_cache(maxsize=65536)
+def normalize_owner_name(owner):
+    """
+    Owner name reduced for grouping: upper-case, punctuation and entity/trust
+    suffixes removed. Falls back to the plain words if only suffixes remain.
+    """
+    text = str(owner or "").upper().replace(".", "").replace("&", " AND ")
+    text = SPACED_SUFFIXES.sub(lambda match: "".join(group for group in match.groups() if group), text)
+    words = OWNER_WORD_PATTERN.findall(text)
+    kept = [word for word in words if word not in OWNER_SUFFIXES]
+    return " ".join(kept or words)
+
+def mailing_key(record):
+    """
+    Mailing address used to separate same-named owners: USPS-normalized line 1 plus ZIP
+    """
+    street = normalize_address(record.get('mail_address1') or "")
+    zip_match = ZIP_PATTERN.search(str(record.get('mail_zipcode') or record.get('mail_address3') or ""))
+    return f"{street} {zip_match.group(1)}".strip() if zip_match else street
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+# --------------------------
+# Portfolio Index
+# --------------------------
+class OwnerPortfolioIndex:
+    """
+    One row per stored parcel with its normalized owner and mailing keys,
+    in the parcel store database. Portfolio lookups and totals are indexed
+    GROUP BY queries, so no API call or full scan is needed.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        conn = store._connect()
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS owner_portfolio (
+                    record_key TEXT PRIMARY KEY,
+                    owner_key TEXT NOT NULL,
+                    mail_key TEXT NOT NULL,
+                    mkt_val_tot REAL NOT NULL DEFAULT 0,
+                    acreage REAL NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS owner_portfolio_owner ON owner_portfolio (owner_key, mail_key);
+            """)
+        # Parcels stored before the index existed
+        if conn.execute("SELECT COUNT(*) FROM owner_portfolio").fetchone()[0] == 0:
+            rows = conn.execute("SELECT record FROM parcels").fetchall()
+            self.ingest([json.loads(row[0]) for row in rows])
+
+    def ingest(self, records):
+        """Ingest hook: (re)file records under their owner portfolio"""
+        rows = []
+        for record in records:
+            owner_key = normalize_owner_name(record.get('owner'))
+            if not owner_key:
+                continue
+            rows.append((
+                record_key(record),
+                owner_key,
+                mailing_key(record),
+                to_float(record.get('mkt_val_tot')),
+                to_float(record.get('acreage') or record.get('acreage_calc'))
+            ))
+        conn = self.store._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO owner_portfolio VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def clusters_for_owner(self, owner):
+        """
+        Every (mailing address) cluster held under owner's normalized name with
+        parcel count and totals, largest first
+        """
+        rows = self.store._connect().execute("""
+            SELECT owner_key, mail_key, COUNT(*), SUM(mkt_val_tot), SUM(acreage)
+            FROM owner_portfolio WHERE owner_key = ?
+            GROUP BY mail_key ORDER BY COUNT(*) DESC, SUM(mkt_val_tot) DESC
+        """, (normalize_owner_name(owner),)).fetchall()
+        return [{
+            "owner_key": owner_key,
+            "mail_key": mail_key,
+            "parcel_count": count,
+            "total_market_value": total_value or 0.0,
+            "total_acreage": round(total_acreage or 0.0, 4)
+        } for owner_key, mail_key, count, total_value, total_acreage in rows]
+
+    def portfolio(self, owner_key, mail_key=None, limit=200):
+        """
+        Stored records in one portfolio (owner + mailing address, or every
+        mailing address when mail_key is None), highest value first
+        """
+        sql = (
+            "SELECT parcels.record FROM owner_portfolio "
+            "JOIN parcels ON parcels.record_key = owner_portfolio.record_key "
+            "WHERE owner_portfolio.owner_key = ?"
+        )
+        params = [owner_key]
+        if mail_key is not None:
+            sql += " AND owner_portfolio.mail_key = ?"
+            params.append(mail_key)
+        sql += " ORDER BY owner_portfolio.mkt_val_tot DESC LIMIT ?"
+        params.append(limit)
+        return [json.loads(row[0]) for row in self.store._connect().execute(sql, params).fetchall()]
+
+    def portfolio_for_record(self, record, limit=200):
+        """
+        The portfolio record belongs to (same normalized owner and mailing
+        address): totals plus member records, or None if the owner is blank
+        """
+        owner_key = normalize_owner_name(record.get('owner'))
+        if not owner_key:
+            return None
+        mail_key = mailing_key(record)
+        count, total_value, total_acreage = self.store._connect().execute("""
+            SELECT COUNT(*), SUM(mkt_val_tot), SUM(acreage)
+            FROM owner_portfolio WHERE owner_key = ? AND mail_key = ?
+        """, (owner_key, mail_key)).fetchone()
+        return {
+            "owner_key": owner_key,
+            "mail_key": mail_key,
+            "parcel_count": count,
+            "total_market_value": total_value or 0.0,
+            "total_acreage": round(total_acreage or 0.0, 4),
+            "other_clusters": max(len(self.clusters_for_owner(record.get('owner'))) - 1, 0),
+            "records": self.portfolio(owner_key, mail_key, limit)
+        }
+
+_portfolio_index = None
+_portfolio_index_lock = threading.Lock()
+
+def get_portfolio_index():
+    """
+    Return the process-wide owner portfolio index, registering its ingest hook on first use
+    """
+    global _portfolio_index
+    if _portfolio_index is None:
+        with _portfolio_index_lock:
+            if _portfolio_index is None:
+                _portfolio_index = OwnerPortfolioIndex(get_parcel_store())
+                register_ingest_hook(_portfolio_index.ingest)
+    return _portfolio_index
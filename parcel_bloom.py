@@ -0,0 +1,229 @@
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from ohio_counties import get_county
+from parcel_cache import CACHE_CONFIG
+from parcel_formats import normalize_parcel_id
+
+# --------------------------
+# Parcel-ID Bloom Filter Configuration
+# --------------------------
+# Optional per-county filters of known-valid parcel IDs, one file per county
+# ('<code>.bloom') in DIR. Only filters built from a complete county ID list
+# are authoritative and may reject an ID; a filter built from the local store
+# only knows parcels fetched so far and never rejects.
+#     python parcel_bloom.py build "Cuyahoga County" cuyahoga_parcel_ids.txt
+#     python parcel_bloom.py build-from-store "Cuyahoga County"
+BLOOM_CONFIG = {
+    "DIR": os.environ.get("TAXLOOK_BLOOM_DIR", os.path.join(CACHE_CONFIG["DIR"], "bloom")),
+    "FALSE_POSITIVE_RATE": 0.01,   # ~9.6 bits per ID: about 7 MB for every parcel in Ohio
+    "RELOAD_CHECK_SECONDS": 5      # How often the directory is checked for rebuilt filters
+}
+
+MAGIC = b"TXBLOOM1"
+MASK64 = (1 << 64) - 1
+
+def bloom_key(parcel_id, county_name):
+    """Canonical form of parcel_id as stored in county_name's filter"""
+    return normalize_parcel_id(parcel_id, county_name).canonical
+
+def hash_pair(key):
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter using double hashing over one blake2b digest.
+    No false negatives: if an ID was added, it is always reported present.
+    """
+
+    def __init__(self, bit_count, hash_count, bits=None, count=0, county=None, authoritative=False, source=""):
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+        self.count = count
+        self.county = county
+        self.authoritative = authoritative
+        self.source = source
+
+    @classmethod
+    def for_capacity(cls, capacity, false_positive_rate=None, **kwargs):
+        rate = false_positive_rate or BLOOM_CONFIG["FALSE_POSITIVE_RATE"]
+        capacity = max(capacity, 1)
+        bit_count = max(int(math.ceil(-capacity * math.log(rate) / math.log(2) ** 2)), 64)
+        hash_count = max(int(round(bit_count / capacity * math.log(2))), 1)
+        return cls(bit_count, hash_count, **kwargs)
+
+    def _positions(self, key):
+        h1, h2 = hash_pair(key)
+        # Wrap at 64 bits to match the uint64 arithmetic in add_many()
+        return [((h1 + i * h2) & MASK64) % self.bit_count for i in range(self.hash_count)]
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def add_many(self, keys):
+        """Add keys in one vectorized pass; returns how many were added"""
+        pairs = np.array([hash_pair(key) for key in keys], dtype=np.uint64).reshape(-1, 2)
+        if not len(pairs):
+            return 0
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        positions = (pairs[:, :1] + steps * pairs[:, 1:]) % np.uint64(self.bit_count)
+        flags = np.unpackbits(np.frombuffer(bytes(self.bits), dtype=np.uint8), bitorder="little")
+        flags[positions.ravel().astype(np.int64)] = 1
+        self.bits = bytearray(np.packbits(flags, bitorder="little").tobytes())
+        self.count += len(pairs)
+        return len(pairs)
+
+    def save(self, path):
+        header = json.dumps({
+            "bit_count": self.bit_count, "hash_count": self.hash_count, "count": self.count,
+            "county": self.county, "authoritative": self.authoritative, "source": self.source,
+            "built_at": time.time()
+        }).encode("utf-8")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(MAGIC)
+            handle.write(len(header).to_bytes(4, "little"))
+            handle.write(header)
+            handle.write(self.bits)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a parcel Bloom filter")
+            header = json.loads(handle.read(int.from_bytes(handle.read(4), "little")))
+            bits = bytearray(handle.read())
+        return cls(
+            header["bit_count"], header["hash_count"], bits, header["count"],
+            header.get("county"), header.get("authoritative", False), header.get("source", "")
+        )
+
+def bloom_path(county_name):
+    county = get_county(county_name)
+    if county is None:
+        raise ValueError(f"Unknown Ohio county: {county_name}")
+    return os.path.join(BLOOM_CONFIG["DIR"], f"{county['code']}.bloom")
+
+def build_bloom_filter(county_name, parcel_ids, authoritative=True, source=""):
+    """
+    Build and save county_name's filter from an iterable of parcel IDs; returns the filter
+    """
+    county = get_county(county_name)
+    keys = {bloom_key(parcel_id, county['name']) for parcel_id in parcel_ids if str(parcel_id).strip()}
+    bloom = BloomFilter.for_capacity(len(keys), county=county['name'], authoritative=authoritative, source=source)
+    bloom.add_many(keys)
+    bloom.save(bloom_path(county['name']))
+    return bloom
+
+def build_bloom_filter_from_store(county_name, authoritative=False):
+    """
+    Build county_name's filter from the parcels in the local store. Not
+    authoritative unless the store holds the county's complete parcel roll.
+    """
+    from parcel_store import get_parcel_store
+    county = get_county(county_name)
+    rows = get_parcel_store()._connect().execute(
+        "SELECT parcel_id FROM parcels WHERE county_id = ? AND parcel_id IS NOT NULL", (county['county_id'],)
+    ).fetchall()
+    return build_bloom_filter(county['name'], (row[0] for row in rows), authoritative, source="local store")
+
+# --------------------------
+# Reloadable Filter Set
+# --------------------------
+class BloomFilterSet:
+    """
+    Every filter file in the directory, keyed by county name. Files that are
+    added, rebuilt or removed are picked up on the next check, no restart needed.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.filters = {}
+        self._loaded = {}   # file name -> (mtime_ns, BloomFilter)
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Reload changed files; checks the directory at most every RELOAD_CHECK_SECONDS"""
+        now = time.time()
+        if not force and now - self._checked_at < BLOOM_CONFIG["RELOAD_CHECK_SECONDS"]:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                names = [name for name in os.listdir(self.directory) if name.endswith(".bloom")]
+            except FileNotFoundError:
+                names = []
+            loaded = {}
+            for name in names:
+                path = os.path.join(self.directory, name)
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                    previous = self._loaded.get(name)
+                    loaded[name] = previous if previous and previous[0] == mtime else (mtime, BloomFilter.load(path))
+                except (OSError, ValueError):
+                    continue
+            self._loaded = loaded
+            self.filters = {bloom.county: bloom for _, bloom in loaded.values()}
+
+    def get(self, county_name):
+        self.refresh()
+        county = get_county(county_name) if county_name else None
+        return self.filters.get(county['name']) if county else None
+
+_bloom_filters = None
+_bloom_filters_lock = threading.Lock()
+
+def get_bloom_filters():
+    """
+    Return the process-wide filter set, loading the filter directory on first use
+    """
+    global _bloom_filters
+    if _bloom_filters is None:
+        with _bloom_filters_lock:
+            if _bloom_filters is None:
+                _bloom_filters = BloomFilterSet(BLOOM_CONFIG["DIR"])
+    return _bloom_filters
+
+def definitely_missing(parcel_ids, county_name=None):
+    """
+    The subset of parcel_ids (ParcelId tuples) that county_name's
+    authoritative filter proves do not exist. Only a county the user picked
+    counts: one inferred from the ID format is a guess, and a guess must not
+    turn a real parcel away. Without county_name nothing is rejected.
+    """
+    if not county_name:
+        return []
+    bloom = get_bloom_filters().get(county_name)
+    if bloom is None or not bloom.authoritative:
+        return []
+    missing = []
+    for parcel_id in parcel_ids:
+        if bloom_key(parcel_id.display, bloom.county) not in bloom:
+            missing.append(parcel_id)
+    return missing
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "build-from-store":
+        bloom = build_bloom_filter_from_store(sys.argv[2], authoritative="--authoritative" in sys.argv)
+    elif len(sys.argv) == 4 and sys.argv[1] == "build":
+        with open(sys.argv[3], encoding="utf-8") as handle:
+            bloom = build_bloom_filter(sys.argv[2], (line.strip() for line in handle), source=os.path.basename(sys.argv[3]))
+    else:
+        print("usage: python parcel_bloom.py build <county> <parcel_ids.txt>")
+        print("       python parcel_bloom.py build-from-store <county> [--authoritative]")
+        sys.exit(2)
+    print(f"{bloom.county}: {bloom.count} IDs, {len(bloom.bits) / 1e6:.2f} MB, "
+          f"{'authoritative' if bloom.authoritative else 'advisory'} -> {bloom_path(bloom.county)}")
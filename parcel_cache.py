@@ -0,0 +1,493 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --------------------------
+# Cache Configuration
+# --------------------------
+# The L2 directory is shared by every Streamlit server process on the host, so
+# point TAXLOOK_CACHE_DIR at the same path for all workers behind the balancer.
+CACHE_CONFIG = {
+    "DIR": os.environ.get(
+        "TAXLOOK_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+    ),
+    "L1_MAX_ENTRIES": 512,
+    "ARTIFACT_L1_MAX_ENTRIES": 128,
+    "TTL_SECONDS": 7 * 24 * 3600,
+    "NEGATIVE_TTL_SECONDS": 3600,
+    "L2_BUSY_TIMEOUT_SECONDS": 10,
+    "L2_MAX_ENTRIES": 200000,            # Oldest-stored entries are evicted beyond this
+    "ARTIFACT_L2_MAX_ENTRIES": 5000,     # Rendered PDFs are large; keep fewer of them
+    "L2_MAINTENANCE_SECONDS": 600,       # How often a process purges expired entries and enforces the cap
+    "HOT_KEYS_TRACKED": 5000,
+    # Serve cache statistics as JSON on this port when set (one port per worker process).
+    # The stats include recent search keys and there is no authentication, so
+    # the endpoint listens on loopback only unless TAXLOOK_STATS_HOST widens it.
+    "STATS_PORT": os.environ.get("TAXLOOK_STATS_PORT", ""),
+    "STATS_HOST": os.environ.get("TAXLOOK_STATS_HOST", "127.0.0.1")
+}
+
+CacheHit = namedtuple("CacheHit", ["value", "negative", "tier", "expires_at"])
+
+def make_cache_key(*parts):
+    """
+    Build a stable cache key from request parts (region, parcel IDs, ...)
+    """
+    return "|".join(str(part).strip().upper() for part in parts if part is not None)
+
+def parcel_query_keys(api_version, region, rpp, parcel_query, canonical_query):
+    """
+    (key, exact_key) for a parcel request. Found parcels are cached under the
+    canonical IDs, but a NOT_FOUND only says the exact spelling sent did not
+    match: "44327012" missing says nothing about "443-27-012".
+    """
+    return (
+        make_cache_key(api_version, region, rpp, canonical_query),
+        make_cache_key(api_version, region, rpp, "AS SENT", parcel_query)
+    )
+
+# --------------------------
+# L1: Per-process In-memory LRU
+# --------------------------
+class MemoryCache:
+    """Small thread-safe LRU with per-entry expiry"""
+
+    tier = "L1"
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.bytes_used = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, negative, expires_at, size = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.bytes_used -= size
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return CacheHit(value, negative, self.tier, expires_at)
+
+    def set(self, key, value, negative, expires_at, size=0):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes_used -= previous[3]
+            self._entries[key] = (value, negative, expires_at, size)
+            self.bytes_used += size
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes_used -= evicted[3]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+# --------------------------
+# L2: Shared On-disk Store
+# --------------------------
+class DiskCache:
+    """
+    SQLite-backed cache shared by all processes pointing at the same directory.
+    WAL mode lets readers proceed while one writer commits; concurrent writers
+    wait on the busy timeout instead of failing. Every L2_MAINTENANCE_SECONDS
+    a writing process purges expired entries and evicts the oldest-stored
+    ones beyond max_entries.
+    """
+
+    tier = "L2"
+
+    def __init__(self, directory, filename="parcels.sqlite", binary=False, max_entries=None):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, filename)
+        self.binary = binary
+        self.max_entries = max_entries or CACHE_CONFIG["L2_MAX_ENTRIES"]
+        self.expirations = 0
+        self.evictions = 0
+        self._maintained_at = 0.0
+        self._maintenance_lock = threading.Lock()
+        self._local = threading.local()
+        conn = self._connect()
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    negative INTEGER NOT NULL DEFAULT 0,
+                    expires_at REAL NOT NULL,
+                    stored_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS cache_entries_stored ON cache_entries (stored_at);
+            """)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=CACHE_CONFIG["L2_BUSY_TIMEOUT_SECONDS"])
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, negative, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, negative, expires_at = row
+        if expires_at <= time.time():
+            with conn:
+                self.expirations += conn.execute(
+                    "DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?", (key, time.time())
+                ).rowcount
+            return None
+        value = bytes(value) if self.binary else json.loads(value)
+        return CacheHit(value, bool(negative), self.tier, expires_at)
+
+    def set(self, key, payload, negative, expires_at):
+        """Store an already-encoded payload (see encode())"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, negative, expires_at, stored_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, int(negative), expires_at, time.time())
+            )
+        if time.time() - self._maintained_at >= CACHE_CONFIG["L2_MAINTENANCE_SECONDS"]:
+            self.maintain()
+
+    def encode(self, value):
+        return value if self.binary else json.dumps(value)
+
+    def purge_expired(self):
+        conn = self._connect()
+        with conn:
+            purged = conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)).rowcount
+        self.expirations += purged
+        return purged
+
+    def evict_oldest(self):
+        """Drop the oldest-stored entries beyond max_entries; returns how many"""
+        conn = self._connect()
+        with conn:
+            excess = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+            if excess <= 0:
+                return 0
+            evicted = conn.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY stored_at LIMIT ?)", (excess,)
+            ).rowcount
+        self.evictions += evicted
+        return evicted
+
+    def maintain(self):
+        """purge_expired() then evict_oldest(); one thread per process at a time, others skip"""
+        if not self._maintenance_lock.acquire(blocking=False):
+            return
+        try:
+            self._maintained_at = time.time()
+            self.purge_expired()
+            self.evict_oldest()
+        finally:
+            self._maintenance_lock.release()
+
+    def usage(self):
+        """Entry count and on-disk bytes (database plus WAL) shared by all processes"""
+        entries = self._connect().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        size = 0
+        for path in (self.path, self.path + "-wal"):
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        return entries, size
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM cache_entries")
+
+# --------------------------
+# Two-tier Cache
+# --------------------------
+class TieredCache:
+    """
+    L1 memory cache in front of the shared L2 disk cache.
+    Reads fall through L1 -> L2 and L2 hits are promoted into L1.
+    Writes go to both tiers so every other process sees them on its next L2 read.
+    """
+
+    def __init__(self, directory, l1_max_entries, filename="parcels.sqlite", binary=False, l2_max_entries=None):
+        self.l1 = MemoryCache(l1_max_entries)
+        self.l2 = DiskCache(directory, filename, binary, l2_max_entries)
+        self.stats = {
+            tier: {"hits": 0, "negative_hits": 0, "misses": 0} for tier in ("L1", "L2")
+        }
+        self.hot_keys = Counter()
+        self._stats_lock = threading.Lock()
+        self._build_locks = {}
+        self._build_locks_guard = threading.Lock()
+
+    def _record(self, key, hit, missed_tiers):
+        with self._stats_lock:
+            for tier in missed_tiers:
+                self.stats[tier]["misses"] += 1
+            if hit is None:
+                return
+            self.stats[hit.tier]["negative_hits" if hit.negative else "hits"] += 1
+            self.hot_keys[key] += 1
+            if len(self.hot_keys) > CACHE_CONFIG["HOT_KEYS_TRACKED"]:
+                self.hot_keys = Counter(dict(self.hot_keys.most_common(CACHE_CONFIG["HOT_KEYS_TRACKED"] // 2)))
+
+    def get(self, key, record_stats=True):
+        hit = self.l1.get(key)
+        if hit is not None:
+            if record_stats:
+                self._record(key, hit, ())
+            return hit
+        try:
+            hit = self.l2.get(key)
+        except sqlite3.Error:
+            hit = None
+        if record_stats:
+            self._record(key, hit, ("L1",) if hit is not None else ("L1", "L2"))
+        if hit is None:
+            return None
+        self.l1.set(key, hit.value, hit.negative, hit.expires_at, self._size_of(hit.value))
+        return hit
+
+    def get_answer(self, key, exact_key):
+        """
+        Cached upstream answer for a parcel query: a positive entry under key
+        (shared by every spelling of the same IDs) or a negative one under
+        exact_key, which only the spelling that was sent may reuse
+        """
+        hit = self.get(key, record_stats=False)
+        if hit is not None and not hit.negative:
+            self._record(key, hit, ())
+            return hit
+        return self.get(exact_key)
+
+    def set_answer(self, key, exact_key, value, negative):
+        """Store an upstream answer where get_answer() looks for it"""
+        self.set(exact_key if negative else key, value, negative=negative)
+
+    def _size_of(self, value):
+        return len(value) if isinstance(value, (bytes, str)) else len(json.dumps(value))
+
+    def set(self, key, value, negative=False, ttl=None):
+        if ttl is None:
+            ttl = CACHE_CONFIG["NEGATIVE_TTL_SECONDS"] if negative else CACHE_CONFIG["TTL_SECONDS"]
+        expires_at = time.time() + ttl
+        payload = self.l2.encode(value)
+        self.l1.set(key, value, negative, expires_at, len(payload))
+        try:
+            self.l2.set(key, payload, negative, expires_at)
+        except sqlite3.Error:
+            # A locked or read-only L2 must never fail the lookup itself
+            pass
+
+    def snapshot(self, top_n=10):
+        """Point-in-time statistics for this cache (process-local counters, shared L2 usage)"""
+        with self._stats_lock:
+            tiers = {tier: dict(counts) for tier, counts in self.stats.items()}
+            hottest = self.hot_keys.most_common(top_n)
+        for counts in tiers.values():
+            lookups = counts["hits"] + counts["negative_hits"] + counts["misses"]
+            counts["lookups"] = lookups
+            counts["hit_ratio"] = counts["hits"] / lookups if lookups else 0.0
+            counts["negative_hit_ratio"] = counts["negative_hits"] / lookups if lookups else 0.0
+            counts["miss_ratio"] = counts["misses"] / lookups if lookups else 0.0
+        tiers["L1"].update({
+            "entries": len(self.l1),
+            "max_entries": self.l1.max_entries,
+            "bytes_used": self.l1.bytes_used,
+            "evictions": self.l1.evictions,
+            "expirations": self.l1.expirations
+        })
+        try:
+            l2_entries, l2_bytes = self.l2.usage()
+        except sqlite3.Error:
+            l2_entries, l2_bytes = None, None
+        tiers["L2"].update({
+            "entries": l2_entries,
+            "max_entries": self.l2.max_entries,
+            "bytes_used": l2_bytes,
+            "evictions": self.l2.evictions,
+            "expirations": self.l2.expirations,
+            "path": self.l2.path
+        })
+        served = sum(tiers[tier]["hits"] + tiers[tier]["negative_hits"] for tier in tiers)
+        return {
+            "tiers": tiers,
+            "hottest_keys": [{"key": key, "hits": hits} for key, hits in hottest],
+            "upstream_calls_avoided": served
+        }
+
+    def get_or_build(self, key, builder, ttl=None):
+        """
+        Return the cached value for key, calling builder() at most once per
+        process when it is cold; concurrent callers wait for that build.
+        """
+        hit = self.get(key)
+        if hit is not None:
+            return hit.value
+        with self._build_locks_guard:
+            lock = self._build_locks.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                hit = self.get(key, record_stats=False)
+                if hit is not None:
+                    return hit.value
+                value = builder()
+                self.set(key, value, ttl=ttl)
+                return value
+        finally:
+            with self._build_locks_guard:
+                if self._build_locks.get(key) is lock and not lock.locked():
+                    del self._build_locks[key]
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+_parcel_cache = None
+_parcel_cache_lock = threading.Lock()
+CACHE_REGISTRY = {}
+
+def get_parcel_cache():
+    """
+    Return the process-wide parcel response cache, creating it on first use
+    """
+    global _parcel_cache
+    if _parcel_cache is None:
+        with _parcel_cache_lock:
+            if _parcel_cache is None:
+                _parcel_cache = TieredCache(CACHE_CONFIG["DIR"], CACHE_CONFIG["L1_MAX_ENTRIES"])
+                CACHE_REGISTRY["parcels"] = _parcel_cache
+    return _parcel_cache
+
+# --------------------------
+# Rendered Artifact Cache (PDF / JSON download bytes)
+# --------------------------
+_artifact_cache = None
+
+def get_artifact_cache():
+    """
+    Return the process-wide cache of rendered download bytes
+    """
+    global _artifact_cache
+    if _artifact_cache is None:
+        with _parcel_cache_lock:
+            if _artifact_cache is None:
+                _artifact_cache = TieredCache(
+                    CACHE_CONFIG["DIR"], CACHE_CONFIG["ARTIFACT_L1_MAX_ENTRIES"],
+                    filename="artifacts.sqlite", binary=True,
+                    l2_max_entries=CACHE_CONFIG["ARTIFACT_L2_MAX_ENTRIES"]
+                )
+                CACHE_REGISTRY["artifacts"] = _artifact_cache
+    return _artifact_cache
+
+def artifact_key(kind, records, template_version, extra=()):
+    """
+    Key a rendered artifact by (robust_id, data vintage, template version) of
+    every record it covers. Records without a robust_id fall back to a content hash;
+    extra carries any non-record input the rendering depends on.
+    """
+    if isinstance(records, dict):
+        records = [records]
+    parts = []
+    for record in records:
+        record_id = record.get('robust_id') or hashlib.sha1(
+            json.dumps(record, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        parts.append(f"{record_id}@{record.get('last_updated', '')}")
+    if len(parts) > 1:
+        parts = [hashlib.sha1(";".join(parts).encode()).hexdigest()]
+    return make_cache_key(kind, template_version, *extra, *parts)
+
+def cached_artifact(kind, records, template_version, builder, extra=()):
+    """
+    Serve rendered bytes from the artifact cache, building them once when cold
+    """
+    return get_artifact_cache().get_or_build(artifact_key(kind, records, template_version, extra), builder)
+
+def cached_json_bytes(kind, records, template_version, payload=None, extra=()):
+    """
+    Cached json.dumps(..., indent=2) of payload (defaults to records) as UTF-8 bytes
+    """
+    if payload is None:
+        payload = records
+    return cached_artifact(
+        kind, records, template_version, lambda: json.dumps(payload, indent=2).encode("utf-8"), extra
+    )
+
+# --------------------------
+# Cache Statistics Surface
+# --------------------------
+def cache_stats_snapshot(top_n=10):
+    """
+    Process-wide statistics for every cache created in this process
+    """
+    return {
+        "pid": os.getpid(),
+        "generated_at": time.time(),
+        "caches": {name: cache.snapshot(top_n) for name, cache in list(CACHE_REGISTRY.items())}
+    }
+
+class _CacheStatsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0].rstrip("/") not in ("/cache/stats", ""):
+            self.send_error(404)
+            return
+        body = json.dumps(cache_stats_snapshot(), indent=2).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_stats_server = None
+
+def start_stats_server(port=None, host=None):
+    """
+    Serve cache_stats_snapshot() as JSON at http://<host>:<port>/cache/stats,
+    host defaulting to STATS_HOST (loopback). Started at most once per
+    process; returns the bound port or None when disabled.
+    """
+    global _stats_server
+    port = port or CACHE_CONFIG["STATS_PORT"]
+    host = host or CACHE_CONFIG["STATS_HOST"]
+    if not port:
+        return None
+    with _parcel_cache_lock:
+        if _stats_server is None:
+            try:
+                _stats_server = ThreadingHTTPServer((host, int(port)), _CacheStatsHandler)
+            except OSError:
+                # Port already taken (e.g. by another worker on this host)
+                return None
+            threading.Thread(target=_stats_server.serve_forever, name="cache-stats", daemon=True).start()
+    return _stats_server.server_address[1]
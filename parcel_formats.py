@@ -0,0 +1,201 @@
+import re
+import string
+from operator import itemgetter
+from collections import namedtuple
+from functools import lru_cache
+
+# --------------------------
+# Ohio Parcel ID Format Rules
+# --------------------------
+# One row per county layout: '#' is a digit, 'A' a letter, '-' a separator
+# position. An ID matches a layout either written exactly as laid out (any of
+# '-', ' ' or '.' as the separator) or fully compact with no separators.
+# Several counties share a shape; the classifier returns all of them. Only the
+# separated (or lettered) forms route a search: plenty of counties not listed
+# here number parcels with plain digits, so '44327012' alone is not Cuyahoga.
+PARCEL_FORMAT_RULES = [
+    # (county, layout, example)
+    ("Cuyahoga County", "###-##-###", "443-27-012"),
+    ("Summit County", "##-#####", "12-34567"),
+    ("Lucas County", "##-#####", "18-12345"),
+    ("Lake County", "###-###-###", "123-456-789"),
+    ("Franklin County", "###-######-##", "010-123456-00"),
+    ("Delaware County", "###-######-##", "308-123456-00"),
+    ("Fairfield County", "###-######-###", "141-123456-000"),
+    ("Hamilton County", "###-####-####-##", "123-0001-0001-00"),
+    ("Butler County", "#########", "123456789"),
+    ("Warren County", "##-###-##-###-###", "12-123-45-678-900"),
+    ("Montgomery County", "A##-#####-####", "R72-12345-0001"),
+]
+
+SEPARATOR_CLASS = "[-. ]"
+
+def layout_to_pattern(layout):
+    """
+    Regex for one layout: the exact separated form or the compact form
+    """
+    groups = layout.split("-")
+
+    def group_pattern(group):
+        return "".join("[0-9]" if ch == "#" else "[A-Z]" for ch in group)
+
+    separated = SEPARATOR_CLASS.join(group_pattern(group) for group in groups)
+    compact = "".join(group_pattern(group) for group in groups)
+    if separated == compact:
+        return compact
+    return f"(?:{separated}|{compact})"
+
+def compile_format_matcher(rules):
+    """
+    Compile every rule into one regex. Each rule is an optional zero-width
+    lookahead with an empty named group, so a single match reports every
+    layout the ID satisfies.
+    """
+    parts = []
+    for index, (_, layout, _) in enumerate(rules):
+        parts.append(f"(?:(?={layout_to_pattern(layout)}$)(?P<r{index}>))?")
+    return re.compile("".join(parts))
+
+FORMAT_MATCHER = compile_format_matcher(PARCEL_FORMAT_RULES)
+
+# Rules only look at character classes, so IDs are reduced to a shape
+# ('0' digit, 'A' letter, '-' separator) and classification is cached per
+# shape; a bulk run over millions of IDs sees only a handful of shapes.
+SHAPE_TABLE = str.maketrans(
+    string.digits + string.ascii_uppercase + "-. ",
+    "0" * 10 + "A" * 26 + "---"
+)
+
+@lru_cache(maxsize=4096)
+def _classify_shape(shape):
+    match = FORMAT_MATCHER.match(shape)
+    counties = []
+    for index, (county, _, _) in enumerate(PARCEL_FORMAT_RULES):
+        if match.group(f"r{index}") is not None and county not in counties:
+            counties.append(county)
+    return tuple(counties)
+
+def classify_parcel_id(parcel_id):
+    """
+    Return the candidate counties (in rule order, without duplicates) whose
+    parcel layout matches parcel_id; empty when no rule matches
+    """
+    return _classify_shape(parcel_id.strip().upper().translate(SHAPE_TABLE))
+
+def format_county(parcel_id):
+    """
+    The one county whose layout parcel_id is written in, else None. Compact
+    all-digit IDs never qualify, whatever rules they happen to match.
+    """
+    shape = parcel_id.strip().upper().translate(SHAPE_TABLE)
+    if not shape.strip("0"):
+        return None
+    candidates = _classify_shape(shape)
+    return candidates[0] if len(candidates) == 1 else None
+
+def route_parcel_ids(parcel_ids):
+    """
+    County to put in the request region when every ID points at exactly one
+    county; None means the search should stay statewide
+    """
+    routed = None
+    for parcel_id in parcel_ids:
+        county = format_county(parcel_id)
+        if county is None:
+            return None
+        if routed is not None and county != routed:
+            return None
+        routed = county
+    return routed
+
+# --------------------------
+# Canonical Parcel IDs
+# --------------------------
+# canonical: upper-case, separators removed, zero-padded to the county layout
+#            when the county is known - what caches, history and dedupe key on
+# display:   the county's separated layout when it applies, else the cleaned input
+# query:     the input upper-cased, whitespace collapsed - what is sent upstream, since
+#            ReportAllUSA matches IDs as written rather than as reformatted here
+ParcelId = namedtuple("ParcelId", ["canonical", "display", "county", "query"])
+
+STRIP_SEPARATORS = str.maketrans("", "", "-. /_")
+
+def _layout_groups(layout):
+    """itemgetter that cuts a compact ID into the layout's separated groups"""
+    slices = []
+    start = 0
+    for group in layout.split("-"):
+        slices.append(slice(start, start + len(group)))
+        start += len(group)
+    return itemgetter(*slices) if len(slices) > 1 else (lambda compact: (compact,))
+
+# First layout listed for each county
+COUNTY_LAYOUTS = {}
+for _county, _layout, _ in PARCEL_FORMAT_RULES:
+    if _county not in COUNTY_LAYOUTS:
+        COUNTY_LAYOUTS[_county] = (
+            re.compile(layout_to_pattern(_layout.replace("-", ""))),
+            _layout_groups(_layout),
+            len(_layout.replace("-", "")),
+            "A" not in _layout
+        )
+
+def _normalize(parcel_id, county=None):
+    cleaned = " ".join(parcel_id.split()).upper()
+    canonical = cleaned.translate(STRIP_SEPARATORS)
+    routed = format_county(cleaned) if county is None else county
+    layout = COUNTY_LAYOUTS.get(routed)
+    if layout is None:
+        return ParcelId(canonical, cleaned, routed, cleaned)
+    compact_pattern, groups, width, numeric = layout
+    if county is not None and numeric and canonical.isdigit() and len(canonical) < width:
+        # Leading zeros are often dropped by spreadsheets; only restore them
+        # when the caller told us which county the ID belongs to
+        canonical = canonical.zfill(width)
+    if len(canonical) == width and (canonical.isdigit() if numeric else compact_pattern.fullmatch(canonical)):
+        display = "-".join(groups(canonical))
+    else:
+        display = cleaned
+    return ParcelId(canonical, display, routed, cleaned)
+
+@lru_cache(maxsize=262144)
+def normalize_parcel_id(parcel_id, county=None):
+    """
+    Canonical and display forms of one parcel ID. county (e.g. "Franklin County")
+    enables zero-padding; without it the county is inferred when the format is unambiguous.
+    """
+    return _normalize(parcel_id, county)
+
+def normalize_parcel_ids(parcel_ids, county=None):
+    """
+    Bulk normalization for large inputs (CSV columns, ID lists). Skips the
+    per-ID LRU, which only adds overhead when most IDs are unique.
+    """
+    return [_normalize(parcel_id, county) for parcel_id in parcel_ids]
+
+def split_parcel_ids(search_term, county=None):
+    """
+    Split a ',' / ';' separated search into normalized IDs, dropping empty
+    entries and duplicates (by canonical form) while keeping input order
+    """
+    seen = set()
+    parcel_ids = []
+    for raw in search_term.replace(",", ";").split(";"):
+        if not raw.strip():
+            continue
+        parcel_id = normalize_parcel_id(raw, county)
+        if parcel_id.canonical in seen:
+            continue
+        seen.add(parcel_id.canonical)
+        parcel_ids.append(parcel_id)
+    return parcel_ids
+
+def match_key(parcel_id):
+    """Key that pairs a requested ID with the returned record: separators and leading zeros ignored"""
+    return normalize_parcel_id(str(parcel_id or "")).canonical.lstrip("0")
+
+def canonical_parcel_query(parcel_query, county=None):
+    """
+    Canonical cache/dedupe key for a ';' separated parcel query
+    """
+    return ";".join(parcel_id.canonical for parcel_id in split_parcel_ids(parcel_query, county))
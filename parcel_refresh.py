@@ -0,0 +1,300 @@
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from batch_fetch import BATCH_CONFIG, BatchProgress, fetch_batch
+from batch_lookup import EXIT_ERRORS, EXIT_FAILED, EXIT_OK, EXIT_USAGE
+from lookup_core import REPORTALLUSA_CONFIG, search_multiple_parcels
+from ohio_counties import get_county
+from parcel_formats import normalize_parcel_id
+from parcel_store import get_parcel_store, record_key
+
+# --------------------------
+# Delta Refresh Configuration
+# --------------------------
+# Re-fetches only the stored parcels whose county has (or should have)
+# published newer data since they were fetched, instead of re-pulling the
+# whole tracked set:
+#     python parcel_refresh.py --dry-run                 (what would be fetched, and why)
+#     python parcel_refresh.py -o changes.ndjson         (refresh; one line per changed parcel)
+#     python parcel_refresh.py --county Cuyahoga --all -o report.ndjson
+# A record's data vintage is its last_updated value ("2025-Q3"); the county's
+# next release is expected one schedule period after that vintage began.
+REFRESH_CONFIG = {
+    "DEFAULT_SCHEDULE_DAYS": 91,     # Counties publish quarterly unless listed below
+    "COUNTY_SCHEDULE_DAYS": {},      # e.g. {"Franklin County": 30} for counties on a monthly roll
+    "PUBLISH_LAG_DAYS": 14,          # Allowance between a period starting and its data reaching the API
+    "RECHECK_DAYS": 14,              # How often a county that is late with its release is probed again
+    "PROBE_PARCELS": 3,              # Parcels re-fetched per late county to detect its release
+    "MAX_AGE_DAYS": 365,             # Re-fetch anything older than this whatever its vintage says
+    "MAX_PASSES": 2,                 # A probe that finds a new vintage queues the rest of its county
+    "IGNORE_FIELDS": ["last_updated"]  # Bookkeeping fields that do not count as a change
+}
+
+DAY_SECONDS = 24 * 3600
+
+REFRESH_STATUSES = ["CHANGED", "UNCHANGED", "NOT_FOUND", "KNOWN_INVALID", "ERROR"]
+
+QUARTER_PATTERN = re.compile(r"^(\d{4})-?Q([1-4])$", re.IGNORECASE)
+MONTH_PATTERN = re.compile(r"^(\d{4})-(\d{2})(?:-(\d{2}))?")
+
+def vintage_start(last_updated):
+    """
+    Epoch seconds at which a record's data vintage begins: "2025-Q3" ->
+    2025-07-01, "2025-08" / "2025-08-14..." -> that month / day. None when
+    the value is missing or unrecognized.
+    """
+    text = str(last_updated or "").strip()
+    match = QUARTER_PATTERN.match(text)
+    if match:
+        year, month, day = int(match.group(1)), 3 * int(match.group(2)) - 2, 1
+    else:
+        match = MONTH_PATTERN.match(text)
+        if not match:
+            return None
+        year, month, day = int(match.group(1)), int(match.group(2)), int(match.group(3) or 1)
+    try:
+        return datetime(year, month, day, tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+def schedule_days(county_name):
+    return REFRESH_CONFIG["COUNTY_SCHEDULE_DAYS"].get(county_name, REFRESH_CONFIG["DEFAULT_SCHEDULE_DAYS"])
+
+# --------------------------
+# Planning
+# --------------------------
+def candidate_county(county_id, county_name):
+    county = get_county(county_id) if county_id is not None else None
+    if county is None and county_name:
+        county = get_county(county_name)
+    return county['name'] if county else None
+
+def newest_vintages(candidates):
+    """
+    {county: (newest vintage start, first fetched_at carrying it)}; a record
+    fetched before its county's newest vintage was first seen may be behind it
+    """
+    newest = {}
+    for candidate in candidates:
+        if candidate["vintage"] is None:
+            continue
+        current = newest.get(candidate["county"])
+        if current is None or candidate["vintage"] > current[0]:
+            newest[candidate["county"]] = (candidate["vintage"], candidate["fetched_at"])
+        elif candidate["vintage"] == current[0] and candidate["fetched_at"] < current[1]:
+            newest[candidate["county"]] = (current[0], candidate["fetched_at"])
+    return newest
+
+def due_reason(candidate, newest, now):
+    """
+    Why a stored record should be re-fetched now, or None if its county is not
+    expected to have published anything newer since it was fetched
+    """
+    vintage, fetched_at = candidate["vintage"], candidate["fetched_at"]
+    county_newest = newest.get(candidate["county"])
+    if vintage is not None and county_newest and vintage < county_newest[0] and fetched_at < county_newest[1]:
+        return "new_vintage"
+    if now - fetched_at >= REFRESH_CONFIG["MAX_AGE_DAYS"] * DAY_SECONDS:
+        return "max_age"
+    period = schedule_days(candidate["county"]) * DAY_SECONDS
+    if vintage is None:
+        return "schedule" if now - fetched_at >= period else None
+    expected = vintage + period + REFRESH_CONFIG["PUBLISH_LAG_DAYS"] * DAY_SECONDS
+    if now < expected:
+        return None
+    if fetched_at < expected:
+        return "schedule"
+    # Fetched after the release was due and still on the old vintage: the county is late
+    return "probe"
+
+def plan_refresh(store=None, county=None, now=None):
+    """
+    (due, tracked): the stored records to re-fetch, each
+    {record_key, parcel_id, county, vintage, last_updated, fetched_at, reason},
+    and how many records were considered. A late county contributes only
+    PROBE_PARCELS of its oldest-fetched records, and only once none of its
+    records has been fetched for RECHECK_DAYS.
+    """
+    store = store or get_parcel_store()
+    now = now or time.time()
+    county_id = get_county(county)['county_id'] if county else None
+    candidates = [{
+        "record_key": key,
+        "parcel_id": parcel_id,
+        "county": candidate_county(row_county_id, county_name),
+        "last_updated": last_updated,
+        "vintage": vintage_start(last_updated),
+        "fetched_at": fetched_at
+    } for key, parcel_id, row_county_id, county_name, last_updated, fetched_at in store.refresh_candidates(county_id)]
+
+    newest = newest_vintages(candidates)
+    last_fetched = {}
+    for candidate in candidates:
+        last_fetched[candidate["county"]] = max(last_fetched.get(candidate["county"], 0), candidate["fetched_at"])
+    due = []
+    probes = {}
+    for candidate in candidates:
+        if not candidate["parcel_id"]:
+            continue
+        reason = due_reason(candidate, newest, now)
+        if reason == "probe":
+            probes.setdefault(candidate["county"], []).append(dict(candidate, reason=reason))
+        elif reason:
+            due.append(dict(candidate, reason=reason))
+    for county, county_probes in probes.items():
+        if now - last_fetched[county] < REFRESH_CONFIG["RECHECK_DAYS"] * DAY_SECONDS:
+            continue
+        county_probes.sort(key=lambda candidate: candidate["fetched_at"])
+        due.extend(county_probes[:REFRESH_CONFIG["PROBE_PARCELS"]])
+    return due, len(candidates)
+
+# --------------------------
+# Refresh and Diff
+# --------------------------
+def record_changes(old, new):
+    """{field: {"old", "new"}} for every field whose value differs, IGNORE_FIELDS aside"""
+    changes = {}
+    for field in dict.fromkeys([*old, *new]):
+        if field in REFRESH_CONFIG["IGNORE_FIELDS"]:
+            continue
+        if old.get(field) != new.get(field):
+            changes[field] = {"old": old.get(field), "new": new.get(field)}
+    return changes
+
+def fetch_fresh(parcel_ids, county_name=None):
+    """search_multiple_parcels without the response cache, which may still hold the old record"""
+    return search_multiple_parcels(parcel_ids, county_name, use_cache=False)
+
+def refresh_parcels(due, fetch_chunk=fetch_fresh, chunk_size=None, max_workers=None, store=None):
+    """
+    Re-fetch the planned records (the search path writes the new ones back to
+    the store) and yield each chunk's report rows: the planned record plus
+    status, new_last_updated, changes and message.
+    """
+    store = store or get_parcel_store()
+    old_records = {record_key(record): record for record in store.get_records(entry["record_key"] for entry in due)}
+    planned = {}
+    items = []
+    for row, entry in enumerate(due, start=1):
+        planned[row] = entry
+        items.append({"row": row, "parcel_id": normalize_parcel_id(entry["parcel_id"], entry["county"]), "county": entry["county"]})
+
+    for rows in fetch_batch(items, fetch_chunk, chunk_size, max_workers):
+        report = []
+        for row in rows:
+            entry = planned[row["row"]]
+            record = row["record"]
+            changes = record_changes(old_records.get(entry["record_key"], {}), record) if record else {}
+            status = row["status"]
+            if status == "OK":
+                status = "CHANGED" if changes else "UNCHANGED"
+            report.append({
+                "record_key": entry["record_key"],
+                "parcel_id": entry["parcel_id"],
+                "county": entry["county"],
+                "reason": entry["reason"],
+                "status": status,
+                "last_updated": entry["last_updated"],
+                "new_last_updated": record.get('last_updated') if record else None,
+                "changes": changes,
+                "message": row["message"]
+            })
+        # Gone upstream: remember the check so the next run does not ask again
+        store.mark_checked(
+            entry["record_key"] for entry in report if entry["status"] in ("NOT_FOUND", "KNOWN_INVALID")
+        )
+        yield report
+
+# --------------------------
+# Command Line
+# --------------------------
+def format_plan(due, tracked):
+    reasons = Counter(entry["reason"] for entry in due)
+    share = 100.0 * len(due) / tracked if tracked else 0.0
+    detail = ", ".join(f"{count:,} {reason}" for reason, count in reasons.most_common())
+    return f"{tracked:,} tracked parcels, {len(due):,} due for refresh ({share:.1f}%)" + (f": {detail}" if detail else "")
+
+def format_refresh_summary(counts, field_counts, progress):
+    summary = (
+        f"{progress.done:,} parcels refreshed in {progress.elapsed:.1f}s: "
+        f"{counts['CHANGED']:,} changed, {counts['UNCHANGED']:,} unchanged, "
+        f"{counts['NOT_FOUND'] + counts['KNOWN_INVALID']:,} no longer found, {counts['ERROR']:,} errors"
+    )
+    if field_counts:
+        summary += "\nChanged fields: " + ", ".join(f"{field} {count:,}" for field, count in field_counts.most_common())
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-fetch stored Ohio parcels whose county data is likely to have changed.")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON report file; '-' writes to stdout")
+    parser.add_argument("--county", help="Only refresh this county (name, state code or FIPS id)")
+    parser.add_argument("--limit", type=int, help="Refresh at most this many parcels, oldest fetch first")
+    parser.add_argument("--dry-run", action="store_true", help="Report what is due without fetching anything")
+    parser.add_argument("--all", action="store_true", help="Report unchanged parcels too, not just changes and failures")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONFIG["MAX_WORKERS"], help="Requests in flight at once")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CONFIG["CHUNK_SIZE"], help="Parcel IDs per request")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    if args.county and get_county(args.county) is None:
+        print(f"Unknown Ohio county: {args.county}", file=sys.stderr)
+        return EXIT_USAGE
+    if not args.dry_run and not REPORTALLUSA_CONFIG["CLIENT_KEY"]:
+        print("No ReportAllUSA client key: set TAXLOOK_REPORTALLUSA_CLIENT or add it to .streamlit/secrets.toml", file=sys.stderr)
+        return EXIT_FAILED
+    try:
+        handle = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    except OSError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_USAGE
+
+    counts = Counter({status: 0 for status in REFRESH_STATUSES})
+    field_counts = Counter()
+    progress = BatchProgress(0)
+    try:
+        for refresh_pass in range(1 if args.dry_run else REFRESH_CONFIG["MAX_PASSES"]):
+            due, tracked = plan_refresh(county=args.county)
+            if refresh_pass:
+                # Later passes only pick up the parcels a probe's new release made due
+                due = [entry for entry in due if entry["reason"] == "new_vintage"]
+            if args.limit is not None:
+                due = sorted(due, key=lambda entry: entry["fetched_at"])[:max(args.limit - progress.done, 0)]
+            if not args.quiet or args.dry_run:
+                print(format_plan(due, tracked), file=sys.stderr)
+            if args.dry_run:
+                for entry in due:
+                    handle.write(json.dumps(entry) + "\n")
+                return EXIT_OK
+            if not due:
+                break
+            progress.total += len(due)
+            released = False
+            for report in refresh_parcels(due, chunk_size=args.chunk_size, max_workers=args.concurrency):
+                for entry in report:
+                    counts[entry["status"]] += 1
+                    field_counts.update(entry["changes"].keys())
+                    released = released or (entry["reason"] == "probe" and entry["new_last_updated"] not in (None, entry["last_updated"]))
+                    if args.all or entry["status"] != "UNCHANGED":
+                        handle.write(json.dumps(entry) + "\n")
+                progress.advance(len(report))
+            # Only a probe that found a new vintage can make more of its county due
+            if not released:
+                break
+    except KeyboardInterrupt:
+        print("Interrupted; parcels refreshed so far are stored", file=sys.stderr)
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+
+    print(format_refresh_summary(counts, field_counts, progress), file=sys.stderr)
+    if counts["ERROR"] and counts["ERROR"] == progress.done:
+        return EXIT_FAILED
+    return EXIT_ERRORS if counts["ERROR"] else EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from ohio_counties import get_county
+from parcel_cache import CACHE_CONFIG
+
+# --------------------------
+# Local Parcel Store Configuration
+# --------------------------
+# Every record fetched from ReportAllUSA is kept here with an FTS5 index over
+# its address and owner fields, so owner/address searches can be answered
+# locally. Lives next to the L2 cache and is shared the same way.
+STORE_CONFIG = {
+    "DIR": CACHE_CONFIG["DIR"],
+    "FILENAME": "parcel_store.sqlite",
+    "BUSY_TIMEOUT_SECONDS": CACHE_CONFIG["L2_BUSY_TIMEOUT_SECONDS"],
+    "MAX_RESULTS": 25
+}
+
+# Indexed text columns, in FTS column order
+FTS_COLUMNS = ["address", "owner", "mail_address1", "addr_city"]
+
+# Which columns each search type matches against
+SEARCH_FIELDS = {
+    "owner": ["owner"],
+    "address": ["address", "mail_address1", "addr_city"],
+    "any": FTS_COLUMNS
+}
+
+TOKEN_PATTERN = re.compile(r"[0-9A-Za-z]+")
+
+def record_key(record):
+    """
+    Stable identity for a fetched record: robust_id when present, else county + parcel ID
+    """
+    if record.get('robust_id'):
+        return record['robust_id']
+    return f"{record.get('county_id', '')}|{record.get('parcel_id', '')}"
+
+def build_match_query(search_term, search_type="any"):
+    """
+    FTS5 MATCH expression: every word must appear (as a prefix) in one of the
+    columns for search_type. Returns None when the term has no searchable words.
+    """
+    tokens = TOKEN_PATTERN.findall(search_term.upper())
+    if not tokens:
+        return None
+    columns = " ".join(SEARCH_FIELDS[search_type])
+    terms = " AND ".join(f'"{token}"*' for token in tokens)
+    return f"{{{columns}}} : ({terms})"
+
+class ParcelStore:
+    """
+    SQLite table of fetched records plus an external-content FTS5 index kept
+    in sync by triggers. Uses one connection per thread, like the L2 cache.
+    """
+
+    def __init__(self, directory, filename=STORE_CONFIG["FILENAME"]):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, filename)
+        self._local = threading.local()
+        conn = self._connect()
+        with conn:
+            conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS parcels (
+                    record_key TEXT PRIMARY KEY,
+                    parcel_id TEXT,
+                    county_id INTEGER,
+                    {", ".join(f"{column} TEXT" for column in FTS_COLUMNS)},
+                    record TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS parcels_county ON parcels (county_id);
+                CREATE INDEX IF NOT EXISTS parcels_fetched ON parcels (fetched_at);
+                CREATE VIRTUAL TABLE IF NOT EXISTS parcels_fts USING fts5(
+                    {", ".join(FTS_COLUMNS)},
+                    content='parcels', content_rowid='rowid'
+                );
+                CREATE TRIGGER IF NOT EXISTS parcels_ai AFTER INSERT ON parcels BEGIN
+                    INSERT INTO parcels_fts (rowid, {", ".join(FTS_COLUMNS)})
+                    VALUES (new.rowid, {", ".join(f"new.{column}" for column in FTS_COLUMNS)});
+                END;
+                CREATE TRIGGER IF NOT EXISTS parcels_ad AFTER DELETE ON parcels BEGIN
+                    INSERT INTO parcels_fts (parcels_fts, rowid, {", ".join(FTS_COLUMNS)})
+                    VALUES ('delete', old.rowid, {", ".join(f"old.{column}" for column in FTS_COLUMNS)});
+                END;
+                CREATE TRIGGER IF NOT EXISTS parcels_au AFTER UPDATE ON parcels BEGIN
+                    INSERT INTO parcels_fts (parcels_fts, rowid, {", ".join(FTS_COLUMNS)})
+                    VALUES ('delete', old.rowid, {", ".join(f"old.{column}" for column in FTS_COLUMNS)});
+                    INSERT INTO parcels_fts (rowid, {", ".join(FTS_COLUMNS)})
+                    VALUES (new.rowid, {", ".join(f"new.{column}" for column in FTS_COLUMNS)});
+                END;
+            """)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=STORE_CONFIG["BUSY_TIMEOUT_SECONDS"])
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM parcels").fetchone()[0]
+
+    def ingest(self, records):
+        """
+        Insert or refresh records; returns how many were written
+        """
+        now = time.time()
+        rows = []
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            rows.append((
+                record_key(record),
+                record.get('parcel_id'),
+                record.get('county_id'),
+                *(str(record.get(column) or "") for column in FTS_COLUMNS),
+                json.dumps(record),
+                now
+            ))
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            # Upsert so the UPDATE trigger keeps the FTS index in step
+            conn.executemany(f"""
+                INSERT INTO parcels (record_key, parcel_id, county_id, {", ".join(FTS_COLUMNS)}, record, fetched_at)
+                VALUES ({", ".join("?" * (len(FTS_COLUMNS) + 5))})
+                ON CONFLICT (record_key) DO UPDATE SET
+                    parcel_id = excluded.parcel_id,
+                    county_id = excluded.county_id,
+                    {", ".join(f"{column} = excluded.{column}" for column in FTS_COLUMNS)},
+                    record = excluded.record,
+                    fetched_at = excluded.fetched_at
+            """, rows)
+        return len(rows)
+
+    def search(self, search_term, search_type="any", county_name=None, limit=None):
+        """
+        Best-ranked stored records matching search_term, optionally limited to one county
+        """
+        match_query = build_match_query(search_term, search_type)
+        if match_query is None:
+            return []
+        sql = (
+            "SELECT parcels.record FROM parcels_fts "
+            "JOIN parcels ON parcels.rowid = parcels_fts.rowid "
+            "WHERE parcels_fts MATCH ?"
+        )
+        params = [match_query]
+        county = get_county(county_name) if county_name else None
+        if county is not None:
+            sql += " AND parcels.county_id = ?"
+            params.append(county['county_id'])
+        sql += " ORDER BY parcels_fts.rank LIMIT ?"
+        params.append(limit or STORE_CONFIG["MAX_RESULTS"])
+        rows = self._connect().execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_records(self, record_keys):
+        """Stored records for the given record keys (missing keys are skipped)"""
+        record_keys = list(record_keys)
+        if not record_keys:
+            return []
+        rows = self._connect().execute(
+            f"SELECT record FROM parcels WHERE record_key IN ({', '.join('?' * len(record_keys))})",
+            record_keys
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def rows_fetched_since(self, fetched_at, columns):
+        """
+        (record_key, *columns, fetched_at) for rows written at or after fetched_at,
+        oldest first; lets in-memory indexes catch up with other processes
+        """
+        return self._connect().execute(
+            f"SELECT record_key, {', '.join(columns)}, fetched_at FROM parcels "
+            "WHERE fetched_at >= ? ORDER BY fetched_at",
+            (fetched_at,)
+        ).fetchall()
+
+    def refresh_candidates(self, county_id=None):
+        """
+        (record_key, parcel_id, county_id, county_name, last_updated, fetched_at)
+        for every stored record, optionally one county; the record JSON is not decoded
+        """
+        sql = (
+            "SELECT record_key, parcel_id, county_id, json_extract(record, '$.county_name'), "
+            "json_extract(record, '$.last_updated'), fetched_at FROM parcels"
+        )
+        params = []
+        if county_id is not None:
+            sql += " WHERE county_id = ?"
+            params.append(county_id)
+        return self._connect().execute(sql, params).fetchall()
+
+    def mark_checked(self, record_keys, checked_at=None):
+        """Set fetched_at for records that were asked for upstream but not rewritten (e.g. not found)"""
+        record_keys = list(record_keys)
+        if not record_keys:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE parcels SET fetched_at = ? WHERE record_key = ?",
+                [(checked_at or time.time(), key) for key in record_keys]
+            )
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM parcels")
+
+_parcel_store = None
+_parcel_store_lock = threading.Lock()
+
+def get_parcel_store():
+    """
+    Return the process-wide local parcel store, creating it on first use
+    """
+    global _parcel_store
+    if _parcel_store is None:
+        with _parcel_store_lock:
+            if _parcel_store is None:
+                _parcel_store = ParcelStore(STORE_CONFIG["DIR"])
+    return _parcel_store
+
+# --------------------------
+# Ingest Hooks
+# --------------------------
+# Called with the list of freshly fetched records after they are stored.
+# Local indexes (fuzzy, spatial, ...) register here instead of being wired
+# into each app's fetch path.
+INGEST_HOOKS = []
+
+def register_ingest_hook(hook):
+    """Add hook(records) to run on every ingest (registering twice is a no-op)"""
+    if hook not in INGEST_HOOKS:
+        INGEST_HOOKS.append(hook)
+    return hook
+
+def ingest_records(records):
+    """
+    Store fetched records and notify the ingest hooks. Never raises: a local
+    index problem must not fail the search that produced the records.
+    """
+    records = [record for record in records or [] if isinstance(record, dict)]
+    if not records:
+        return 0
+    try:
+        written = get_parcel_store().ingest(records)
+    except sqlite3.Error:
+        written = 0
+    for hook in list(INGEST_HOOKS):
+        try:
+            hook(records)
+        except Exception:
+            pass
+    return written
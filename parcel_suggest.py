@@ -0,0 +1,158 @@
+import threading
+
+from ohio_counties import get_county
+from parcel_formats import normalize_parcel_id
+from parcel_store import get_parcel_store, register_ingest_hook
+
+# --------------------------
+# Parcel-ID Suggestion Configuration
+# --------------------------
+SUGGEST_CONFIG = {
+    "MAX_DISTANCE": 2,   # Edit distance between canonical IDs (a swapped pair of digits is 2)
+    "LIMIT": 5
+}
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def deletion_variants(word):
+    """word plus every string made by deleting one character from it"""
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+class DeletionIndex:
+    """
+    Symmetric-deletion ("SymSpell") index: every ID is filed under itself and
+    its one-character deletions. Two IDs share a variant when they differ by
+    one substitution, insertion, deletion or adjacent transposition, so a
+    query is len(ID) + 1 dict lookups followed by an exact distance check.
+
+    (A BK-tree prunes poorly here: dense numeric IDs sit at near-uniform
+    distances from one another, so a query visits most of the tree.)
+    """
+
+    def __init__(self):
+        self.variants = {}
+        self.size = 0
+
+    def add(self, word):
+        if word in self.variants.get(word, ()):
+            return False
+        for variant in deletion_variants(word):
+            self.variants.setdefault(variant, []).append(word)
+        self.size += 1
+        return True
+
+    def search(self, word, max_distance):
+        """(distance, word) pairs within max_distance of word, closest first"""
+        candidates = set()
+        for variant in deletion_variants(word):
+            candidates.update(self.variants.get(variant, ()))
+        matches = [(edit_distance(word, candidate), candidate) for candidate in candidates]
+        return sorted(match for match in matches if match[0] <= max_distance)
+
+class ParcelIdSuggester:
+    """
+    One deletion index per county over the canonical IDs of stored parcels,
+    built the first time that county is queried and kept current by the ingest hook.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.indexes = {}    # county_id -> DeletionIndex of canonical IDs
+        self.displays = {}   # county_id -> {canonical: parcel_id as the county writes it}
+        self._lock = threading.Lock()
+
+    def _add(self, county_id, parcel_id):
+        canonical = normalize_parcel_id(parcel_id, get_county(county_id)['name']).canonical
+        if canonical and self.indexes[county_id].add(canonical):
+            self.displays[county_id][canonical] = parcel_id
+
+    def _index(self, county_id):
+        with self._lock:
+            if county_id not in self.indexes:
+                self.indexes[county_id] = DeletionIndex()
+                self.displays[county_id] = {}
+                rows = self.store._connect().execute(
+                    "SELECT DISTINCT parcel_id FROM parcels WHERE county_id = ? AND parcel_id IS NOT NULL", (county_id,)
+                ).fetchall()
+                for (parcel_id,) in rows:
+                    self._add(county_id, parcel_id)
+            return self.indexes[county_id]
+
+    def ingest(self, records):
+        """Ingest hook: add new IDs to the county indexes already built"""
+        added = 0
+        with self._lock:
+            for record in records:
+                try:
+                    county_id = int(record.get('county_id'))
+                except (TypeError, ValueError):
+                    continue
+                if county_id in self.indexes and record.get('parcel_id'):
+                    self._add(county_id, str(record['parcel_id']))
+                    added += 1
+        return added
+
+    def suggest(self, parcel_id, county_name=None, limit=None, max_distance=None):
+        """
+        Known parcel IDs closest to parcel_id as dicts with parcel_id, county
+        and distance. Searches county_name, else the county the ID format
+        points at, else every county with stored parcels.
+        """
+        limit = limit or SUGGEST_CONFIG["LIMIT"]
+        max_distance = max_distance or SUGGEST_CONFIG["MAX_DISTANCE"]
+        county = get_county(county_name or normalize_parcel_id(parcel_id).county or "")
+        if county:
+            county_ids = [county['county_id']]
+        else:
+            county_ids = [row[0] for row in self.store._connect().execute(
+                "SELECT DISTINCT county_id FROM parcels WHERE county_id IS NOT NULL"
+            ).fetchall() if get_county(row[0])]
+        matches = []
+        for county_id in county_ids:
+            canonical = normalize_parcel_id(parcel_id, get_county(county_id)['name']).canonical
+            for distance, known in self._index(county_id).search(canonical, max_distance):
+                if distance:
+                    matches.append((distance, self.displays[county_id][known], get_county(county_id)['name']))
+        matches.sort()
+        return [
+            {"parcel_id": known, "county": county, "distance": distance}
+            for distance, known, county in matches[:limit]
+        ]
+
+_parcel_suggester = None
+_parcel_suggester_lock = threading.Lock()
+
+def get_parcel_suggester():
+    """
+    Return the process-wide parcel-ID suggester, registering its ingest hook on first use
+    """
+    global _parcel_suggester
+    if _parcel_suggester is None:
+        with _parcel_suggester_lock:
+            if _parcel_suggester is None:
+                _parcel_suggester = ParcelIdSuggester(get_parcel_store())
+                register_ingest_hook(_parcel_suggester.ingest)
+    return _parcel_suggester
+
+def did_you_mean(parcel_ids, county_name=None):
+    """
+    Suggestions for a missed search of parcel_ids (ParcelId tuples). Each
+    suggestion carries 'query': the search string with that one ID corrected.
+    """
+    displays = [pid.display for pid in parcel_ids]
+    suggestions = []
+    for position, parcel_id in enumerate(parcel_ids):
+        for suggestion in get_parcel_suggester().suggest(parcel_id.display, county_name):
+            corrected = displays[:position] + [suggestion["parcel_id"]] + displays[position + 1:]
+            suggestions.append(dict(suggestion, original=parcel_id.display, query=";".join(corrected)))
+    return suggestions
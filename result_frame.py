@@ -0,0 +1,210 @@
+import pandas as pd
+
+from columnar_export import parse_date
+
+# --------------------------
+# Result Normalization
+# --------------------------
+# Search results arrive as API dicts whose field names vary by source
+# ('county' vs 'county_name', 'market_value' vs 'mkt_val_tot') and whose
+# numbers are text. results_frame() resolves the aliases and coerces types
+# for a whole result list in one pass; displays, PDFs and tables then read
+# typed values instead of re-parsing each record with try/float.
+
+# Canonical field -> source names in priority order (the canonical name first)
+FIELD_ALIASES = {
+    "parcel_id": ["parcel_id", "parcelid", "parcel_number"],
+    "county_name": ["county_name", "county"],
+    "address": ["address", "property_address", "street_address", "full_address"],
+    "addr_city": ["addr_city", "city", "municipality"],
+    "addr_zip": ["addr_zip", "zip", "zip_code", "postal_code"],
+    "owner": ["owner", "owner_name", "property_owner"],
+    "mailing_address": ["mailing_address", "owner_address"],
+    "school_district": ["school_district", "district"],
+    "land_use_class": ["land_use_class", "property_type", "land_use", "property_class"],
+    "mkt_val_tot": ["mkt_val_tot", "market_value", "total_value", "assessed_value", "assessed_value_total", "appraised_value"],
+    "mkt_val_land": ["mkt_val_land", "land_value", "lot_value"],
+    "mkt_val_bldg": ["mkt_val_bldg", "building_value", "improvement_value"],
+    "sale_price": ["sale_price", "last_sale_price"],
+    "trans_date": ["trans_date", "deed_date", "sale_date"],
+    "annual_tax": ["annual_tax", "tax_amount", "taxes"],
+    "tax_rate": ["tax_rate", "millage_rate"],
+    "acreage": ["acreage", "lot_size", "lot_area"],
+    "acreage_calc": ["acreage_calc"],
+    "bldg_sqft": ["bldg_sqft", "square_feet", "sqft", "living_area"],
+    "year_built": ["year_built", "built_year"],
+    "bedrooms": ["bedrooms", "beds"],
+    "bathrooms": ["bathrooms", "baths"],
+    "stories": ["stories", "floors"],
+    "buildings": ["buildings"],
+    "latitude": ["latitude", "lat"],
+    "longitude": ["longitude", "lng", "lon"]
+}
+
+NUMERIC_FIELDS = [
+    "mkt_val_tot", "mkt_val_land", "mkt_val_bldg", "sale_price", "annual_tax", "tax_rate",
+    "acreage", "acreage_calc", "bldg_sqft", "year_built", "bedrooms", "bathrooms", "stories", "buildings",
+    "latitude", "longitude"
+]
+DATE_FIELDS = ["trans_date"]
+
+MISSING = "N/A"
+
+def resolve_aliases(frame, aliases):
+    """First non-blank value across the alias columns present, row by row"""
+    present = [column for column in aliases if column in frame.columns]
+    if not present:
+        return pd.Series(pd.NA, index=frame.index, dtype="object")
+    values = frame[present].replace({"": pd.NA, MISSING: pd.NA})
+    return values.bfill(axis=1).iloc[:, 0] if len(present) > 1 else values.iloc[:, 0]
+
+def results_frame(results):
+    """
+    Typed DataFrame of a result list: one row per record, canonical columns
+    from FIELD_ALIASES (numbers as Float64, dates as datetime64, text as
+    string, missing values as NA) alongside every original field.
+    """
+    frame = pd.DataFrame.from_records(list(results or []))
+    for canonical, aliases in FIELD_ALIASES.items():
+        frame[canonical] = resolve_aliases(frame, aliases)
+    for field in NUMERIC_FIELDS:
+        text = frame[field].astype("string").str.replace(r"[$,\s]", "", regex=True)
+        frame[field] = pd.to_numeric(text, errors="coerce").astype("Float64")
+    for field in DATE_FIELDS:
+        frame[field] = pd.to_datetime(frame[field].map(parse_date, na_action="ignore"), errors="coerce")
+    for field in FIELD_ALIASES:
+        if field not in NUMERIC_FIELDS and field not in DATE_FIELDS:
+            frame[field] = frame[field].astype("string")
+    return frame
+
+def frame_rows(frame):
+    """
+    The frame as record dicts for per-property displays. Canonical fields are
+    always present (None when missing, dates as datetime.date); other fields
+    only where the source record had them, so .get() defaults still apply.
+    """
+    # Pass-through int fields with gaps (county_id, census_tract) were read as
+    # float64; make them nullable ints again so rows hold 39035, not 39035.0
+    integral = {}
+    for field, dtype in frame.dtypes.items():
+        if field not in FIELD_ALIASES and dtype == "float64" and frame[field].isna().any():
+            values = frame[field].dropna()
+            if (values == values.round()).all():
+                integral[field] = "Int64"
+    if integral:
+        frame = frame.astype(integral)
+    rows = frame.astype(object).where(frame.notna(), None)
+    for field in DATE_FIELDS:
+        rows[field] = [value.date() if value is not None else None for value in rows[field]]
+    return [
+        {field: value for field, value in row.items() if value is not None or field in FIELD_ALIASES}
+        for row in rows.to_dict("records")
+    ]
+
+def normalized_record(record):
+    """Single-record shortcut for results_frame + frame_rows"""
+    return frame_rows(results_frame([record]))[0]
+
+# --------------------------
+# Display Formatting
+# --------------------------
+def is_missing(value):
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+def format_value(value, missing=MISSING):
+    return missing if is_missing(value) or value == "" else value
+
+def format_money(value, decimals=2, missing=MISSING):
+    return missing if is_missing(value) else f"${value:,.{decimals}f}"
+
+def format_number(value, decimals=0, suffix="", missing=MISSING):
+    return missing if is_missing(value) else f"{value:,.{decimals}f}{suffix}"
+
+def format_date(value, missing=MISSING):
+    return missing if is_missing(value) else value.strftime("%Y-%m-%d")
+
+# --------------------------
+# Result Tables
+# --------------------------
+SUMMARY_COLUMNS = {
+    "parcel_id": "Parcel ID",
+    "address": "Address",
+    "addr_city": "City",
+    "county_name": "County",
+    "owner": "Owner",
+    "land_use_class": "Land Use",
+    "mkt_val_tot": "Market Value",
+    "acreage": "Acres",
+    "sale_price": "Last Sale",
+    "trans_date": "Sale Date"
+}
+
+def summary_table(frame):
+    """One row per property with the main typed columns, for st.dataframe"""
+    return frame[list(SUMMARY_COLUMNS)].rename(columns=SUMMARY_COLUMNS)
+
+def summary_stats(frame):
+    """Count and market value totals over a result frame; NA values are skipped"""
+    values = frame["mkt_val_tot"].dropna()
+    return {
+        "count": len(frame),
+        "valued": len(values),
+        "total_value": float(values.sum()) if len(values) else None,
+        "median_value": float(values.median()) if len(values) else None,
+        "total_acreage": float(frame["acreage"].dropna().sum()) if frame["acreage"].notna().any() else None
+    }
+
+# --------------------------
+# Portfolio Summary
+# --------------------------
+# Whole-result-set analytics for multi-parcel searches. Every figure is a
+# column aggregate or groupby over the typed frame, so thousands of
+# records summarize in milliseconds instead of one expander per parcel.
+VALUE_FIELDS = {"mkt_val_tot": "Total Value", "mkt_val_land": "Land Value", "mkt_val_bldg": "Building Value"}
+GROUP_FIELDS = {"land_use_class": "Land Use", "school_district": "School District", "county_name": "County"}
+ACREAGE_BINS = [0, 0.1, 0.25, 0.5, 1, 5, 10, 40, float("inf")]
+ACREAGE_LABELS = ["< 0.1", "0.1-0.25", "0.25-0.5", "0.5-1", "1-5", "5-10", "10-40", "40+"]
+UNKNOWN = "Unknown"
+
+def value_summary(frame):
+    """Count, total, median, mean, min and max of each value column (NA skipped), one row per column"""
+    summary = frame[list(VALUE_FIELDS)].astype("float64").agg(["count", "sum", "median", "mean", "min", "max"]).T
+    summary.index = [VALUE_FIELDS[field] for field in summary.index]
+    summary.columns = ["Parcels", "Total", "Median", "Mean", "Min", "Max"]
+    summary["Parcels"] = summary["Parcels"].astype(int)
+    return summary
+
+def group_counts(frame, field, top=None):
+    """Parcels, total and median market value per value of field, largest groups first"""
+    keys = frame[field].fillna(UNKNOWN)
+    values = frame["mkt_val_tot"].astype("float64")
+    grouped = values.groupby(keys, sort=False).agg(["size", "sum", "median"])
+    grouped = grouped.sort_values("size", ascending=False)
+    if top:
+        grouped = grouped.head(top)
+    grouped.index.name = GROUP_FIELDS.get(field, field)
+    grouped.columns = ["Parcels", "Total Market Value", "Median Market Value"]
+    return grouped.reset_index()
+
+def acreage_distribution(frame):
+    """Parcels per ACREAGE_BINS range, plus those without an acreage"""
+    bins = pd.cut(frame["acreage"].astype("float64"), ACREAGE_BINS, labels=ACREAGE_LABELS, right=False)
+    counts = bins.value_counts(sort=False)
+    missing = int(frame["acreage"].isna().sum())
+    if missing:
+        counts[UNKNOWN] = missing
+    counts.index = counts.index.astype(str)
+    counts.index.name = "Acreage"
+    return counts.rename("Parcels")
+
+def portfolio_summary(frame, top=15):
+    """Value totals and medians, group counts and acreage distribution for a result frame"""
+    acreage = frame["acreage"].astype("float64")
+    return {
+        "stats": summary_stats(frame),
+        "values": value_summary(frame),
+        "groups": {field: group_counts(frame, field, top) for field in GROUP_FIELDS},
+        "group_totals": {field: int(frame[field].nunique(dropna=False)) for field in GROUP_FIELDS},
+        "acreage": acreage_distribution(frame),
+        "acreage_median": float(acreage.median()) if acreage.notna().any() else None
+    }
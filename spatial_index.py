@@ -0,0 +1,198 @@
+import json
+import math
+import re
+import threading
+
+from parcel_store import get_parcel_store, record_key, register_ingest_hook
+
+# --------------------------
+# Spatial Index Configuration
+# --------------------------
+SPATIAL_CONFIG = {
+    "NEAREST_START_METERS": 250,     # First radius tried by nearest-k, doubled until enough parcels
+    "NEAREST_MAX_METERS": 50000,
+    "DEFAULT_RADIUS_METERS": 500
+}
+
+EARTH_RADIUS_METERS = 6371008.8
+METERS_PER_DEGREE_LAT = 111320.0
+
+COORDINATE_PATTERN = re.compile(r"(-?\d+(?:\.\d+)?)\s+(-?\d+(?:\.\d+)?)")
+
+def wkt_bounds(wkt):
+    """
+    (min_lon, max_lon, min_lat, max_lat) of every vertex in a WKT geometry, or None
+    """
+    if not wkt:
+        return None
+    lons = []
+    lats = []
+    for lon, lat in COORDINATE_PATTERN.findall(wkt):
+        lons.append(float(lon))
+        lats.append(float(lat))
+    if not lons:
+        return None
+    return min(lons), max(lons), min(lats), max(lats)
+
+def record_centroid(record, bounds=None):
+    """
+    (lat, lon) from the record's latitude/longitude, else the geometry bounds center
+    """
+    try:
+        return float(record['latitude']), float(record['longitude'])
+    except (KeyError, TypeError, ValueError):
+        pass
+    if bounds is None:
+        return None
+    min_lon, max_lon, min_lat, max_lat = bounds
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+def haversine_meters(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+def radius_bounds(lat, lon, meters):
+    """Lat/lon box that contains the circle of the given radius"""
+    dlat = meters / METERS_PER_DEGREE_LAT
+    dlon = meters / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+class SpatialIndex:
+    """
+    SQLite rtree tables inside the parcel store database:
+    parcel_points holds each parcel's centroid, parcel_bounds its geometry
+    bounding box. Both are keyed by the parcels table rowid.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        conn = store._connect()
+        with conn:
+            conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS parcel_points USING rtree(
+                    id, min_lat, max_lat, min_lon, max_lon
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS parcel_bounds USING rtree(
+                    id, min_lat, max_lat, min_lon, max_lon
+                );
+            """)
+        # Parcels stored before the index existed
+        if conn.execute("SELECT COUNT(*) FROM parcel_points").fetchone()[0] == 0:
+            rows = conn.execute("SELECT rowid, record FROM parcels").fetchall()
+            self._index_rows((rowid, json.loads(record)) for rowid, record in rows)
+
+    def _index_rows(self, rows):
+        points = []
+        boxes = []
+        for rowid, record in rows:
+            bounds = wkt_bounds(record.get('geom_as_wkt'))
+            centroid = record_centroid(record, bounds)
+            if centroid is not None:
+                lat, lon = centroid
+                points.append((rowid, lat, lat, lon, lon))
+            if bounds is not None:
+                min_lon, max_lon, min_lat, max_lat = bounds
+                boxes.append((rowid, min_lat, max_lat, min_lon, max_lon))
+        conn = self.store._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO parcel_points VALUES (?, ?, ?, ?, ?)", points)
+            conn.executemany("INSERT OR REPLACE INTO parcel_bounds VALUES (?, ?, ?, ?, ?)", boxes)
+        return len(points)
+
+    def ingest(self, records):
+        """Ingest hook: index records just written to the parcel store"""
+        by_key = {record_key(record): record for record in records}
+        if not by_key:
+            return 0
+        rows = self.store._connect().execute(
+            f"SELECT rowid, record_key FROM parcels WHERE record_key IN ({', '.join('?' * len(by_key))})",
+            list(by_key)
+        ).fetchall()
+        return self._index_rows((rowid, by_key[key]) for rowid, key in rows)
+
+    def _points_in(self, min_lat, max_lat, min_lon, max_lon):
+        return self.store._connect().execute("""
+            SELECT parcels.record, parcel_points.min_lat, parcel_points.min_lon
+            FROM parcel_points JOIN parcels ON parcels.rowid = parcel_points.id
+            WHERE parcel_points.min_lat >= ? AND parcel_points.max_lat <= ?
+              AND parcel_points.min_lon >= ? AND parcel_points.max_lon <= ?
+        """, (min_lat, max_lat, min_lon, max_lon)).fetchall()
+
+    def within_radius(self, lat, lon, meters=None, limit=None):
+        """
+        Stored parcels whose centroid is within meters of (lat, lon), as
+        (record, distance_m) pairs nearest first
+        """
+        meters = meters or SPATIAL_CONFIG["DEFAULT_RADIUS_METERS"]
+        min_lat, max_lat, min_lon, max_lon = radius_bounds(lat, lon, meters)
+        matches = []
+        for record, point_lat, point_lon in self._points_in(min_lat, max_lat, min_lon, max_lon):
+            record = json.loads(record)
+            # rtree coordinates are float32; measure from the record's own values
+            point_lat, point_lon = record_centroid(record) or (point_lat, point_lon)
+            distance = haversine_meters(lat, lon, point_lat, point_lon)
+            if distance <= meters:
+                matches.append((record, round(distance, 1)))
+        matches.sort(key=lambda match: match[1])
+        return matches[:limit] if limit else matches
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """Stored parcels whose geometry bounding box intersects the given box"""
+        rows = self.store._connect().execute("""
+            SELECT parcels.record
+            FROM parcel_bounds JOIN parcels ON parcels.rowid = parcel_bounds.id
+            WHERE parcel_bounds.max_lat >= ? AND parcel_bounds.min_lat <= ?
+              AND parcel_bounds.max_lon >= ? AND parcel_bounds.min_lon <= ?
+        """, (min_lat, max_lat, min_lon, max_lon)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def nearest(self, lat, lon, k=5, exclude_key=None):
+        """
+        The k stored parcels nearest (lat, lon) as (record, distance_m) pairs,
+        searching outward until k are found or the maximum radius is reached
+        """
+        meters = SPATIAL_CONFIG["NEAREST_START_METERS"]
+        while True:
+            matches = [
+                match for match in self.within_radius(lat, lon, meters)
+                if exclude_key is None or record_key(match[0]) != exclude_key
+            ]
+            if len(matches) >= k or meters >= SPATIAL_CONFIG["NEAREST_MAX_METERS"]:
+                return matches[:k]
+            meters *= 2
+
+_spatial_index = None
+_spatial_index_lock = threading.Lock()
+
+def get_spatial_index():
+    """
+    Return the process-wide spatial index, registering its ingest hook on first use
+    """
+    global _spatial_index
+    if _spatial_index is None:
+        with _spatial_index_lock:
+            if _spatial_index is None:
+                _spatial_index = SpatialIndex(get_parcel_store())
+                register_ingest_hook(_spatial_index.ingest)
+    return _spatial_index
+
+def nearby_parcels(record, k=5, meters=None):
+    """
+    Other stored parcels near record as (record, distance_m) pairs: within
+    meters when given, otherwise the k nearest
+    """
+    centroid = record_centroid(record, wkt_bounds(record.get('geom_as_wkt')))
+    if centroid is None:
+        return []
+    index = get_spatial_index()
+    if meters:
+        return [
+            match for match in index.within_radius(centroid[0], centroid[1], meters, limit=k + 1)
+            if record_key(match[0]) != record_key(record)
+        ][:k]
+    return index.nearest(centroid[0], centroid[1], k, exclude_key=record_key(record))